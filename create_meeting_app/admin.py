@@ -1,3 +1,31 @@
 from django.contrib import admin
 
 # Register your models here.
+from .models import BotResourceSample, Transcript
+from .utils.summary_structure import store_summary
+
+
+@admin.register(BotResourceSample)
+class BotResourceSampleAdmin(admin.ModelAdmin):
+    """Per-bot CPU / memory / fd samples; filter by meeting to see one bot's curve."""
+    list_display = ('meeting', 'taken_at', 'cpu_percent', 'rss_mb', 'open_fds', 'processes')
+    list_filter = ('meeting',)
+    list_select_related = ('meeting',)
+    date_hierarchy = 'taken_at'
+    ordering = ('-taken_at',)
+    search_fields = ('meeting__name',)
+
+
+@admin.register(Transcript)
+class TranscriptAdmin(admin.ModelAdmin):
+    """Search matches the stored plain-text summary, not the HTML markup."""
+    list_display = ('meeting', 'source', 'created')
+    list_select_related = ('meeting',)
+    ordering = ('-created',)
+    search_fields = ('meeting__name', 'summary_text')
+    readonly_fields = ('summary_data', 'summary_text')
+
+    def save_model(self, request, obj, form, change):
+        if 'summary' in form.changed_data:
+            store_summary(obj, obj.summary, save=False)
+        super().save_model(request, obj, form, change)
@@ -6,4 +6,5 @@ class CreateMeetingAppConfig(AppConfig):
 
     def ready(self):
         # DO NOT start the scheduler here. Let the DB finish migrating first.
-        pass
+        # Signal handlers only bump cache versions, so they are safe to wire up.
+        from . import signals  # noqa: F401
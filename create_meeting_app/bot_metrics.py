@@ -0,0 +1,107 @@
+# create_meeting_app/bot_metrics.py
+#
+# CPU / RSS / open-fd sampling of a bot's whole process tree (bot process,
+# chromedriver, Chrome and its helpers, ffmpeg) straight from /proc, so it
+# works without psutil. Like bot_supervisor, no models at module level.
+
+import os
+import time
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def proc_available():
+    return os.path.isdir("/proc/self")
+
+
+def _stat(pid):
+    """(ppid, utime + stime ticks) from /proc/<pid>/stat, or None if gone."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # the command name may contain spaces; fields resume after the last ")"
+    fields = data[data.rindex(")") + 2:].split()
+    return int(fields[1]), int(fields[11]) + int(fields[12])
+
+
+def _children_map():
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        stat = _stat(int(entry))
+        if stat:
+            children.setdefault(stat[0], []).append(int(entry))
+    return children
+
+
+def process_tree(root_pids, children=None):
+    """Every live pid under (and including) `root_pids`."""
+    children = _children_map() if children is None else children
+    seen, stack = set(), [p for p in root_pids if p]
+    while stack:
+        pid = stack.pop()
+        if pid in seen or not os.path.exists(f"/proc/{pid}"):
+            continue
+        seen.add(pid)
+        stack.extend(children.get(pid, ()))
+    return seen
+
+
+def _rss_bytes(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _open_fds(pid):
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return 0
+
+
+class TreeSampler:
+    """
+    sample(key, root_pids) returns the tree's totals. CPU is the share of one
+    core used since the previous sample for the same key (so the first
+    sample of a key reports 0.0).
+    """
+
+    def __init__(self):
+        self._last = {}  # key -> (monotonic time, {pid: cpu ticks})
+
+    def sample(self, key, root_pids, children=None):
+        now = time.monotonic()
+        pids = process_tree(root_pids, children)
+        ticks = {}
+        rss = fds = 0
+        for pid in pids:
+            stat = _stat(pid)
+            if stat is None:
+                continue
+            ticks[pid] = stat[1]
+            rss += _rss_bytes(pid)
+            fds += _open_fds(pid)
+
+        cpu = 0.0
+        previous = self._last.get(key)
+        if previous is not None and now > previous[0]:
+            # only count processes seen both times; new ones start next round
+            used = sum(t - previous[1][pid] for pid, t in ticks.items() if pid in previous[1])
+            cpu = 100.0 * used / CLOCK_TICKS / (now - previous[0])
+        self._last[key] = (now, ticks)
+        return {
+            "cpu_percent": round(max(cpu, 0.0), 1),
+            "rss_mb": round(rss / (1024 * 1024), 1),
+            "open_fds": fds,
+            "processes": len(ticks),
+        }
+
+    def forget(self, key):
+        self._last.pop(key, None)
@@ -0,0 +1,110 @@
+# create_meeting_app/bot_scripts/audio_sink.py
+#
+# One PulseAudio null sink per bot browser. Chrome is started with
+# PULSE_SINK pointing at its own sink, and ffmpeg records that sink's monitor,
+# so several bots on one host never hear each other.
+
+import os
+import re
+import shutil
+import subprocess
+
+SINK_PREFIX = "meetbot"
+
+# recorded when no per-bot sink could be created (old single-bot behaviour)
+DEFAULT_MONITOR = "alsa_output.pci-0000_00_1f.3.analog-stereo.monitor"
+
+
+def pactl_available():
+    return shutil.which("pactl") is not None
+
+
+def _pactl(*args):
+    return subprocess.run(["pactl", *args], check=True, capture_output=True, text=True,
+                          timeout=10).stdout
+
+
+def sink_name(tag):
+    # the pid lets cleanup_stale_sinks tell live sinks from leftovers
+    return f"{SINK_PREFIX}_{os.getpid()}_{tag}"
+
+
+class NullSink:
+    """A dedicated null sink; use as a context manager or call remove()."""
+
+    def __init__(self, tag):
+        self.name = sink_name(tag)
+        self.module_id = None
+
+    @property
+    def monitor(self):
+        return f"{self.name}.monitor"
+
+    def env(self, base=None):
+        """Environment for a process whose audio should go into this sink."""
+        env = dict(os.environ if base is None else base)
+        env["PULSE_SINK"] = self.name
+        return env
+
+    def create(self):
+        out = _pactl("load-module", "module-null-sink", f"sink_name={self.name}",
+                     f"sink_properties=device.description={self.name}")
+        self.module_id = int(out.strip())
+        return self
+
+    def remove(self):
+        if self.module_id is None:
+            return
+        try:
+            _pactl("unload-module", str(self.module_id))
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"⚠️ Could not remove audio sink {self.name}: {e}")
+        self.module_id = None
+
+    def __enter__(self):
+        return self.create()
+
+    def __exit__(self, *exc):
+        self.remove()
+
+
+def create_sink(tag):
+    """NullSink for `tag`, or None when PulseAudio isn't usable on this host."""
+    if not pactl_available():
+        return None
+    try:
+        return NullSink(tag).create()
+    except (OSError, ValueError, subprocess.SubprocessError) as e:
+        print(f"⚠️ No dedicated audio sink, recording the default monitor: {e}")
+        return None
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def cleanup_stale_sinks():
+    """Unload sinks left behind by bot processes that died without cleaning up."""
+    if not pactl_available():
+        return 0
+    pattern = re.compile(rf"sink_name={SINK_PREFIX}_(\d+)_")
+    removed = 0
+    for line in _pactl("list", "short", "modules").splitlines():
+        fields = line.split("\t")
+        match = pattern.search(line)
+        if len(fields) < 3 or fields[1] != "module-null-sink" or not match:
+            continue
+        if _pid_alive(int(match.group(1))):
+            continue
+        try:
+            _pactl("unload-module", fields[0])
+            removed += 1
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return removed
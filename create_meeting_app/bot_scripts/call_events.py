@@ -0,0 +1,116 @@
+# create_meeting_app/bot_scripts/call_events.py
+#
+# Event channel from the Meet page to the bot. A MutationObserver injected
+# into the page queues "ended" and "participants" events; Python long-polls
+# the queue with execute_async_script, which returns as soon as an event is
+# queued (or after `timeout` seconds with nothing), so end-of-call is seen
+# within ~250 ms instead of on the next 30-second tick.
+
+import time
+
+from django.conf import settings
+
+OBSERVER_JS = r"""
+(function () {
+  if (window.__meetBot) return;
+  const bot = window.__meetBot = {queue: [], waiter: null, participants: null, ended: false, pending: false};
+  bot.push = function (event) {
+    bot.queue.push(event);
+    if (bot.waiter) { const waiter = bot.waiter; bot.waiter = null; waiter(bot.queue.splice(0)); }
+  };
+  const ENDED = /Call ended|You left the call|You've been removed from the meeting/;
+  function check() {
+    bot.pending = false;
+    if (!bot.ended && ENDED.test(document.body.innerText)) {
+      bot.ended = true;
+      bot.push({type: 'ended'});
+    }
+    const ids = new Set(Array.from(document.querySelectorAll('[data-participant-id]'),
+                                   el => el.getAttribute('data-participant-id')));
+    if (ids.size && ids.size !== bot.participants) {
+      bot.participants = ids.size;
+      bot.push({type: 'participants', count: ids.size});
+    }
+  }
+  // coalesce mutation bursts into one check every 250 ms
+  new MutationObserver(function () {
+    if (!bot.pending) { bot.pending = true; setTimeout(check, 250); }
+  }).observe(document.body, {childList: true, subtree: true, characterData: true});
+  check();
+})();
+"""
+
+WAIT_JS = r"""
+const done = arguments[arguments.length - 1];
+const bot = window.__meetBot;
+if (!bot) { done(null); return; }
+if (bot.queue.length) { done(bot.queue.splice(0)); return; }
+bot.waiter = done;
+setTimeout(function () {
+  if (bot.waiter === done) { bot.waiter = null; done([]); }
+}, arguments[0]);
+"""
+
+LEAVE_JS = r"""
+const button = document.querySelector('[aria-label="Leave call"]');
+if (button) { button.click(); return true; }
+return false;
+"""
+
+
+def auto_leave_seconds():
+    """How long the bot stays once it is the only participant (0 = never leave)."""
+    return getattr(settings, "BOT_AUTO_LEAVE_ALONE_SECONDS", 0)
+
+
+def install(driver):
+    driver.execute_script(OBSERVER_JS)
+
+
+def wait_events(driver, timeout):
+    """
+    Block until the page reports events or `timeout` seconds pass. Reinstalls
+    the observer if the page navigated and lost it.
+    """
+    driver.set_script_timeout(timeout + 5)
+    events = driver.execute_async_script(WAIT_JS, int(timeout * 1000))
+    if events is None:
+        install(driver)
+        return []
+    return events
+
+
+def leave(driver):
+    return bool(driver.execute_script(LEAVE_JS))
+
+
+class CallState:
+    """
+    Turns page events into decisions. feed() returns "end" when the call is
+    over, "leave" when the bot has been alone for `alone_seconds`, else None.
+    """
+
+    def __init__(self, alone_seconds=None):
+        self.alone_seconds = auto_leave_seconds() if alone_seconds is None else alone_seconds
+        self.participants = None
+        self.alone_since = None
+
+    def feed(self, event, now=None):
+        now = time.monotonic() if now is None else now
+        if event.get("type") == "ended":
+            return "end"
+        if event.get("type") == "participants":
+            self.participants = event["count"]
+            if self.participants <= 1:
+                self.alone_since = self.alone_since or now
+            else:
+                self.alone_since = None
+            print(f"👥 {self.participants} participant(s) in the call")
+        return self.tick(now)
+
+    def tick(self, now=None):
+        """Re-check the alone timer; call this even when no events arrive."""
+        now = time.monotonic() if now is None else now
+        if self.alone_seconds and self.alone_since is not None and now - self.alone_since >= self.alone_seconds:
+            return "leave"
+        return None
@@ -0,0 +1,148 @@
+# create_meeting_app/bot_scripts/captions.py
+#
+# Google Meet live captions as a free transcript source. The bot turns
+# captions on, reads the caption region once a second and streams settled,
+# speaker-attributed lines into TranscriptSegment rows while the meeting
+# runs. transcribe_meeting (paid ASR) is only needed when this produced
+# nothing.
+
+import time
+from datetime import timedelta
+
+from bs4 import BeautifulSoup
+from django.conf import settings
+
+from create_meeting_app.models import TranscriptSegment
+from create_meeting_app.utils.pagination import BLOCK_SEPARATOR
+
+# Meet's caption DOM uses obfuscated class names; keep them in one place.
+CAPTION_REGION = 'div[role="region"][aria-label="Captions"]'
+CAPTION_BLOCK = ".nMcdL"
+CAPTION_SPEAKER = ".NWpY1d"
+CAPTION_TEXT = ".ygicle"
+
+ENABLE_JS = r"""
+const button = document.querySelector('button[aria-label*="Turn on captions"]');
+if (button) { button.click(); return true; }
+return !!document.querySelector('button[aria-label*="Turn off captions"]');
+"""
+
+REGION_JS = "const r = document.querySelector(arguments[0]); return r ? r.outerHTML : null;"
+
+
+def captions_enabled():
+    return getattr(settings, "BOT_CAPTIONS", False)
+
+
+def enable_captions(driver):
+    """Click Meet's captions button; falls back to the "c" shortcut."""
+    if driver.execute_script(ENABLE_JS):
+        return True
+    from selenium.webdriver.common.by import By
+    driver.find_element(By.TAG_NAME, "body").send_keys("c")
+    return False
+
+
+def caption_html(driver):
+    return driver.execute_script(REGION_JS, CAPTION_REGION)
+
+
+def parse_caption_blocks(html):
+    """[(speaker, text), ...] for every caption block currently on screen."""
+    if not html:
+        return []
+    soup = BeautifulSoup(html, "html.parser")
+    blocks = []
+    for block in soup.select(CAPTION_BLOCK):
+        speaker = block.select_one(CAPTION_SPEAKER)
+        text = block.select_one(CAPTION_TEXT)
+        if text is None:
+            continue
+        body = " ".join(text.get_text(" ", strip=True).split())
+        if body:
+            blocks.append((speaker.get_text(strip=True) if speaker else "", body))
+    return blocks
+
+
+class _Turn:
+    def __init__(self, speaker, text, now):
+        self.speaker = speaker
+        self.text = text
+        self.changed_at = now
+        self.pending_since = now   # when the not-yet-emitted part started
+        self.emitted = 0           # characters of `text` already written
+
+
+class CaptionTracker:
+    """
+    Meet rewrites the newest caption block while someone talks and drops old
+    blocks as they scroll away. update() matches each on-screen block to a
+    speaker turn, and a turn's new text is emitted via on_segment(speaker,
+    text, start, end) once it has been stable for `settle_seconds` or has
+    left the screen. Times are seconds since the tracker started.
+    """
+
+    def __init__(self, on_segment, settle_seconds=2.0, now=None):
+        self.on_segment = on_segment
+        self.settle_seconds = settle_seconds
+        self.started = time.monotonic() if now is None else now
+        self._turns = []
+
+    def _match(self, speaker, text, taken):
+        for turn in self._turns:
+            if turn in taken or turn.speaker != speaker:
+                continue
+            # captions get corrected in place, but the start of a turn is stable
+            head = min(len(turn.text), 20)
+            if text[:head] == turn.text[:head]:
+                return turn
+        return None
+
+    def update(self, blocks, now=None):
+        now = time.monotonic() if now is None else now
+        seen = []
+        for speaker, text in blocks:
+            turn = self._match(speaker, text, seen)
+            if turn is None:
+                turn = _Turn(speaker, text, now)
+                self._turns.append(turn)
+            elif text != turn.text:
+                if turn.emitted >= len(turn.text):
+                    turn.pending_since = now
+                turn.text = text
+                turn.changed_at = now
+            seen.append(turn)
+
+        for turn in list(self._turns):
+            if turn not in seen:
+                self._emit(turn, now)
+                self._turns.remove(turn)
+            elif now - turn.changed_at >= self.settle_seconds:
+                self._emit(turn, now)
+
+    def _emit(self, turn, now):
+        new_text = turn.text[turn.emitted:].strip()
+        if not new_text:
+            return
+        turn.emitted = len(turn.text)
+        self.on_segment(turn.speaker, new_text,
+                        turn.pending_since - self.started, min(turn.changed_at, now) - self.started)
+
+    def close(self, now=None):
+        """Emit whatever is still on screen (end of meeting)."""
+        now = time.monotonic() if now is None else now
+        for turn in self._turns:
+            self._emit(turn, now)
+        self._turns = []
+
+
+def transcript_text(segments):
+    """Transcript.text in the "Speaker: text। " format the meeting page splits on."""
+    return BLOCK_SEPARATOR.join(
+        f"{s.speaker}: {s.text}" if s.speaker else s.text for s in segments
+    )
+
+
+def segment(transcript, speaker, text, start, end):
+    return TranscriptSegment(transcript=transcript, speaker=speaker, text=text,
+                             start_time=timedelta(seconds=start), end_time=timedelta(seconds=end))
@@ -0,0 +1,233 @@
+# create_meeting_app/bot_scripts/chrome_pool.py
+#
+# Pre-launched Chrome instances for the bot supervisor. Each one runs with its
+# own throwaway profile and a DevTools port; a bot process attaches to it via
+# chromedriver's debuggerAddress instead of cold-starting a browser, so the
+# several seconds of Chrome start-up happen before the meeting is due.
+
+import json
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from create_meeting_app.bot_scripts.audio_sink import create_sink
+
+CHROME_CANDIDATES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")
+
+
+def chrome_arguments(headless=None):
+    """Flags shared by pooled and cold-started bot browsers."""
+    if headless is None:
+        headless = getattr(settings, "BOT_HEADLESS", False)
+    args = [
+        # auto-accept permissions & prevent popups
+        "--use-fake-ui-for-media-stream",
+        "--disable-infobars",
+        "--disable-popup-blocking",
+        "--disable-blink-features=AutomationControlled",
+        # Linux stability
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+    ]
+    if headless:
+        args += ["--headless=new", "--window-size=1280,720"]
+    return args
+
+
+def chrome_binary():
+    configured = getattr(settings, "CHROME_BINARY", "")
+    if configured:
+        return configured
+    for name in CHROME_CANDIDATES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise RuntimeError("No Chrome/Chromium binary found; set CHROME_BINARY")
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _devtools(port, path, method="GET", timeout=2):
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", method=method)
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read() or b"null")
+
+
+@dataclass
+class WarmChrome:
+    port: int
+    profile_dir: str
+    process: object
+    sink: object = None   # NullSink this browser plays into, if any
+    launched_at: float = field(default_factory=time.time)
+    uses: int = 0
+
+    @property
+    def address(self):
+        return f"127.0.0.1:{self.port}"
+
+    @property
+    def sink_name(self):
+        return self.sink.name if self.sink else None
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def destroy(self):
+        if self.alive():
+            self.process.terminate()
+            try:
+                self.process.wait(5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.sink:
+            self.sink.remove()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+def launch_chrome(headless=None, startup_timeout=20):
+    """
+    Start one Chrome with an isolated profile and its own audio sink, and wait
+    for its DevTools endpoint.
+    """
+    port = _free_port()
+    profile_dir = tempfile.mkdtemp(prefix="meet-bot-profile-")
+    cmd = [chrome_binary(), f"--remote-debugging-port={port}", f"--user-data-dir={profile_dir}",
+           "--no-first-run", "--no-default-browser-check", *chrome_arguments(headless), "about:blank"]
+    sink = create_sink(f"chrome{port}")
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               env=sink.env() if sink else None)
+    chrome = WarmChrome(port=port, profile_dir=profile_dir, process=process, sink=sink)
+
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if not chrome.alive():
+            break
+        try:
+            _devtools(port, "/json/version")
+            return chrome
+        except OSError:
+            time.sleep(0.2)
+    chrome.destroy()
+    raise RuntimeError(f"Chrome did not come up on port {port}")
+
+
+def reset_chrome(chrome):
+    """
+    Make a used browser look fresh: open a blank tab and close every other
+    one. Returns False if the browser doesn't answer, so it gets destroyed.
+    """
+    try:
+        tabs = _devtools(chrome.port, "/json/list")
+        _devtools(chrome.port, "/json/new?about:blank", method="PUT")
+        for tab in tabs:
+            if tab.get("type") == "page":
+                _devtools(chrome.port, f"/json/close/{tab['id']}")
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+class ChromePool:
+    """
+    Keeps `size` idle browsers ready. acquire() never blocks: it returns a
+    warm browser or None (the bot then cold-starts its own). A background
+    thread launches replacements as browsers are taken or die.
+    """
+
+    def __init__(self, size=None, headless=None, max_uses=None,
+                 launcher=launch_chrome, resetter=reset_chrome):
+        self.size = size if size is not None else getattr(settings, "BOT_CHROME_POOL_SIZE", 2)
+        self.headless = headless
+        self.max_uses = max_uses or getattr(settings, "BOT_CHROME_MAX_USES", 5)
+        self.launcher = launcher
+        self.resetter = resetter
+        self._idle = []
+        self._launching = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._replenish, name="chrome-pool", daemon=True)
+        self._thread.start()
+
+    def idle_count(self):
+        with self._cond:
+            return len(self._idle)
+
+    def acquire(self):
+        with self._cond:
+            while self._idle:
+                chrome = self._idle.pop(0)
+                if chrome.alive():
+                    chrome.uses += 1
+                    self._cond.notify_all()
+                    return chrome
+                chrome.destroy()
+            self._cond.notify_all()
+            return None
+
+    def release(self, chrome, reusable=True):
+        """Return a browser after its bot exits: recycle it if possible, else destroy it."""
+        if chrome is None:
+            return
+        recycle = (reusable and chrome.uses < self.max_uses and chrome.alive()
+                   and self.resetter(chrome))
+        with self._cond:
+            if recycle and not self._closed and len(self._idle) < self.size:
+                self._idle.append(chrome)
+                self._cond.notify_all()
+                return
+            self._cond.notify_all()
+        chrome.destroy()
+
+    def _prune(self):
+        # browsers that crashed while idle leave a gap to refill
+        for chrome in [c for c in self._idle if not c.alive()]:
+            self._idle.remove(chrome)
+            chrome.destroy()
+
+    def _replenish(self):
+        failures = 0
+        while True:
+            with self._cond:
+                while not self._closed and len(self._idle) + self._launching >= self.size:
+                    self._cond.wait(5)
+                    self._prune()
+                if self._closed:
+                    return
+                self._launching += 1
+            try:
+                chrome = self.launcher(self.headless)
+                failures = 0
+            except Exception as e:
+                chrome = None
+                failures += 1
+                print(f"⚠️ Could not pre-launch Chrome: {e}")
+            with self._cond:
+                self._launching -= 1
+                if chrome is not None and not self._closed:
+                    self._idle.append(chrome)
+                    chrome = None
+            if chrome is not None:
+                chrome.destroy()
+            if failures:
+                # back off so a missing binary doesn't spin
+                time.sleep(min(60, 2 ** failures))
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for chrome in idle:
+            chrome.destroy()
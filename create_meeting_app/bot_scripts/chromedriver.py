@@ -0,0 +1,91 @@
+# create_meeting_app/bot_scripts/chromedriver.py
+#
+# Lazy, cached chromedriver lookup. Nothing happens at import time; the first
+# call to resolve_chromedriver() in a process checks, in order:
+#   1. settings.CHROMEDRIVER_PATH (a pinned local binary)
+#   2. the on-disk manifest written by a previous resolution
+#   3. webdriver_manager (network), whose result is written to the manifest
+# so on a warm host every later process only pays for a stat().
+
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+
+_DRIVER_PATH = None
+_LOCK = threading.Lock()
+
+
+def manifest_path():
+    return getattr(settings, "CHROMEDRIVER_MANIFEST",
+                   os.path.join(settings.BASE_DIR, "drivers", "chromedriver.json"))
+
+
+def pinned_version():
+    return getattr(settings, "CHROMEDRIVER_VERSION", "") or None
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def read_manifest():
+    try:
+        with open(manifest_path()) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict):
+        return None
+    if pinned_version() and entry.get("version") != pinned_version():
+        return None
+    return entry if _is_executable(entry.get("path")) else None
+
+
+def write_manifest(path, version=None):
+    target = manifest_path()
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    entry = {"path": path, "version": version, "resolved_at": time.time()}
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f)
+    # atomic, so a concurrent bot process never reads half a file
+    os.replace(tmp, target)
+    return entry
+
+
+def _download(version):
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager(driver_version=version).install()
+
+
+def resolve_chromedriver():
+    """Path of the chromedriver binary to use; memoized per process."""
+    global _DRIVER_PATH
+    if _DRIVER_PATH:
+        return _DRIVER_PATH
+    with _LOCK:
+        if _DRIVER_PATH:
+            return _DRIVER_PATH
+
+        configured = getattr(settings, "CHROMEDRIVER_PATH", "")
+        if configured:
+            if not _is_executable(configured):
+                raise RuntimeError(f"CHROMEDRIVER_PATH {configured} is not an executable file")
+            _DRIVER_PATH = configured
+            return _DRIVER_PATH
+
+        entry = read_manifest()
+        if entry is None:
+            print("🔎 Resolving chromedriver (not cached yet)...")
+            entry = write_manifest(_download(pinned_version()), pinned_version())
+        _DRIVER_PATH = entry["path"]
+        return _DRIVER_PATH
+
+
+def reset():
+    """Forget the memoized path (tests, or after a driver upgrade)."""
+    global _DRIVER_PATH
+    _DRIVER_PATH = None
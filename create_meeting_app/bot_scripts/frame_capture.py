@@ -0,0 +1,76 @@
+# create_meeting_app/bot_scripts/frame_capture.py
+#
+# Compressed, change-detected screenshots. Frames are grabbed as JPEG/WebP
+# straight from Chrome (CDP Page.captureScreenshot) every few seconds, but a
+# frame is only kept when its downscaled grayscale thumbnail differs enough
+# from the last kept one, i.e. when the slide or shared screen changed.
+
+import base64
+import io
+import os
+from datetime import datetime
+
+from django.conf import settings
+from PIL import Image, ImageChops, ImageStat
+
+SIGNATURE_SIZE = (32, 18)   # 16:9, enough to see a slide change, blind to cursor moves
+
+
+def frame_interval():
+    return getattr(settings, "BOT_FRAME_INTERVAL", 3)
+
+
+def capture_frame(driver, fmt=None, quality=None):
+    """Encoded screenshot bytes straight from Chrome, no PNG round trip."""
+    fmt = fmt or getattr(settings, "BOT_FRAME_FORMAT", "jpeg")
+    quality = quality or getattr(settings, "BOT_FRAME_QUALITY", 70)
+    result = driver.execute_cdp_cmd("Page.captureScreenshot", {"format": fmt, "quality": quality})
+    return base64.b64decode(result["data"])
+
+
+def signature(data):
+    """Tiny grayscale thumbnail used for change detection."""
+    with Image.open(io.BytesIO(data)) as image:
+        return image.convert("L").resize(SIGNATURE_SIZE, Image.BILINEAR)
+
+
+def change_ratio(a, b):
+    """Mean absolute pixel difference of two signatures, 0.0 (same) .. 1.0."""
+    return ImageStat.Stat(ImageChops.difference(a, b)).mean[0] / 255.0
+
+
+class FrameSampler:
+    """
+    Decides which sampled frames are worth keeping and tracks how much was
+    skipped. consider() returns True for the first frame and for every frame
+    that changed by at least `threshold` from the last kept one.
+    """
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold if threshold is not None else getattr(settings, "BOT_FRAME_CHANGE_THRESHOLD", 0.04)
+        self._last = None
+        self.sampled = 0
+        self.kept = 0
+        self.bytes_kept = 0
+
+    def consider(self, data):
+        self.sampled += 1
+        current = signature(data)
+        if self._last is not None and change_ratio(self._last, current) < self.threshold:
+            return False
+        self._last = current
+        self.kept += 1
+        self.bytes_kept += len(data)
+        return True
+
+
+def save_frame(meeting_id, data, fmt=None, label=None):
+    """Write an encoded frame under media/screenshots and return its path."""
+    fmt = fmt or getattr(settings, "BOT_FRAME_FORMAT", "jpeg")
+    ext = "jpg" if fmt == "jpeg" else fmt
+    label = label or datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    os.makedirs("media/screenshots", exist_ok=True)
+    path = f"media/screenshots/{meeting_id}_{label}.{ext}"
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
@@ -6,38 +6,97 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import WebDriverException
 
 import threading, time, os, subprocess
 from datetime import datetime
 
-from create_meeting_app.models import Screenshot
+from create_meeting_app.models import Screenshot, Transcript, TranscriptSegment
+from create_meeting_app.bot_scripts import call_events, captions, frame_capture
+from create_meeting_app.bot_scripts.audio_sink import DEFAULT_MONITOR, create_sink
+from create_meeting_app.bot_scripts.chrome_pool import chrome_arguments
+from create_meeting_app.bot_scripts.chromedriver import resolve_chromedriver
+from create_meeting_app.signals import meetings_changed
+from create_meeting_app.utils.batch_writer import BatchWriter
+from create_meeting_app.utils.moderation import filter_hate_speech
 
-# Install once, reuse same binary
-CHROMEDRIVER_PATH = ChromeDriverManager().install()
-
-def start_audio_recorder(meeting_id: int):
+def start_audio_recorder(meeting_id: int, monitor: str = DEFAULT_MONITOR):
     os.makedirs("media/recordings", exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     wav_path  = f"media/recordings/meet_{meeting_id}_{timestamp}.wav"
-    MONITOR   = "alsa_output.pci-0000_00_1f.3.analog-stereo.monitor"
-    cmd = ["ffmpeg","-y","-f","pulse","-i",MONITOR,"-ac","1","-ar","16000",wav_path]
+    cmd = ["ffmpeg","-y","-f","pulse","-i",monitor,"-ac","1","-ar","16000",wav_path]
     return subprocess.Popen(cmd), wav_path
 
-def join_meeting(meeting_link: str, bot_name: str, meeting):
+class CaptionLog:
+    """
+    Live captions of one meeting: a captions Transcript whose segments are
+    batch-written as they settle, and whose text is filled in at the end.
+    """
+    def __init__(self, meeting):
+        self.transcript = Transcript.objects.create(
+            meeting=meeting, text='', source=Transcript.SOURCE_CAPTIONS)
+        self.writer = BatchWriter(
+            TranscriptSegment, batch_size=20, flush_interval=5.0,
+            on_flush=lambda batch: meetings_changed([meeting.id]),
+        )
+        self.tracker = captions.CaptionTracker(self._add)
+
+    def _add(self, speaker, text, start, end):
+        self.writer.add(captions.segment(self.transcript, speaker, text, start, end))
+
+    def close(self):
+        self.tracker.close()
+        self.writer.close()
+        segments = list(self.transcript.segments.order_by('start_time', 'id'))
+        if not segments:
+            # nothing captured: leave the meeting to transcribe_meeting (ASR)
+            self.transcript.delete()
+            return
+        self.transcript.raw_text = captions.transcript_text(segments)
+        # the page shows Transcript.text: only the part that passed the filter
+        self.transcript.text, self.transcript.hateful_text = filter_hate_speech(self.transcript.raw_text)
+        self.transcript.save()
+        print(f"💬 Saved {len(segments)} caption segment(s) for meeting {self.transcript.meeting_id}")
+
+def end_session(driver, pooled):
+    """
+    Cold-started browsers are ours to quit. A pooled one belongs to the
+    supervisor's ChromePool: leave the Meet page and stop chromedriver only,
+    so the pool can reset and reuse the browser.
+    """
+    if not pooled:
+        try: driver.quit()
+        except Exception: pass
+        return
+    try: driver.get("about:blank")
+    except Exception: pass
+    try: driver.service.stop()
+    except Exception: pass
+
+def join_meeting(meeting_link: str, bot_name: str, meeting, on_joined=None,
+                 debugger_address=None, audio_sink=None):
     options = Options()
-    # Core flags to auto-accept permissions & prevent popups
-    options.add_argument("--use-fake-ui-for-media-stream")
-    options.add_argument("--disable-infobars")
-    options.add_argument("--disable-popup-blocking")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    # Linux stability flags
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    service = Service(CHROMEDRIVER_PATH)
-    driver  = webdriver.Chrome(service=service, options=options)
+    own_sink = None
+    caption_log = None
+    if debugger_address:
+        # attach to a pre-launched browser from the supervisor's ChromePool;
+        # its flags (and PULSE_SINK) were set when it was started
+        options.debugger_address = debugger_address
+    else:
+        for arg in chrome_arguments():
+            options.add_argument(arg)
+        # cold start: a sink of our own, inherited by Chrome via chromedriver
+        own_sink = create_sink(f"meeting{meeting.id}")
+        audio_sink = own_sink.name if own_sink else None
+
+    # resolved on first use and cached on disk, not at import time
+    service = Service(resolve_chromedriver(), env=own_sink.env() if own_sink else None)
+    try:
+        driver = webdriver.Chrome(service=service, options=options)
+    except Exception:
+        if own_sink:
+            own_sink.remove()
+        raise
     print("📎 Chrome session_id:", driver.session_id)
 
     try:
@@ -83,41 +142,72 @@ def join_meeting(meeting_link: str, bot_name: str, meeting):
                 (By.XPATH, "//span[contains(text(),'Ask to join')]")
             ))
         driver.execute_script("arguments[0].click();", join_btn)
+        if on_joined:
+            on_joined()
 
         # Start audio and screenshots watcher
-        recorder, _ = start_audio_recorder(meeting.id)
+        # record only this bot's sink, so concurrent bots don't overlap
+        monitor = f"{audio_sink}.monitor" if audio_sink else DEFAULT_MONITOR
+        recorder, _ = start_audio_recorder(meeting.id, monitor)
         stop_flag = threading.Event()
         os.makedirs("media/screenshots", exist_ok=True)
+        # Screenshot rows go through one writer thread so many bots on a host
+        # don't each hold the SQLite write lock for single-row inserts.
+        shots_writer = BatchWriter(
+            Screenshot, batch_size=10, flush_interval=5.0,
+            on_flush=lambda batch: meetings_changed({s.meeting_id for s in batch}),
+        )
+
+        caption_log = CaptionLog(meeting) if captions.captions_enabled() else None
 
         def watcher():
-            # On-arrival screenshot
-            shot0 = f"media/screenshots/{meeting.id}_joined.png"
-            driver.save_screenshot(shot0)
-            Screenshot.objects.create(meeting=meeting, image_path=shot0)
-
-            while not stop_flag.is_set():
-                for _ in range(30):
-                    if stop_flag.is_set(): break
-                    time.sleep(1)
-
-                try:
-                    # Detect end
-                    if driver.find_elements(By.XPATH,
-                        "//div[contains(text(),'Call ended') or contains(text(),'You left the call')]"
-                    ):
+            # Frames are sampled every few seconds as compressed JPEG/WebP and
+            # only kept when the screen actually changed (new slide etc.).
+            sampler = frame_capture.FrameSampler()
+
+            def sample(label=None):
+                data = frame_capture.capture_frame(driver)
+                if sampler.consider(data):
+                    shot = frame_capture.save_frame(meeting.id, data, label=label)
+                    shots_writer.add(Screenshot(meeting=meeting, image_path=shot))
+
+            # End-of-call and participant changes arrive from the page's
+            # MutationObserver; frames are sampled between events.
+            call = call_events.CallState()
+            interval = frame_capture.frame_interval()
+            next_shot = time.monotonic() + interval
+            # captions are read about once a second when enabled
+            max_wait = 1.0 if caption_log else 5.0
+            try:
+                # On-arrival screenshot
+                sample(label="joined")
+                call_events.install(driver)
+                if caption_log:
+                    captions.enable_captions(driver)
+                while not stop_flag.is_set():
+                    timeout = max(0.0, min(next_shot - time.monotonic(), max_wait))
+                    actions = [call.feed(e) for e in call_events.wait_events(driver, timeout)]
+                    actions.append(call.tick())
+                    if caption_log:
+                        caption_log.tracker.update(captions.parse_caption_blocks(captions.caption_html(driver)))
+
+                    if "leave" in actions:
+                        print(f"🚪 Alone in {meeting.id} for {call.alone_seconds}s, leaving")
+                        call_events.leave(driver)
+                    if "end" in actions or "leave" in actions:
                         stop_flag.set()
-                        try: driver.quit()
-                        except: pass
                         return
 
-                    # Periodic screenshot
-                    ts   = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    shot = f"media/screenshots/{meeting.id}_{ts}.png"
-                    driver.save_screenshot(shot)
-                    Screenshot.objects.create(meeting=meeting, image_path=shot)
-                except WebDriverException:
-                    stop_flag.set()
-                    return
+                    if time.monotonic() >= next_shot:
+                        sample()
+                        next_shot = time.monotonic() + interval
+            except WebDriverException:
+                stop_flag.set()
+                return
+            finally:
+                stop_flag.set()  # never leave join_meeting waiting on a dead watcher
+                print(f"🖼 Kept {sampler.kept}/{sampler.sampled} frames "
+                      f"({sampler.bytes_kept / 1024:.0f} KB) for meeting {meeting.id}")
 
         threading.Thread(target=watcher, daemon=True).start()
         stop_flag.wait()
@@ -125,7 +215,13 @@ def join_meeting(meeting_link: str, bot_name: str, meeting):
     finally:
         try: recorder.terminate()
         except: pass
-        # Browser quit is handled in watcher
+        try: shots_writer.close()
+        except: pass
+        if caption_log:
+            caption_log.close()
+        end_session(driver, pooled=bool(debugger_address))
+        if own_sink:
+            own_sink.remove()
 
 # Quick local test
 if __name__ == "__main__":
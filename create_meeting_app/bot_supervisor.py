@@ -0,0 +1,288 @@
+# create_meeting_app/bot_supervisor.py
+#
+# Runs each Google Meet bot in its own process so the scheduler never blocks
+# on a call. Nothing here imports models or selenium at module level: bot
+# processes are started with "spawn" and set Django up themselves.
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, date
+from typing import Optional
+
+from django.conf import settings
+
+from create_meeting_app.bot_metrics import TreeSampler, proc_available
+
+# optional: more accurate host metrics
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except Exception:
+    PSUTIL_AVAILABLE = False
+
+
+def _bot_process(meeting_id, events, debugger_address=None, audio_sink=None):
+    """
+    Entry point of a bot process: join the meeting and report the moment the
+    join button was clicked back to the supervisor. `debugger_address` and
+    `audio_sink` describe a pre-launched Chrome from the supervisor's pool,
+    if one was available.
+    """
+    import django
+    django.setup()
+    from create_meeting_app.models import Meeting
+    from create_meeting_app.bot_scripts import google_meet_bot
+
+    meeting = Meeting.objects.get(pk=meeting_id)
+    google_meet_bot.join_meeting(
+        meeting.meeting_link, meeting.bot_name, meeting,
+        on_joined=lambda: events.put(('joined', meeting_id, time.time())),
+        debugger_address=debugger_address, audio_sink=audio_sink,
+    )
+
+
+def host_cpu_percent():
+    if PSUTIL_AVAILABLE:
+        return psutil.cpu_percent(interval=None)
+    # 1-minute load average relative to the number of cores
+    return 100.0 * os.getloadavg()[0] / (os.cpu_count() or 1)
+
+
+def host_free_mb():
+    if PSUTIL_AVAILABLE:
+        return psutil.virtual_memory().available / (1024 * 1024)
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("inf")
+
+
+@dataclass
+class BotRecord:
+    meeting_id: int
+    name: str
+    join_time: Optional[object]
+    process: object = None
+    status: str = "starting"      # starting | running | joined | restart_pending | finished | failed
+    restarts: int = 0
+    started_at: float = 0.0
+    joined_at: Optional[float] = None
+    join_latency: Optional[float] = None  # seconds after join_time (negative = early)
+    time_to_join: Optional[float] = None  # seconds from process start to the join click
+    browser: object = None                # WarmChrome from the pool, or None for a cold start
+    warm: bool = False
+    exitcode: Optional[int] = None
+    history: list = field(default_factory=list)
+    last_sample: Optional[dict] = None
+
+
+class BotSupervisor:
+    """
+    Admission-controlled pool of bot processes.
+
+    A meeting is only admitted while fewer than `max_browsers` bots run, host
+    CPU is below `max_cpu_percent` and at least `min_free_mb` of RAM is free.
+    Crashed bots (non-zero exit) are restarted up to `max_restarts` times.
+    With a `chrome_pool`, each bot attaches to an already running browser.
+    Every `sample_interval` seconds poll() samples each running bot's process
+    tree (plus its pooled browser) and passes the rows to `on_samples`.
+    """
+
+    def __init__(self, max_browsers=None, max_cpu_percent=None, min_free_mb=None,
+                 max_restarts=None, target=_bot_process, mp_context="spawn", chrome_pool=None,
+                 sample_interval=None, on_samples=None):
+        self.max_browsers = max_browsers or getattr(settings, "BOT_MAX_BROWSERS", 4)
+        self.max_cpu_percent = max_cpu_percent or getattr(settings, "BOT_MAX_CPU_PERCENT", 85)
+        self.min_free_mb = min_free_mb or getattr(settings, "BOT_MIN_FREE_MB", 1024)
+        self.max_restarts = max_restarts if max_restarts is not None else getattr(settings, "BOT_MAX_RESTARTS", 2)
+        self.target = target
+        self.chrome_pool = chrome_pool
+        self.sample_interval = sample_interval or getattr(settings, "BOT_SAMPLE_INTERVAL", 10)
+        self.on_samples = on_samples
+        self._sampler = TreeSampler() if proc_available() else None
+        self._last_sample_at = 0.0
+        self._ctx = multiprocessing.get_context(mp_context)
+        self._events = self._ctx.Queue()
+        self._lock = threading.Lock()
+        self.bots = {}  # meeting_id -> BotRecord
+
+    # ---------- admission ----------
+    def running(self):
+        return [b for b in self.bots.values() if b.process is not None and b.process.is_alive()]
+
+    def admission_error(self):
+        """Return why a new bot can't start right now, or None if it can."""
+        if len(self.running()) >= self.max_browsers:
+            return f"{self.max_browsers} browsers already running"
+        cpu = host_cpu_percent()
+        if cpu >= self.max_cpu_percent:
+            return f"host CPU at {cpu:.0f}%"
+        free = host_free_mb()
+        if free < self.min_free_mb:
+            return f"only {free:.0f} MB RAM free"
+        return None
+
+    # ---------- lifecycle ----------
+    def dispatch(self, meeting):
+        """Start a bot process for `meeting`. Returns False if not admitted."""
+        with self._lock:
+            if meeting.pk in self.bots and self.bots[meeting.pk].process.is_alive():
+                return True
+            reason = self.admission_error()
+            if reason:
+                print(f"⏸ Not admitting {meeting.name}: {reason}")
+                return False
+            record = BotRecord(meeting_id=meeting.pk, name=meeting.name, join_time=meeting.join_time)
+            self.bots[meeting.pk] = record
+            self._start(record)
+            return True
+
+    def _start(self, record):
+        record.browser = self.chrome_pool.acquire() if self.chrome_pool else None
+        record.warm = record.browser is not None
+        address = record.browser.address if record.warm else None
+        sink = record.browser.sink_name if record.warm else None
+        record.process = self._ctx.Process(
+            target=self.target, args=(record.meeting_id, self._events, address, sink),
+            name=f"meet-bot-{record.meeting_id}", daemon=False,
+        )
+        record.started_at = time.time()
+        record.status = "running"
+        record.exitcode = None
+        record.process.start()
+        print(f"🚀 Bot for {record.name} started (pid {record.process.pid}, "
+              f"{'warm' if record.warm else 'cold'} Chrome)")
+
+    def _restart(self, record):
+        record.restarts += 1
+        print(f"🔁 Bot for {record.name} exited with {record.exitcode}; "
+              f"restart {record.restarts}/{self.max_restarts}")
+        self._start(record)
+
+    def _release_browser(self, record, reusable):
+        if self.chrome_pool and record.browser is not None:
+            self.chrome_pool.release(record.browser, reusable=reusable)
+        record.browser = None
+
+    def _drain_events(self):
+        while True:
+            try:
+                kind, meeting_id, ts = self._events.get_nowait()
+            except queue.Empty:
+                return
+            record = self.bots.get(meeting_id)
+            if record is None or kind != "joined":
+                continue
+            record.status = "joined"
+            record.joined_at = ts
+            record.time_to_join = ts - record.started_at
+            print(f"⏱ {record.name} joined {record.time_to_join:.1f}s after launch "
+                  f"({'warm' if record.warm else 'cold'} Chrome)")
+            if record.join_time is not None:
+                due = datetime.combine(date.fromtimestamp(ts), record.join_time).timestamp()
+                record.join_latency = ts - due
+                print(f"⏱ {record.name} joined {record.join_latency:+.1f}s relative to join_time")
+
+    def poll(self):
+        """
+        Collect join events, reap exited bots and restart crashed ones.
+        Call this regularly (the scheduler does, every few seconds).
+        """
+        with self._lock:
+            self._drain_events()
+            for record in self.bots.values():
+                if record.status == "restart_pending":
+                    # crashed while the host was busy: restart once there is room
+                    if not self.admission_error():
+                        self._restart(record)
+                    continue
+                proc = record.process
+                if proc is None or proc.is_alive() or record.status in ("finished", "failed"):
+                    continue
+                proc.join(0)
+                record.exitcode = proc.exitcode
+                record.history.append((record.started_at, time.time(), proc.exitcode))
+                self._release_browser(record, reusable=proc.exitcode == 0)
+                if proc.exitcode == 0:
+                    record.status = "finished"
+                    print(f"✅ Bot for {record.name} finished.")
+                elif record.restarts < self.max_restarts:
+                    reason = self.admission_error()
+                    if reason:
+                        record.status = "restart_pending"
+                        print(f"⏸ Bot for {record.name} exited with {proc.exitcode}; "
+                              f"restart deferred: {reason}")
+                    else:
+                        self._restart(record)
+                else:
+                    record.status = "failed"
+                    print(f"❌ Bot for {record.name} failed (exit {proc.exitcode}).")
+            self._sample()
+
+    def _sample(self):
+        if self._sampler is None or time.monotonic() - self._last_sample_at < self.sample_interval:
+            return
+        self._last_sample_at = time.monotonic()
+        rows = []
+        for record in self.bots.values():
+            if record.process is None or not record.process.is_alive():
+                self._sampler.forget(record.meeting_id)
+                continue
+            roots = [record.process.pid]
+            if record.browser is not None:
+                roots.append(record.browser.process.pid)
+            record.last_sample = self._sampler.sample(record.meeting_id, roots)
+            rows.append(dict(record.last_sample, meeting_id=record.meeting_id))
+        if rows and self.on_samples:
+            try:
+                self.on_samples(rows)
+            except Exception as e:
+                print(f"⚠️ Could not store resource samples: {e}")
+
+    def status(self):
+        """Snapshot of every tracked bot, for logging or a health endpoint."""
+        with self._lock:
+            return [{
+                "meeting_id": b.meeting_id,
+                "name": b.name,
+                "status": b.status,
+                "pid": b.process.pid if b.process else None,
+                "alive": bool(b.process and b.process.is_alive()),
+                "restarts": b.restarts,
+                "exitcode": b.exitcode,
+                "join_latency": b.join_latency,
+                "time_to_join": b.time_to_join,
+                "warm": b.warm,
+                "resources": b.last_sample,
+            } for b in self.bots.values()]
+
+    def join_stats(self):
+        """Mean time-to-join for warm vs cold Chrome starts, to confirm the pool pays off."""
+        with self._lock:
+            stats = {}
+            for kind, warm in (("warm", True), ("cold", False)):
+                times = [b.time_to_join for b in self.bots.values()
+                         if b.warm == warm and b.time_to_join is not None]
+                stats[kind] = {
+                    "count": len(times),
+                    "mean": sum(times) / len(times) if times else None,
+                }
+            return stats
+
+    def shutdown(self, timeout=10):
+        for record in self.running():
+            record.process.terminate()
+        for record in self.bots.values():
+            if record.process is not None:
+                record.process.join(timeout)
+            self._release_browser(record, reusable=False)
+        if self.chrome_pool:
+            self.chrome_pool.close()
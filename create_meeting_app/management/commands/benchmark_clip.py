@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from create_meeting_app.models import Screenshot
+from create_meeting_app.utils.match_clip_embeddings import (
+    CLIP_BACKENDS, _compute_image_embeddings, clip_backend, parity_report, similarity_matrix,
+)
+
+DEFAULT_SENTENCES = [
+    "A slide with a bar chart of quarterly revenue",
+    "A shared spreadsheet with budget numbers",
+    "A participant's camera view",
+    "A code editor showing source code",
+    "A presentation title slide",
+]
+
+class Command(BaseCommand):
+    help = "Images/second of each CLIP backend and how far its similarity scores drift from fp32"
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Images to use (default: stored screenshots)')
+        parser.add_argument('--meeting', type=int, help='Use this meeting\'s screenshots')
+        parser.add_argument('--limit', type=int, default=64)
+        parser.add_argument('--backends', default=','.join(CLIP_BACKENDS),
+                            help='Comma-separated; scores are compared against the first one')
+
+    def handle(self, *args, **options):
+        paths = options['paths']
+        if not paths:
+            shots = Screenshot.objects.order_by('-created')
+            if options['meeting']:
+                shots = shots.filter(meeting_id=options['meeting'])
+            paths = list(shots.values_list('image_path', flat=True)[:options['limit']])
+        paths = paths[:options['limit']]
+        if not paths:
+            raise CommandError("No images to benchmark.")
+        try:
+            backends = [clip_backend(b.strip()) for b in options['backends'].split(',') if b.strip()]
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        reference = None
+        for backend in backends:
+            _compute_image_embeddings(paths[:1], backend=backend)  # load / export outside the timing
+            started = time.perf_counter()
+            _compute_image_embeddings(paths, backend=backend)
+            rate = len(paths) / (time.perf_counter() - started)
+            sims = similarity_matrix(DEFAULT_SENTENCES, paths, backend=backend)
+            line = f"⏱ {backend:<6} {rate:7.1f} images/s"
+            if reference is None:
+                reference = sims
+                line += "  (reference)"
+            else:
+                report = parity_report(reference, sims)
+                line += (f"  max |Δscore| {report['max_abs_diff']:.4f}"
+                         f"  top-1 agreement {report['top1_agreement']:.0%}")
+            self.stdout.write(line)
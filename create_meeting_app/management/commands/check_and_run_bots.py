@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from create_meeting_app.models import Meeting
 from datetime import datetime, timedelta
 from create_meeting_app.bot_scripts.google_meet_bot import join_meeting
+from create_meeting_app.scheduler import NODE_ID, LeaseHeartbeat, lease_seconds
 
 class Command(BaseCommand):
     help = "Checks for meetings to join and uses bot to join"
@@ -12,23 +13,26 @@ class Command(BaseCommand):
         one_minute_later = (datetime.now() + timedelta(minutes=1)).time().replace(second=0, microsecond=0)
 
         print(f"⌚ Checking meetings between {five_minutes_ago} and {one_minute_later}")
-        meetings_to_join = Meeting.objects.filter(
-            join_time__gte=five_minutes_ago,
-            join_time__lt=one_minute_later,
-            joined=False
-        )
+        meetings_to_join = Meeting.objects.due(five_minutes_ago, one_minute_later)
 
         if not meetings_to_join.exists():
             self.stdout.write("📭 No meetings to join at this time.")
             return
 
         for meeting in meetings_to_join:
+            # Claim first so a running scheduler (or another host) can't
+            # launch a second browser for the same meeting.
+            if not Meeting.objects.claim(meeting.pk, NODE_ID, lease_seconds()):
+                self.stdout.write(f"⏭ {meeting.name} already claimed elsewhere.")
+                continue
             self.stdout.write(f"🤖 Joining meeting: {meeting.name} as bot '{meeting.bot_name}'")
             try:
-                # Pass the Meeting instance to the function
-                join_meeting(meeting.meeting_link, meeting.bot_name, meeting)
-                meeting.joined = True
-                meeting.save()
+                # Pass the Meeting instance to the function. The call blocks
+                # for the whole meeting, so renew the lease in the background.
+                with LeaseHeartbeat(meeting.pk):
+                    join_meeting(meeting.meeting_link, meeting.bot_name, meeting)
                 self.stdout.write("✅ Marked as joined.")
             except Exception as e:
-                self.stdout.write(f"❌ Failed to join: {e}")
\ No newline at end of file
+                self.stdout.write(f"❌ Failed to join: {e}")
+            finally:
+                Meeting.objects.release(meeting.pk, NODE_ID)
\ No newline at end of file
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from create_meeting_app.models import Screenshot
+from create_meeting_app.utils.export_pdf import _resolve_screenshot_path
+from create_meeting_app.utils.ocr import OCR_AVAILABLE
+from create_meeting_app.utils.screenshot_embeddings import BATCH_SIZE, embed_missing, ocr_missing
+
+class Command(BaseCommand):
+    help = "Stores the CLIP image embedding (and with --ocr the OCR text) of screenshots that don't have one yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting', type=int, help='Only this meeting\'s screenshots')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--ocr', action='store_true', help='Also OCR frames (needs pytesseract)')
+
+    def handle(self, *args, **options):
+        missing = Q(clip_embedding__isnull=True)
+        if options['ocr']:
+            if not OCR_AVAILABLE:
+                raise CommandError("pytesseract is not installed.")
+            missing |= Q(ocr_text__isnull=True)
+        # capture order, so near-duplicate frames are next to each other for OCR
+        shots = Screenshot.objects.filter(missing).order_by('meeting', 'created', 'pk')
+        if options['meeting']:
+            shots = shots.filter(meeting_id=options['meeting'])
+
+        found, paths, skipped = [], [], 0
+        for shot in shots.iterator():
+            path = _resolve_screenshot_path(shot)
+            if path:
+                found.append(shot)
+                paths.append(path)
+            else:
+                skipped += 1
+
+        done = embed_missing(found, paths, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"🧠 Embedded {done} screenshots ({skipped} without a file)."))
+        if options['ocr']:
+            pending = sum(s.ocr_text is None for s in found)
+            ran = ocr_missing(found, paths)
+            self.stdout.write(self.style.SUCCESS(
+                f"🔤 OCR'd {ran} of {pending} screenshots; the rest were near-duplicates."))
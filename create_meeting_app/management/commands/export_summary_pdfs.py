@@ -0,0 +1,47 @@
+import shutil
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from create_meeting_app.utils.batch_export import export_pdfs, meetings_for_export, merged_pdf, zip_stream
+
+class Command(BaseCommand):
+    help = 'Exports the summary PDFs of a date range or list of meetings as one ZIP or one merged PDF'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ids', help='Comma-separated meeting ids')
+        parser.add_argument('--from', dest='start', type=date.fromisoformat, help='YYYY-MM-DD (meeting creation date)')
+        parser.add_argument('--to', dest='end', type=date.fromisoformat, help='YYYY-MM-DD, inclusive')
+        parser.add_argument('--format', choices=['zip', 'merged'], default='zip')
+        parser.add_argument('--output', required=True, help='Where to write the .zip / .pdf')
+        parser.add_argument('--workers', type=int, help='WeasyPrint processes (default PDF_EXPORT_WORKERS)')
+
+    def handle(self, *args, **options):
+        try:
+            ids = [int(i) for i in options['ids'].split(',')] if options['ids'] else None
+        except ValueError:
+            raise CommandError("--ids must be comma-separated integers.")
+        meetings = meetings_for_export(ids=ids, start=options['start'], end=options['end'])
+        if not meetings.exists():
+            raise CommandError("No meetings match.")
+        results = self._report(export_pdfs(meetings, workers=options['workers']))
+
+        if options['format'] == 'zip':
+            with open(options['output'], 'wb') as f:
+                for chunk in zip_stream(results):
+                    f.write(chunk)
+        else:
+            try:
+                path, _errors = merged_pdf(results)
+            except ValueError as e:
+                raise CommandError(str(e))
+            shutil.copyfile(path, options['output'])
+        self.stdout.write(self.style.SUCCESS(f"📦 Wrote {options['output']}"))
+
+    def _report(self, results):
+        for meeting, path, error in results:
+            if error:
+                self.stdout.write(f"⚠️ {meeting.name} (#{meeting.pk}): {error}")
+            else:
+                self.stdout.write(f"📄 {meeting.name} (#{meeting.pk})")
+            yield meeting, path, error
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from create_meeting_app.models import Meeting
+from create_meeting_app.utils.export_pdf import _resolve_screenshot_path
+from create_meeting_app.utils.screenshot_dedup import reduction_ratio, representatives
+
+class Command(BaseCommand):
+    help = "Hashes screenshots and reports how many near-duplicates each meeting has (nothing is deleted)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting', type=int, help='Only this meeting')
+        parser.add_argument('--distance', type=int, help='Max differing bits (default SCREENSHOT_DUPLICATE_DISTANCE)')
+
+    def handle(self, *args, **options):
+        meetings = Meeting.objects.filter(screenshots__isnull=False).distinct().order_by('pk')
+        if options['meeting']:
+            meetings = meetings.filter(pk=options['meeting'])
+
+        total = kept_total = 0
+        for meeting in meetings:
+            shots, paths = [], []
+            for shot in meeting.screenshots.order_by('created').defer('clip_embedding', 'ocr_embedding'):
+                path = _resolve_screenshot_path(shot)
+                if path:
+                    shots.append(shot)
+                    paths.append(path)
+            if not shots:
+                continue
+            kept, _groups = representatives(shots, paths, options['distance'])
+            total += len(shots)
+            kept_total += len(kept)
+            self.stdout.write(f"🖼 {meeting.name} (#{meeting.pk}): {len(shots)} → {len(kept)} distinct, "
+                              f"{reduction_ratio(len(shots), len(kept)):.0%} reduction")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"📊 {total} screenshots → {kept_total} distinct, {reduction_ratio(total, kept_total):.0%} reduction overall"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from create_meeting_app.model_server import ModelServer, socket_path
+
+class Command(BaseCommand):
+    help = 'Serves CLIP, MiniLM, punctuation and fastText to every process on this host'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--preload', action='store_true',
+                            help='Load every model before accepting connections')
+
+    def handle(self, *args, **options):
+        path = socket_path()
+        if not path:
+            return self.stderr.write("MODEL_SERVER_SOCKET is empty; nothing to serve.")
+        if options['preload']:
+            from create_meeting_app.utils import model_registry
+            for name in ("clip", "minilm", "minilm-multilingual", "punctuation", "lid"):
+                model_registry.get(name)
+        server = ModelServer(path)
+        self.stdout.write(f"🧠 Model server listening on {path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        self.stdout.write(self.style.SUCCESS("🎯 Model server stopped."))
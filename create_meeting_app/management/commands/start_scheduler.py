@@ -2,8 +2,8 @@ from django.core.management.base import BaseCommand
 from create_meeting_app.scheduler import start
 
 class Command(BaseCommand):
-    help = 'Starts the background APScheduler'
+    help = 'Starts the meeting timer that launches bots at their join_time'
 
     def handle(self, *args, **options):
         start()
-        self.stdout.write(self.style.SUCCESS("🎯 APScheduler started successfully!"))
+        self.stdout.write(self.style.SUCCESS("🎯 Meeting timer stopped."))
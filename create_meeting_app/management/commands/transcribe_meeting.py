@@ -2,17 +2,11 @@ from django.core.management.base import BaseCommand
 from create_meeting_app.models import Meeting, Transcript, TranscriptSegment
 import os
 import datetime
-from deepmultilingualpunctuation import PunctuationModel
 from create_meeting_app.utils.tts import generate_tts_and_save
 import requests
 from django.conf import settings
-
-# NEW: Import for Bangla sentence splitting
-try:
-    from bnlp import NLTKTokenizer
-    bnlp_available = True
-except ImportError:
-    bnlp_available = False
+from create_meeting_app import model_server
+from create_meeting_app.utils.moderation import filter_hate_speech, moderate_transcript
 
 ENGLISH_WORDS = {
     
@@ -28,40 +22,6 @@ def get_seconds(d):
         return d.seconds + d.microseconds / 1e6
     return float(d)
 
-def detect_hate_speech(text):
-    prompt = f"""
-You are an expert at detecting hate speech in Bangla text.
-
-Hate speech is language that expresses discrimination, hostility, or violence against individuals or groups based on attributes like race, religion, ethnicity, nationality, gender, sexual orientation, political affiliation, origin, body shaming, or disability. Key indicators include dehumanizing language, calls for violence, discriminatory slurs, stereotyping, promoting supremacy, or personal offenses. Consider cultural context, dialects, and code-mixing in Bangla.
-
-Classify the following Bangla text as hate speech.
-Respond only with 'hate' or 'safe'.
-
-Text: {text}
-""".strip()
-
-    try:
-        resp = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {settings.GROQ_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": "llama3-8b-8192",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0,
-                "max_tokens": 10,
-            },
-            timeout=30,
-        )
-        resp.raise_for_status()
-        classification = resp.json()["choices"][0]["message"]["content"].strip().lower()
-        return 'hate' in classification
-    except Exception as e:
-        print(f"⚠️ Error in hate detection: {e}")
-        return False  # Assume safe if error
-
 def transcribe_audio_with_gpt5(audio_path):
     """Transcribe audio using GPT-5 API (assumed endpoint and configuration)."""
     try:
@@ -94,6 +54,8 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('meeting_id', type=int)
+        parser.add_argument('--force-asr', action='store_true',
+                            help="Transcribe the audio even if live captions were captured")
 
     def handle(self, *args, **options):
         mid = options['meeting_id']
@@ -101,13 +63,23 @@ class Command(BaseCommand):
         if not meeting:
             return self.stderr.write("❌ Meeting not found.")
 
+        # Live captions (BOT_CAPTIONS) are free; paid ASR is the fallback
+        captioned = meeting.transcripts.filter(source=Transcript.SOURCE_CAPTIONS).exclude(text='')
+        if captioned.exists() and not options['force_asr']:
+            # same moderation and TTS as an ASR transcript, no transcription
+            for transcript in captioned:
+                if transcript.hateful_text is None:
+                    moderate_transcript(transcript)
+                if transcript.text and not transcript.transcript_audio:
+                    generate_tts_and_save(transcript.text, 'bn', transcript.transcript_audio, transcript, f"transcript_{mid}.mp3")
+                    transcript.save(update_fields=['transcript_audio'])
+            return self.stdout.write("💬 Meeting already has a live-caption transcript; use --force-asr to transcribe anyway.")
+
         recordings = sorted(f for f in os.listdir("media/recordings")
                            if f.endswith('.wav') and f"_{mid}_" in f)
         if not recordings:
             return self.stdout.write("📭 No recordings found.")
 
-        punctuator = PunctuationModel()
-
         for wav in recordings:
             path = os.path.join("media/recordings", wav)
             self.stdout.write(f"🗣 Transcribing {wav}…")
@@ -118,37 +90,17 @@ class Command(BaseCommand):
 
                 # Build transcript
                 raw = transcription.get('text', '')
-                punct = punctuator.restore_punctuation(raw).replace('.', '।')
+                punct = model_server.punctuate([raw])[0].replace('.', '।')
                 final_text = restore_english_words(punct)
 
                 # Filter for hate speech (sentence-level)
-                if bnlp_available:
-                    bnltk = NLTKTokenizer()
-                    sentences = bnltk.sentence_tokenization(final_text)
-                else:
-                    # Fallback: Split on Bangla full stop
-                    sentences = [s.strip() for s in final_text.split('।') if s.strip()]
-
-                clean_sentences = []
-                hateful_sentences = []
-                for sentence in sentences:
-                    if ': ' in sentence:
-                        speaker, text = sentence.split(': ', 1)
-                        if detect_hate_speech(text):
-                            hateful_sentences.append(sentence)
-                        else:
-                            clean_sentences.append(sentence)
-                    else:
-                        if detect_hate_speech(sentence):
-                            hateful_sentences.append(sentence)
-                        else:
-                            clean_sentences.append(sentence)
+                clean_text, hateful_text = filter_hate_speech(final_text)
 
                 transcript = Transcript.objects.create(
                     meeting=meeting,
                     raw_text=raw,
-                    text='। '.join(clean_sentences),  # Join with Bangla full stop
-                    hateful_text='। '.join(hateful_sentences) if hateful_sentences else ''
+                    text=clean_text,
+                    hateful_text=hateful_text
                 )
 
                 # Generate TTS for cleaned text only
@@ -157,7 +109,7 @@ class Command(BaseCommand):
 
                 # If summary already exists, generate summary audio
                 if transcript.summary:
-                    generate_tts_and_save(transcript.summary, 'bn', transcript.summary_audio, transcript, f"summary_{mid}.mp3")
+                    generate_tts_and_save(transcript.summary_text, 'bn', transcript.summary_audio, transcript, f"summary_{mid}.mp3")
 
                 transcript.save()
 
@@ -0,0 +1,207 @@
+# create_meeting_app/meeting_timer.py
+#
+# Min-heap of upcoming joins. The scheduler sleeps until the earliest one is
+# due instead of scanning the table every minute. Meeting saves anywhere on
+# the host (web workers, shell, scheduler itself) send a one-line UDP datagram
+# with the meeting id; the timer re-reads just that row and reschedules it.
+# Datagrams are only a fast path: a rescan every MEETING_RESCAN_SECONDS picks
+# up changes nobody announced (lost datagrams, writes from other hosts,
+# QuerySet.update, raw SQL, fixtures).
+
+import heapq
+import select
+import socket
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+
+from create_meeting_app.models import Meeting
+
+NOTIFY_HOST = "127.0.0.1"
+
+
+def notify_port():
+    return getattr(settings, "MEETING_NOTIFY_PORT", 48765)
+
+
+def join_grace():
+    return timedelta(seconds=getattr(settings, "MEETING_JOIN_GRACE_SECONDS", 300))
+
+
+def rescan_seconds():
+    return getattr(settings, "MEETING_RESCAN_SECONDS", 300)
+
+
+def notify_meeting_changed(meeting_id, port=None):
+    """
+    Fire-and-forget wake-up for a MeetingTimer on this host. Silently does
+    nothing when no scheduler is listening.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(str(meeting_id).encode(), (NOTIFY_HOST, port or notify_port()))
+    except OSError:
+        pass
+
+
+def next_occurrence(join_time, now, grace):
+    """
+    join_time is a wall-clock time with no date: the meeting is due today,
+    unless today's slot ended more than `grace` ago, in which case tomorrow.
+    """
+    due = datetime.combine(now.date(), join_time)
+    if due + grace < now:
+        due += timedelta(days=1)
+    return due
+
+
+class MeetingTimer:
+    """
+    on_due(meeting_id) is called once per meeting when its join instant
+    arrives. If it returns False (e.g. the host is at capacity) the meeting is
+    retried every `retry_seconds` until its grace period runs out.
+    on_idle() is called at least every `idle_interval` seconds, and the
+    table is rescanned every `rescan_interval` seconds.
+    """
+
+    def __init__(self, on_due, on_idle=None, port=None, grace=None,
+                 idle_interval=5.0, retry_seconds=15.0, rescan_interval=None):
+        self.on_due = on_due
+        self.on_idle = on_idle
+        self.grace = grace or join_grace()
+        self.idle_interval = idle_interval
+        self.retry_seconds = retry_seconds
+        self.rescan_interval = rescan_seconds() if rescan_interval is None else rescan_interval
+        self._heap = []        # (due timestamp, meeting_id); may hold stale entries
+        self._entries = {}     # meeting_id -> (due timestamp, deadline timestamp)
+        self._join_times = {}  # meeting_id -> join_time last scheduled (kept after it fires)
+        self._last_scan = time.monotonic()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((NOTIFY_HOST, notify_port() if port is None else port))
+        self._sock.setblocking(False)
+        self.port = self._sock.getsockname()[1]
+
+    # ---------- heap maintenance ----------
+    def schedule(self, meeting_id, join_time, now=None):
+        if join_time is None:
+            self.cancel(meeting_id)
+            return
+        self._join_times[meeting_id] = join_time
+        due = next_occurrence(join_time, now or datetime.now(), self.grace)
+        self._push(meeting_id, due.timestamp(), (due + self.grace).timestamp())
+
+    def _push(self, meeting_id, due, deadline):
+        # older heap entries for this meeting become stale and are skipped
+        self._entries[meeting_id] = (due, deadline)
+        heapq.heappush(self._heap, (due, meeting_id))
+
+    def cancel(self, meeting_id):
+        self._entries.pop(meeting_id, None)
+        self._join_times.pop(meeting_id, None)
+
+    def pending(self):
+        return dict(self._entries)
+
+    def load(self):
+        """Initial fill: every meeting that still has a join ahead of it."""
+        self.rescan()
+        print(f"⏰ {len(self._entries)} upcoming meeting(s) loaded")
+
+    def rescan(self):
+        """
+        Reconcile with the table: schedule meetings that are new or whose
+        join_time moved, drop the ones that were joined or unscheduled.
+        Meetings that already fired keep their slot. Returns how many changed.
+        """
+        rows = dict(Meeting.objects.filter(joined=False, join_time__isnull=False).values_list('id', 'join_time'))
+        now = datetime.now()
+        changed = 0
+        for meeting_id, join_time in rows.items():
+            if self._join_times.get(meeting_id) != join_time:
+                self.schedule(meeting_id, join_time, now)
+                changed += 1
+        for meeting_id in set(self._join_times) - set(rows):
+            self.cancel(meeting_id)
+            changed += 1
+        self._last_scan = time.monotonic()
+        return changed
+
+    def refresh(self, meeting_id):
+        row = Meeting.objects.filter(pk=meeting_id).values('joined', 'join_time').first()
+        if row is None or row['joined'] or row['join_time'] is None:
+            self.cancel(meeting_id)
+        else:
+            self.schedule(meeting_id, row['join_time'])
+
+    def next_due(self):
+        while self._heap:
+            due, meeting_id = self._heap[0]
+            if self._entries.get(meeting_id, (None,))[0] == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now_ts):
+        due_ids = []
+        while True:
+            due = self.next_due()
+            if due is None or due > now_ts:
+                return due_ids
+            _, meeting_id = heapq.heappop(self._heap)
+            due_ids.append((meeting_id, self._entries.pop(meeting_id)[1]))
+
+    # ---------- change notifications ----------
+    def _receive(self):
+        changed = set()
+        while True:
+            try:
+                data = self._sock.recv(64)
+            except (BlockingIOError, InterruptedError):
+                break
+            try:
+                changed.add(int(data))
+            except ValueError:
+                continue
+        for meeting_id in changed:
+            self.refresh(meeting_id)
+
+    # ---------- main loop ----------
+    def run_once(self, max_wait=None):
+        """Sleep until the next join, a notification or the idle tick; then act."""
+        wait = self.idle_interval if max_wait is None else max_wait
+        due = self.next_due()
+        if due is not None:
+            wait = max(0.0, min(wait, due - time.time()))
+        readable, _, _ = select.select([self._sock], [], [], wait)
+        if readable:
+            self._receive()
+
+        now_ts = time.time()
+        for meeting_id, deadline in self._pop_due(now_ts):
+            try:
+                ok = self.on_due(meeting_id)
+            except Exception as e:
+                print(f"❌ Join handler failed for meeting {meeting_id}: {e}")
+                ok = True
+            if ok is False and now_ts + self.retry_seconds <= deadline:
+                self._push(meeting_id, now_ts + self.retry_seconds, deadline)
+
+        if self.rescan_interval and time.monotonic() - self._last_scan >= self.rescan_interval:
+            try:
+                changed = self.rescan()
+                if changed:
+                    print(f"🔎 Rescan picked up {changed} unannounced meeting change(s)")
+            except Exception as e:
+                self._last_scan = time.monotonic()
+                print(f"⚠️ Meeting rescan failed: {e}")
+
+        if self.on_idle:
+            self.on_idle()
+
+    def run_forever(self):
+        while True:
+            self.run_once()
+
+    def close(self):
+        self._sock.close()
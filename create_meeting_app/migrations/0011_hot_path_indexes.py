@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_meeting_app', '0010_transcript_hateful_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(condition=models.Q(('joined', False)), fields=['join_time'], name='meeting_due_join_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='meeting_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='screenshot',
+            index=models.Index(fields=['meeting', 'created'], name='screenshot_meeting_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transcript',
+            index=models.Index(fields=['meeting', 'created'], name='transcript_meeting_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transcriptsegment',
+            index=models.Index(fields=['transcript', 'start_time'], name='segment_transcript_start_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_meeting_app', '0012_meeting_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcript',
+            name='source',
+            field=models.CharField(choices=[('asr', 'Audio transcription'), ('captions', 'Meet live captions')], default='asr', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='transcriptsegment',
+            name='speaker',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
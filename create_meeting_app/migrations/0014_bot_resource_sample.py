@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_meeting_app', '0013_transcript_source_segment_speaker'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BotResourceSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('cpu_percent', models.FloatField()),
+                ('rss_mb', models.FloatField()),
+                ('open_fds', models.PositiveIntegerField()),
+                ('processes', models.PositiveSmallIntegerField()),
+                ('meeting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resource_samples', to='create_meeting_app.meeting')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['meeting', 'taken_at'], name='resource_meeting_taken_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_meeting_app', '0014_bot_resource_sample'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screenshot',
+            name='clip_embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
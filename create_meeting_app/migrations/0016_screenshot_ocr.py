@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_meeting_app', '0015_screenshot_clip_embedding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screenshot',
+            name='ocr_embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='screenshot',
+            name='ocr_text',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_meeting_app', '0016_screenshot_ocr'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screenshot',
+            name='phash',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
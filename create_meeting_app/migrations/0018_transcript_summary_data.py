@@ -0,0 +1,85 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:49
+
+from bs4 import BeautifulSoup
+from django.db import migrations, models
+
+# A frozen copy of utils/summary_structure.py as it was when this migration
+# was written, so later changes to that module can't change the backfill.
+SECTIONS = (
+    ("topics", ("Topics Discussed",)),
+    ("decisions", ("Decisions Made",)),
+    ("actions", ("Action Items",)),
+    ("deadlines", ("Deadlines", "Next Steps")),
+)
+
+
+def _heading(soup, heading_text):
+    return soup.find(lambda tag: tag.name == "h3" and heading_text.lower() in tag.get_text(strip=True).lower())
+
+
+def _section_items(soup, heading_text):
+    h = _heading(soup, heading_text)
+    if not h:
+        return []
+    paragraph = None
+    for tag in h.find_next_siblings():
+        if tag.name == "h3":
+            break
+        if tag.name in ("ul", "ol"):
+            return [li.get_text(strip=True) for li in tag.find_all("li")]
+        if tag.name == "p" and paragraph is None:
+            paragraph = tag
+    return [paragraph.get_text(strip=True)] if paragraph else []
+
+
+def parse_summary_html(html):
+    soup = BeautifulSoup(html or "", "html.parser")
+    data = {}
+    for key, headings in SECTIONS:
+        data[key] = []
+        for heading in headings:
+            data[key] = _section_items(soup, heading)
+            if data[key]:
+                break
+    h = _heading(soup, "Overall Summary")
+    p = h.find_next_sibling("p") if h else None
+    data["overall"] = p.get_text(strip=True) if p else ""
+    return data
+
+
+def plain_text(html):
+    return BeautifulSoup(html or "", "html.parser").get_text(separator="\n")
+
+
+def backfill_summary_data(apps, schema_editor):
+    Transcript = apps.get_model('create_meeting_app', 'Transcript')
+    batch = []
+    for t in Transcript.objects.exclude(summary__isnull=True).exclude(summary='').only('pk', 'summary').iterator():
+        t.summary_data = parse_summary_html(t.summary)
+        t.summary_text = plain_text(t.summary)
+        batch.append(t)
+        if len(batch) >= 500:
+            Transcript.objects.bulk_update(batch, ['summary_data', 'summary_text'])
+            batch = []
+    Transcript.objects.bulk_update(batch, ['summary_data', 'summary_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_meeting_app', '0017_screenshot_phash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcript',
+            name='summary_data',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='transcript',
+            name='summary_text',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_summary_data, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,290 @@
+# create_meeting_app/model_server.py
+#
+# One process per host holds the ML models (CLIP, both MiniLMs, punctuation,
+# fastText language id) and serves every web worker, the scheduler and the
+# management commands over a Unix socket, instead of each process loading
+# its own copies. Concurrent requests for the same model are micro-batched
+# into a single forward pass.
+#
+#   python manage.py start_model_server
+#
+# Clients call embed() / classify() / punctuate() below. With no socket
+# configured (MODEL_SERVER_SOCKET='') or no server running they compute
+# in-process through the model registry, so nothing breaks without it.
+#
+# Wire format: 4-byte big-endian length + JSON, both ways, on a persistent
+# connection. Requests are {"op", "model", "inputs"}, responses
+# {"results"} or {"error"}.
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+from django.conf import settings
+
+from create_meeting_app.utils import model_registry
+
+_HEADER = struct.Struct(">I")
+
+
+class ModelServerError(RuntimeError):
+    pass
+
+
+def socket_path():
+    return getattr(settings, "MODEL_SERVER_SOCKET", "")
+
+
+# ---------- in-process ops (what the server runs, and the fallback) ----------
+
+def _embed_sentences(model_name):
+    def run(texts):
+        return model_registry.get(model_name).encode(list(texts), show_progress_bar=False).tolist()
+    return run
+
+
+def _clip_text(texts):
+    from create_meeting_app.utils.match_clip_embeddings import _compute_text_embeddings
+    return _compute_text_embeddings(list(texts)).tolist()
+
+
+def _clip_image(paths):
+    from create_meeting_app.utils.match_clip_embeddings import _compute_image_embeddings
+    return _compute_image_embeddings(list(paths)).tolist()
+
+
+def _language_id(texts):
+    labels, probs = model_registry.get("lid").predict(list(texts), k=1)
+    return [[label[0], float(prob[0])] for label, prob in zip(labels, probs)]
+
+
+def _punctuate(texts):
+    model = model_registry.get("punctuation")
+    return [model.restore_punctuation(text) for text in texts]
+
+
+LOCAL_OPS = {
+    ("embed", "minilm"): _embed_sentences("minilm"),
+    ("embed", "minilm-multilingual"): _embed_sentences("minilm-multilingual"),
+    ("embed", "clip-text"): _clip_text,
+    ("embed", "clip-image"): _clip_image,
+    ("classify", "lid"): _language_id,
+    ("punctuate", "punctuation"): _punctuate,
+}
+
+
+# ---------- server ----------
+
+class MicroBatcher:
+    """
+    Collects inputs from concurrent submit() calls and runs `fn` once over up
+    to `max_batch` of them, waiting at most `max_wait` seconds for company.
+    """
+
+    def __init__(self, fn, max_batch=64, max_wait=0.01):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self._pending = []   # (inputs, future)
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, inputs):
+        future = Future()
+        with self._cond:
+            self._pending.append((list(inputs), future))
+            self._cond.notify()
+        return future
+
+    def _take(self):
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.max_wait
+            while sum(len(i) for i, _ in self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, size = [], 0
+            while self._pending and (not batch or size + len(self._pending[0][0]) <= self.max_batch):
+                inputs, future = self._pending.pop(0)
+                batch.append((inputs, future))
+                size += len(inputs)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take()
+            flat = [x for inputs, _ in batch for x in inputs]
+            try:
+                results = self.fn(flat) if flat else []
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                # one client's bad input must not fail the others: retry each alone
+                for inputs, future in batch:
+                    try:
+                        future.set_result(self.fn(inputs))
+                    except Exception as e:
+                        future.set_exception(e)
+                    self.batches += 1
+                continue
+            self.batches += 1
+            start = 0
+            for inputs, future in batch:
+                future.set_result(results[start:start + len(inputs)])
+                start += len(inputs)
+
+
+def _send(sock, obj):
+    data = json.dumps(obj).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, size):
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("model server connection closed")
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv(sock):
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, size))
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                request = _recv(self.request)
+            except OSError:
+                return
+            batcher = self.server.batchers.get((request.get("op"), request.get("model")))
+            if batcher is None:
+                _send(self.request, {"error": f"unknown op {request.get('op')}/{request.get('model')}"})
+                continue
+            try:
+                _send(self.request, {"results": batcher.submit(request.get("inputs", [])).result()})
+            except Exception as e:
+                _send(self.request, {"error": str(e)})
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path=None, ops=None, max_batch=None, max_wait=None):
+        path = path or socket_path()
+        max_batch = max_batch or getattr(settings, "MODEL_SERVER_MAX_BATCH", 64)
+        max_wait = max_wait if max_wait is not None else getattr(settings, "MODEL_SERVER_MAX_WAIT_MS", 10) / 1000
+        self.batchers = {key: MicroBatcher(fn, max_batch, max_wait)
+                         for key, fn in (ops or LOCAL_OPS).items()}
+        if os.path.exists(path):
+            os.unlink(path)  # stale socket from a previous run
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+# ---------- client ----------
+
+_local = threading.local()
+_warned = False
+
+
+def _connection(path):
+    sock = getattr(_local, "sock", None)
+    if sock is None or getattr(_local, "path", None) != path:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        _local.sock, _local.path = sock, path
+    return sock
+
+
+def _drop_connection():
+    sock = getattr(_local, "sock", None)
+    if sock is not None:
+        sock.close()
+    _local.sock = None
+
+
+def call(op, model, inputs):
+    """Run `op` on the shared server, or in-process if there isn't one."""
+    global _warned
+    inputs = list(inputs)
+    if not inputs:
+        return []
+    path = socket_path()
+    if path:
+        for attempt in range(2):
+            try:
+                sock = _connection(path)
+                _send(sock, {"op": op, "model": model, "inputs": inputs})
+                response = _recv(sock)
+                break
+            except OSError:
+                _drop_connection()
+        else:
+            response = None
+        if response is not None:
+            if "error" in response:
+                raise ModelServerError(response["error"])
+            return response["results"]
+        if not _warned:
+            print(f"⚠️ Model server not reachable at {path}; loading models in this process")
+            _warned = True
+    return LOCAL_OPS[(op, model)](inputs)
+
+
+def image_path(path):
+    """
+    Absolute form of an image path. The server resolves paths against its own
+    cwd, so relative ones (Screenshot.image_path) are looked up here, under
+    MEDIA_ROOT and then BASE_DIR, falling back to this process's cwd.
+    """
+    path = os.fspath(path)
+    if os.path.isabs(path):
+        return path
+    for root in (settings.MEDIA_ROOT, settings.BASE_DIR):
+        candidate = os.path.join(root, path)
+        if os.path.exists(candidate):
+            return os.path.abspath(candidate)
+    return os.path.abspath(path)
+
+
+def embed(model, inputs):
+    """Embeddings as an (n, d) float32 array. model: minilm | minilm-multilingual | clip-text | clip-image"""
+    if model == "clip-image":
+        inputs = [image_path(p) for p in inputs]
+    results = call("embed", model, inputs)
+    if not results:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.asarray(results, dtype=np.float32)
+
+
+def classify(inputs, model="lid"):
+    """[(label, probability), ...], e.g. ("__label__bn", 0.93) for fastText language id."""
+    return [tuple(r) for r in call("classify", model, inputs)]
+
+
+def punctuate(texts):
+    return call("punctuate", "punctuation", texts)
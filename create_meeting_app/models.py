@@ -1,9 +1,86 @@
 # create_meeting_app/models.py
 
+from datetime import timedelta
+
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth.models import User
 
+
+def _count_subquery(model, meeting_path):
+    """
+    Correlated COUNT(*) of `model` rows pointing at the outer Meeting. Used
+    instead of Count() over joins, which would multiply rows across the
+    transcript/screenshot/segment relations.
+    """
+    counts = (model.objects.filter(**{meeting_path: OuterRef('pk')})
+              .order_by().values(meeting_path)
+              .annotate(n=Count('pk')).values('n'))
+    return Coalesce(Subquery(counts[:1]), 0)
+
+
+class MeetingQuerySet(models.QuerySet):
+    def due(self, start, end):
+        """
+        Meetings not yet joined whose join_time falls in [start, end).
+        Served by the partial join_time index over unjoined meetings.
+        """
+        return self.filter(joined=False, join_time__gte=start, join_time__lt=end)
+
+    # ---------- multi-node claiming ----------
+    # A scheduler node owns a meeting while it holds an unexpired lease:
+    #   joined=False                          -> free
+    #   joined=True, lease_expires > now      -> running on `claimed_by`
+    #   joined=True, lease_expires < now      -> owner died; claimable again
+    #   joined=True, lease_expires is NULL    -> finished
+    # Every transition is a single conditional UPDATE, so two nodes racing for
+    # the same row can't both win.
+
+    def claim(self, meeting_id, owner, lease_seconds):
+        now = timezone.now()
+        return self.filter(pk=meeting_id).filter(
+            Q(joined=False) | Q(lease_expires__lt=now)
+        ).update(joined=True, claimed_by=owner, lease_expires=now + timedelta(seconds=lease_seconds)) == 1
+
+    def unclaim(self, meeting_id, owner):
+        """Give a claim back untouched, e.g. when the bot could not be started."""
+        return self.filter(pk=meeting_id, claimed_by=owner).update(
+            joined=False, claimed_by='', lease_expires=None)
+
+    def renew_leases(self, meeting_ids, owner, lease_seconds):
+        """Heartbeat: extend the leases `owner` still holds."""
+        return self.filter(pk__in=meeting_ids, claimed_by=owner, lease_expires__isnull=False).update(
+            lease_expires=timezone.now() + timedelta(seconds=lease_seconds))
+
+    def release_finished(self, active_ids, owner):
+        """End the leases of every meeting `owner` holds that is no longer running."""
+        return self.filter(claimed_by=owner, lease_expires__isnull=False).exclude(
+            pk__in=active_ids).update(lease_expires=None)
+
+    def release(self, meeting_id, owner):
+        """End one finished meeting's lease (it stays joined)."""
+        return self.filter(pk=meeting_id, claimed_by=owner, lease_expires__isnull=False).update(
+            lease_expires=None)
+
+    def abandon(self, owner):
+        """Expire every live lease of `owner` now so other nodes reclaim them."""
+        return self.filter(claimed_by=owner, lease_expires__isnull=False).update(
+            lease_expires=timezone.now())
+
+    def lease_expired(self):
+        return self.filter(joined=True, lease_expires__lt=timezone.now())
+
+    def with_counts(self):
+        return self.annotate(
+            transcript_count=_count_subquery(Transcript, 'meeting'),
+            screenshot_count=_count_subquery(Screenshot, 'meeting'),
+            segment_count=_count_subquery(TranscriptSegment, 'transcript__meeting'),
+        )
+
+
 class Meeting(models.Model):
     user         = models.ForeignKey(User, on_delete=models.CASCADE, related_name='meetings')
     name         = models.CharField(max_length=100)
@@ -13,6 +90,23 @@ class Meeting(models.Model):
     joined       = models.BooleanField(default=False)
     created_at   = models.DateTimeField(auto_now_add=True)
     is_active    = models.BooleanField(default=True)
+    claimed_by    = models.CharField(max_length=100, blank=True, default='')
+    lease_expires = models.DateTimeField(null=True, blank=True)
+
+    objects = MeetingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # scheduler: joined=False AND join_time in window. Django renders
+            # joined=False as NOT "joined", which SQLite cannot match against a
+            # (joined, join_time) index, so index join_time over unjoined rows.
+            models.Index(fields=['join_time'], condition=models.Q(joined=False), name='meeting_due_join_time_idx'),
+            # dashboard: user's meetings, keyset on (created_at, id)
+            models.Index(fields=['user', 'created_at', 'id'], name='meeting_user_created_idx'),
+            # reclaim sweep: live leases only
+            models.Index(fields=['lease_expires'], condition=models.Q(lease_expires__isnull=False),
+                         name='meeting_lease_expires_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.bot_name})"
@@ -26,6 +120,9 @@ class Transcript(models.Model):
     raw_text        = models.TextField(blank=True, null=True)
     text            = models.TextField()
     summary         = models.TextField(blank=True, null=True)
+    # parsed once from `summary` (utils/summary_structure.store_summary)
+    summary_data    = models.JSONField(blank=True, null=True, editable=False)
+    summary_text    = models.TextField(blank=True, null=True, editable=False)
     translated_text = models.TextField(blank=True, null=True)
     created         = models.DateTimeField(auto_now_add=True)
 
@@ -36,6 +133,17 @@ class Transcript(models.Model):
     # NEW: Field for deleted hateful lines
     hateful_text    = models.TextField(blank=True, null=True)
 
+    SOURCE_ASR      = 'asr'
+    SOURCE_CAPTIONS = 'captions'
+    source          = models.CharField(max_length=20, default=SOURCE_ASR,
+                                       choices=[(SOURCE_ASR, 'Audio transcription'),
+                                                (SOURCE_CAPTIONS, 'Meet live captions')])
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['meeting', 'created'], name='transcript_meeting_created_idx'),
+        ]
+
     def __str__(self):
         return f"Transcript for {self.meeting} at {self.created}"
 
@@ -44,6 +152,18 @@ class Screenshot(models.Model):
     meeting    = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name="screenshots")
     image_path = models.CharField(max_length=255)
     created    = models.DateTimeField(auto_now_add=True)
+    # CLIP image embedding as float16 bytes, filled once (see utils/screenshot_embeddings.py)
+    clip_embedding = models.BinaryField(null=True, blank=True, editable=False)
+    # OCR text (None = not OCR'd yet) and its CLIP text embedding, same format
+    ocr_text      = models.TextField(null=True, blank=True)
+    ocr_embedding = models.BinaryField(null=True, blank=True, editable=False)
+    # 64-bit perceptual hash, signed for SQLite (see utils/screenshot_dedup.py)
+    phash = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['meeting', 'created'], name='screenshot_meeting_created_idx'),
+        ]
 
     def __str__(self):
         return f"Screenshot for {self.meeting} at {self.created}"
@@ -54,9 +174,33 @@ class TranscriptSegment(models.Model):
         on_delete=models.CASCADE,
         related_name='segments'
     )
+    speaker    = models.CharField(max_length=255, blank=True, default='')
     text       = models.TextField()
     start_time = models.DurationField()  # from start of transcript
     end_time   = models.DurationField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['transcript', 'start_time'], name='segment_transcript_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.start_time}-{self.end_time}] {self.text[:30]}…"
+
+
+class BotResourceSample(models.Model):
+    """One sample of a bot's process tree (bot, Chrome, ffmpeg), see bot_metrics."""
+    meeting     = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name="resource_samples")
+    taken_at    = models.DateTimeField(default=timezone.now)
+    cpu_percent = models.FloatField()   # of one core
+    rss_mb      = models.FloatField()
+    open_fds    = models.PositiveIntegerField()
+    processes   = models.PositiveSmallIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['meeting', 'taken_at'], name='resource_meeting_taken_idx'),
+        ]
+
     def __str__(self):
-        return f"[{self.start_time}-{self.end_time}] {self.text[:30]}…"
\ No newline at end of file
+        return f"{self.meeting_id} @ {self.taken_at}: {self.cpu_percent}% {self.rss_mb} MB"
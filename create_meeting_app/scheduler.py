@@ -1,52 +1,158 @@
 # create_meeting_app/scheduler.py
 
-from apscheduler.schedulers.blocking import BlockingScheduler
-from django_apscheduler.jobstores import DjangoJobStore
-from create_meeting_app.bot_scripts import google_meet_bot
-from create_meeting_app.models import Meeting
+import os
+import socket
+import threading
+import time
+from django.conf import settings
+from django.db import connection
+from create_meeting_app.bot_supervisor import BotSupervisor
+from create_meeting_app.bot_scripts.audio_sink import cleanup_stale_sinks
+from create_meeting_app.bot_scripts.chrome_pool import ChromePool
+from create_meeting_app.bot_scripts.chromedriver import resolve_chromedriver
+from create_meeting_app.meeting_timer import MeetingTimer
+from create_meeting_app.models import BotResourceSample, Meeting
+from create_meeting_app.signals import meetings_changed
 from datetime import datetime, timedelta
 
-def check_and_run_meetings():
-    now = datetime.now().time().replace(second=0, microsecond=0)
-    five_minutes_ago = (datetime.now() - timedelta(minutes=5)).time().replace(second=0, microsecond=0)
-    one_minute_later = (datetime.now() + timedelta(minutes=1)).time().replace(second=0, microsecond=0)
+# one supervisor per scheduler process; bots run as its child processes
+_SUPERVISOR = None
+
+def store_resource_samples(rows):
+    """Persist one round of per-bot CPU/RSS/fd samples (one INSERT)."""
+    BotResourceSample.objects.bulk_create([BotResourceSample(**row) for row in rows])
+
+def get_supervisor():
+    global _SUPERVISOR
+    if _SUPERVISOR is None:
+        pool = ChromePool() if getattr(settings, 'BOT_CHROME_POOL_SIZE', 0) > 0 else None
+        _SUPERVISOR = BotSupervisor(chrome_pool=pool, on_samples=store_resource_samples)
+    return _SUPERVISOR
+
+# Identifies this scheduler process in Meeting.claimed_by. Several nodes can
+# run against the same database; each only launches bots for meetings it
+# claimed and keeps them alive with a lease heartbeat.
+NODE_ID = getattr(settings, 'SCHEDULER_NODE_ID', '') or f"{socket.gethostname()}:{os.getpid()}"
 
-    meetings = Meeting.objects.filter(
-        join_time__gte=five_minutes_ago,
-        join_time__lt=one_minute_later,
-        joined=False
-    )
-    for meeting in meetings:
-        print(f"🤖 Joining meeting: {meeting.name}")
+def lease_seconds():
+    return getattr(settings, 'MEETING_LEASE_SECONDS', 60)
 
-        # Mark as joined immediately to prevent duplicate browsers
-        meeting.joined = True
-        meeting.save()
+def join_due_meeting(meeting_id):
+    """
+    Timer callback: claim and launch the bot for one meeting whose join_time
+    just arrived (or whose previous owner's lease ran out). Returns False if
+    this host can't take another bot yet, so the timer retries it shortly.
+    """
+    pool = get_supervisor()
+    # don't take a claim this node can't honour; another node may have room
+    reason = pool.admission_error()
+    if reason:
+        print(f"⏸ Deferring meeting {meeting_id}: {reason}")
+        return False
 
+    # Atomic claim (conditional UPDATE): exactly one node wins
+    if not Meeting.objects.claim(meeting_id, NODE_ID, lease_seconds()):
+        return True
+    meetings_changed([meeting_id])
+
+    meeting = Meeting.objects.get(pk=meeting_id)
+    print(f"🤖 Joining meeting: {meeting.name}")
+    if not pool.dispatch(meeting):
+        Meeting.objects.unclaim(meeting_id, NODE_ID)
+        return False
+    return True
+
+class LeaseHeartbeat:
+    """
+    Renews one meeting's lease from a background thread while a blocking
+    join runs in the foreground (check_and_run_bots).
+    """
+    def __init__(self, meeting_id):
+        self.meeting_id = meeting_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
         try:
-            google_meet_bot.join_meeting(meeting.meeting_link, meeting.bot_name, meeting)
-            print("✅ Successfully joined.")
-        except Exception as e:
-            print(f"❌ Failed to join meeting: {e}")
-            # If you want to retry on failure, undo the flag here:
-            # meeting.joined = False
-            # meeting.save()
+            while not self._stop.wait(lease_seconds() / 3):
+                Meeting.objects.renew_leases([self.meeting_id], NODE_ID, lease_seconds())
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+_last_heartbeat = 0.0
+
+def supervise():
+    """
+    Idle-tick work: reap/restart bots, renew this node's leases and end the
+    leases of bots that finished. Lease writes happen every lease/3 seconds.
+    A failing tick (e.g. "database is locked") is logged and retried on the
+    next one instead of stopping the scheduler.
+    """
+    try:
+        _supervise()
+    except Exception as e:
+        print(f"❌ Supervisor tick failed: {e}")
+
+def _supervise():
+    global _last_heartbeat
+    pool = get_supervisor()
+    pool.poll()
+
+    if time.monotonic() - _last_heartbeat < lease_seconds() / 3:
+        return
+    _last_heartbeat = time.monotonic()
+    active = [b.meeting_id for b in pool.bots.values() if b.status in ('running', 'joined', 'restart_pending')]
+    if active:
+        Meeting.objects.renew_leases(active, NODE_ID, lease_seconds())
+    Meeting.objects.release_finished(active, NODE_ID)
+
+    # meetings whose owner stopped heartbeating (crashed node) are up for grabs
+    for meeting_id in Meeting.objects.lease_expired().values_list('id', flat=True):
+        print(f"♻️ Reclaiming meeting {meeting_id} from an expired lease")
+        join_due_meeting(meeting_id)
+
+def check_and_run_meetings():
+    """
+    One-off sweep of the old 6-minute join window. The timer in start() is
+    the normal path; this remains for manual catch-up runs.
+    """
+    five_minutes_ago = (datetime.now() - timedelta(minutes=5)).time().replace(second=0, microsecond=0)
+    one_minute_later = (datetime.now() + timedelta(minutes=1)).time().replace(second=0, microsecond=0)
+
+    for meeting_id in Meeting.objects.due(five_minutes_ago, one_minute_later).values_list('id', flat=True):
+        join_due_meeting(meeting_id)
 
 def start():
-    # Use in-memory jobstore to prevent SQLite locking issues
-    scheduler = BlockingScheduler(jobstores={})
-
-    scheduler.add_job(
-        check_and_run_meetings,
-        trigger='interval',
-        minutes=1,
-        name='check_and_run_meetings_job',
-        replace_existing=True,
-        max_instances=3,
-        coalesce=True,
-    )
-
-    print("🔁 BlockingScheduler starting...")
-    scheduler.start()
-    print("🛑 BlockingScheduler stopped.")
+    # fill the driver manifest now so the first bot doesn't download it late
+    try:
+        print(f"🧩 chromedriver: {resolve_chromedriver()}")
+    except Exception as e:
+        print(f"⚠️ chromedriver not resolved yet: {e}")
+    removed = cleanup_stale_sinks()
+    if removed:
+        print(f"🧹 Removed {removed} audio sink(s) left by dead bots")
+    pool = get_supervisor()
+    # Sleeps until the next join_time (or a meeting change notification),
+    # and supervises running bots on the idle tick.
+    timer = MeetingTimer(on_due=join_due_meeting, on_idle=supervise)
+    timer.load()
 
+    print(f"🔁 Meeting timer starting on node {NODE_ID}...")
+    try:
+        timer.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        timer.close()
+        print(f"📊 Time to join: {pool.join_stats()}")
+        pool.shutdown()
+        # hand running meetings over now rather than when the leases lapse
+        Meeting.objects.abandon(NODE_ID)
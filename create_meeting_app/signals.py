@@ -0,0 +1,70 @@
+# create_meeting_app/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Meeting, Transcript, Screenshot, TranscriptSegment
+from .utils import page_cache
+from .meeting_timer import notify_meeting_changed
+
+# Bumping a version invalidates every cached fragment keyed on it.
+# NOTE: bulk_create/update() don't send these signals; code that writes in
+# bulk has to call meetings_changed() itself.
+
+
+@receiver([post_save, post_delete], sender=Meeting)
+def meeting_changed(sender, instance, **kwargs):
+    page_cache.bump_meeting(instance.pk)
+    page_cache.bump_user(instance.user_id)
+    # wake the scheduler's timer so new or edited join times take effect
+    notify_meeting_changed(instance.pk)
+
+
+def _bump_meeting_and_owner(meeting, meeting_id):
+    """
+    Dashboard cards show per-meeting counts, so content changes invalidate
+    the owner's dashboard as well as the meeting page.
+    """
+    page_cache.bump_meeting(meeting_id)
+    if meeting is not None:
+        user_id = meeting.user_id
+    else:
+        user_id = Meeting.objects.filter(pk=meeting_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        page_cache.bump_user(user_id)
+
+
+@receiver([post_save, post_delete], sender=Transcript)
+@receiver([post_save, post_delete], sender=Screenshot)
+def meeting_content_changed(sender, instance, **kwargs):
+    meeting = instance.meeting if sender.meeting.is_cached(instance) else None
+    _bump_meeting_and_owner(meeting, instance.meeting_id)
+
+
+@receiver([post_save, post_delete], sender=TranscriptSegment)
+def segment_changed(sender, instance, **kwargs):
+    # create(transcript=...) leaves the transcript cached on the instance;
+    # cascaded deletes don't, so fall back to a single-column lookup.
+    meeting = None
+    if TranscriptSegment.transcript.is_cached(instance):
+        transcript = instance.transcript
+        meeting_id = transcript.meeting_id
+        if Transcript.meeting.is_cached(transcript):
+            meeting = transcript.meeting
+    else:
+        meeting_id = (Transcript.objects.filter(pk=instance.transcript_id)
+                      .values_list('meeting_id', flat=True).first())
+    if meeting_id is not None:
+        _bump_meeting_and_owner(meeting, meeting_id)
+
+
+def meetings_changed(meeting_ids):
+    """
+    Manual counterpart of the receivers above, for writes that bypass
+    post_save (bulk_create, e.g. BatchWriter).
+    """
+    meeting_ids = set(meeting_ids)
+    for meeting_id in meeting_ids:
+        page_cache.bump_meeting(meeting_id)
+    owners = Meeting.objects.filter(pk__in=meeting_ids).values_list('user_id', flat=True).distinct()
+    for user_id in owners:
+        page_cache.bump_user(user_id)
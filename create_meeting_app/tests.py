@@ -1,8 +1,36 @@
-from django.test import TestCase, Client
+from django.test import TestCase, TransactionTestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
-from .models import Meeting
+from .models import Meeting, Transcript, Screenshot, TranscriptSegment, BotResourceSample
+from .utils import page_cache
+from .utils.batch_writer import BatchWriter
+from .signals import meetings_changed
+from .bot_supervisor import BotSupervisor
+from .bot_metrics import TreeSampler, process_tree
+from .utils import model_registry, screenshot_embeddings
+from . import model_server, scheduler
+from .meeting_timer import MeetingTimer
+from .bot_scripts.chrome_pool import ChromePool, WarmChrome
+from .bot_scripts import audio_sink, call_events, captions, chromedriver, frame_capture
+from unittest import mock
+import base64
+import importlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from datetime import datetime, timedelta
 
@@ -122,4 +150,1940 @@ class MeetingViewsTest(TestCase):
         # Try to delete other user's meeting
         response = self.client.post(reverse('delete_meeting', kwargs={'meeting_id': other_meeting.id}))
         self.assertEqual(response.status_code, 404)
-        self.assertTrue(Meeting.objects.filter(pk=other_meeting.id).exists())
\ No newline at end of file
+        self.assertTrue(Meeting.objects.filter(pk=other_meeting.id).exists())
+
+class MeetingPaginationTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = get_user_model().objects.create_user(
+            username='pageuser',
+            email='page@example.com',
+            password='testpass123'
+        )
+        self.client.login(username='pageuser', password='testpass123')
+        self.meeting = Meeting.objects.create(
+            user=self.user,
+            name="Long Meeting",
+            bot_name="PageBot",
+            meeting_link="https://meet.google.com/long",
+            is_active=True
+        )
+        # two transcripts, 7 + 5 sentence blocks, one hateful line
+        Transcript.objects.create(
+            meeting=self.meeting,
+            text='। '.join(f"Alice: line {i}" for i in range(7)),
+            hateful_text="Bob: bad line",
+        )
+        Transcript.objects.create(
+            meeting=self.meeting,
+            text='। '.join(f"line {i}" for i in range(7, 12)),
+        )
+        for i in range(5):
+            Screenshot.objects.create(meeting=self.meeting, image_path=f"media/screenshots/{i}.png")
+
+    def _collect(self, url_name, **params):
+        url = reverse(url_name, kwargs={'meeting_id': self.meeting.id})
+        results, cursor, pages = [], None, 0
+        while True:
+            query = dict(params)
+            if cursor:
+                query['cursor'] = cursor
+            data = self.client.get(url, query).json()
+            self.assertTrue(data['success'])
+            results.extend(data['results'])
+            pages += 1
+            cursor = data['next_cursor']
+            if not cursor:
+                return results, pages
+
+    def test_segments_are_paginated_across_transcripts(self):
+        results, pages = self._collect('meeting_segments', limit=5)
+        self.assertEqual(pages, 3)
+        self.assertEqual([r['text'] for r in results], [f"line {i}" for i in range(12)])
+        self.assertEqual(results[0]['speaker'], 'Alice')
+        self.assertIsNone(results[-1]['speaker'])
+
+    def test_hateful_segments(self):
+        results, _ = self._collect('meeting_segments', kind='hateful')
+        self.assertEqual(results, [{'speaker': 'Bob', 'text': 'bad line', 'created': results[0]['created']}])
+
+    def test_screenshots_are_paginated(self):
+        results, pages = self._collect('meeting_screenshots', limit=2)
+        self.assertEqual(pages, 3)
+        self.assertEqual([r['url'] for r in results], [f"/media/screenshots/{i}.png" for i in range(5)])
+
+    def test_invalid_cursor(self):
+        url = reverse('meeting_screenshots', kwargs={'meeting_id': self.meeting.id})
+        response = self.client.get(url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+    def test_malformed_segment_cursor(self):
+        from .utils.pagination import encode_cursor
+        url = reverse('meeting_segments', kwargs={'meeting_id': self.meeting.id})
+        created = timezone.now().isoformat()
+        for values in ([created, [], 0], [created, "1", 0], [created, 1, -1], [created, 1]):
+            response = self.client.get(url, {'cursor': encode_cursor(values)})
+            self.assertEqual(response.status_code, 400, values)
+            self.assertFalse(response.json()['success'])
+
+    def test_meeting_page_does_not_inline_content(self):
+        response = self.client.get(reverse('meeting_page', kwargs={'meeting_id': self.meeting.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'line 11')
+        self.assertNotContains(response, 'media/screenshots/4.png')
+        self.assertTrue(response.context['has_hateful'])
+        self.assertEqual(response.context['screenshot_count'], 5)
+
+
+class PageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = get_user_model().objects.create_user(
+            username='cacheuser',
+            email='cache@example.com',
+            password='testpass123'
+        )
+        self.client.login(username='cacheuser', password='testpass123')
+        self.meeting = Meeting.objects.create(
+            user=self.user,
+            name="Cached Meeting",
+            bot_name="CacheBot",
+            meeting_link="https://meet.google.com/cache",
+            is_active=True
+        )
+
+    def _meeting_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, [q['sql'] for q in ctx.captured_queries if 'create_meeting_app_' in q['sql']]
+
+    def test_repeat_views_skip_the_orm(self):
+        for url in (
+            reverse('dashboard'),
+            reverse('meeting_page', kwargs={'meeting_id': self.meeting.id}),
+            reverse('meeting_screenshots', kwargs={'meeting_id': self.meeting.id}),
+        ):
+            _, first = self._meeting_queries(url)
+            self.assertTrue(first)
+            _, repeat = self._meeting_queries(url)
+            self.assertEqual(repeat, [], url)
+
+    def test_writes_bump_the_meeting_version(self):
+        url = reverse('meeting_page', kwargs={'meeting_id': self.meeting.id})
+        self.assertEqual(self.client.get(url).context['screenshot_count'], 0)
+
+        version = page_cache.meeting_version(self.meeting.id)
+        Screenshot.objects.create(meeting=self.meeting, image_path="media/screenshots/a.png")
+        self.assertNotEqual(page_cache.meeting_version(self.meeting.id), version)
+        self.assertEqual(self.client.get(url).context['screenshot_count'], 1)
+
+        transcript = Transcript.objects.create(meeting=self.meeting, text="hello")
+        version = page_cache.meeting_version(self.meeting.id)
+        TranscriptSegment.objects.create(
+            transcript=transcript, text="hello",
+            start_time=timedelta(seconds=0), end_time=timedelta(seconds=1),
+        )
+        self.assertNotEqual(page_cache.meeting_version(self.meeting.id), version)
+
+    def test_bumps_write_fresh_tokens_outside_the_fragment_cache(self):
+        first = page_cache.bump_meeting(self.meeting.id)
+        second = page_cache.bump_meeting(self.meeting.id)
+        self.assertNotEqual(first, second)
+        # clearing or culling the fragments leaves the token in place
+        cache.clear()
+        self.assertEqual(page_cache.meeting_version(self.meeting.id), second)
+        self.assertEqual(caches[page_cache.VERSION_CACHE].get(f"version:meeting:{self.meeting.id}"), second)
+
+    def test_meeting_changes_bump_the_dashboard(self):
+        self.client.get(reverse('dashboard'))
+        Meeting.objects.create(user=self.user, name="Second Meeting", bot_name="CacheBot")
+        self.assertContains(self.client.get(reverse('dashboard')), "Second Meeting")
+
+
+class DashboardPaginationBenchmark(TestCase):
+    """
+    Seeds 50k meetings for one user and checks that the dashboard issues the
+    same number of queries as for a user with a single meeting, on the first
+    page and deep into the keyset.
+    """
+    SEED = 50_000
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.power_user = User.objects.create_user(username='power', email='p@example.com', password='testpass123')
+        cls.light_user = User.objects.create_user(username='light', email='l@example.com', password='testpass123')
+        now = timezone.now()
+        Meeting.objects.bulk_create(
+            [Meeting(user=cls.power_user, name=f"M{i}", bot_name="Bot", meeting_link="https://meet.google.com/x")
+             for i in range(cls.SEED)],
+            batch_size=5000,
+        )
+        # identical created_at everywhere: paging must rely on the id tie-break
+        Meeting.objects.filter(user=cls.power_user).update(created_at=now)
+        cls.newest = Meeting.objects.create(user=cls.power_user, name="Newest", bot_name="Bot")
+        transcript = Transcript.objects.create(meeting=cls.newest, text="a। b")
+        TranscriptSegment.objects.create(transcript=transcript, text="a",
+                                         start_time=timedelta(0), end_time=timedelta(seconds=1))
+        Screenshot.objects.create(meeting=cls.newest, image_path="media/screenshots/n.png")
+        Meeting.objects.create(user=cls.light_user, name="Only", bot_name="Bot")
+
+    def setUp(self):
+        cache.clear()
+
+    def _queries(self, username, params=None):
+        self.client.login(username=username, password='testpass123')
+        self.client.get(reverse('dashboard'))  # warm session/auth
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('dashboard'), params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_constant_query_count(self):
+        _, baseline = self._queries('light')
+        response, first_page = self._queries('power')
+        self.assertEqual(first_page, baseline)
+
+        meetings = response.context['meetings']
+        self.assertEqual(meetings[0], self.newest)
+        self.assertEqual((meetings[0].transcript_count, meetings[0].segment_count, meetings[0].screenshot_count), (1, 1, 1))
+        self.assertEqual(meetings[1].transcript_count, 0)
+
+        # walk a few pages into the keyset; ties on created_at are broken by id
+        cursor, seen = response.context['next_cursor'], {m.pk for m in meetings}
+        for _ in range(3):
+            response, deep_page = self._queries('power', {'cursor': cursor})
+            self.assertEqual(deep_page, baseline)
+            page_ids = {m.pk for m in response.context['meetings']}
+            self.assertFalse(page_ids & seen)
+            seen |= page_ids
+            cursor = response.context['next_cursor']
+        self.assertIsNotNone(cursor)
+
+    def test_invalid_cursor(self):
+        self.client.login(username='light', password='testpass123')
+        self.assertEqual(self.client.get(reverse('dashboard'), {'cursor': 'garbage'}).status_code, 400)
+
+
+class HotPathQueryTest(TestCase):
+    """
+    Pins query counts and SQLite query plans for the dashboard, meeting page,
+    PDF export and scheduler paths so N+1s and missing indexes fail locally.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='hotpath', email='hot@example.com', password='testpass123')
+        cls.meeting = Meeting.objects.create(
+            user=cls.user, name="Hot", bot_name="Bot",
+            meeting_link="https://meet.google.com/hot", join_time=timezone.now().time())
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username='hotpath', password='testpass123')
+
+    def _add_content(self, n):
+        for i in range(n):
+            transcript = Transcript.objects.create(meeting=self.meeting, text=f"Alice: t{i}। more")
+            TranscriptSegment.objects.create(transcript=transcript, text=f"t{i}",
+                                             start_time=timedelta(seconds=i), end_time=timedelta(seconds=i + 1))
+            Screenshot.objects.create(meeting=self.meeting, image_path=f"media/screenshots/{i}.png")
+
+    def _count_queries(self, url, params=None):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"expected {index_name} in plan:\n{plan}")
+
+    def test_query_counts_do_not_grow_with_content(self):
+        urls = [
+            (reverse('dashboard'), None),
+            (reverse('meeting_page', kwargs={'meeting_id': self.meeting.id}), None),
+            (reverse('meeting_segments', kwargs={'meeting_id': self.meeting.id}), None),
+            (reverse('meeting_segments', kwargs={'meeting_id': self.meeting.id}), {'kind': 'hateful'}),
+            (reverse('meeting_screenshots', kwargs={'meeting_id': self.meeting.id}), None),
+        ]
+        self._add_content(1)
+        before = [self._count_queries(url, params) for url, params in urls]
+        self._add_content(30)
+        after = [self._count_queries(url, params) for url, params in urls]
+        self.assertEqual(before, after)
+
+    def test_dashboard_plan(self):
+        page = Meeting.objects.filter(user=self.user).with_counts().order_by('-created_at', '-id')[:25]
+        self.assertUsesIndex(page, 'meeting_user_created_idx')
+        # the count subqueries must be index lookups, never table scans
+        self.assertNotIn('SCAN', page.explain())
+
+    def test_meeting_page_plans(self):
+        self.assertUsesIndex(self.meeting.transcripts.order_by('created', 'id'), 'transcript_meeting_created_idx')
+        self.assertUsesIndex(self.meeting.screenshots.order_by('created', 'id'), 'screenshot_meeting_created_idx')
+
+    def test_export_plans(self):
+        # export_meeting_summary_pdf: latest transcript, screenshots, segments
+        self.assertUsesIndex(self.meeting.transcripts.order_by('-created'), 'transcript_meeting_created_idx')
+        self.assertUsesIndex(self.meeting.screenshots.order_by('created'), 'screenshot_meeting_created_idx')
+        self.assertUsesIndex(TranscriptSegment.objects.filter(transcript_id=1).order_by('start_time'),
+                             'segment_transcript_start_idx')
+
+    def test_scheduler_plan(self):
+        now = datetime.now()
+        due = Meeting.objects.due((now - timedelta(minutes=5)).time(), (now + timedelta(minutes=1)).time())
+        self.assertUsesIndex(due, 'meeting_due_join_time_idx')
+        with self.assertNumQueries(1):
+            list(due)
+
+
+class SQLiteConcurrencyTest(TransactionTestCase):
+    """
+    Stress test: N simulated bots insert screenshots through BatchWriter while
+    reader threads hit the web tier. Nothing may fail with "database is locked".
+    Runs on a temporary file database (WAL and cross-connection locking don't
+    exist in the in-memory test database).
+    """
+    BOTS = 8
+    SHOTS_PER_BOT = 40
+    READERS = 4
+
+    @classmethod
+    def setUpClass(cls):
+        # point 'default' at a temporary file for this class; the in-memory
+        # test database (and its connection) are put back afterwards
+        cls._tmp = tempfile.mkdtemp()
+        path = os.path.join(cls._tmp, 'concurrency.sqlite3')
+        cls._memory_settings = connections.settings['default']
+        cls._memory_connection = connections['default']
+        connections.settings['default'] = {**cls._memory_settings, 'NAME': path,
+                                           'TEST': {**cls._memory_settings['TEST'], 'NAME': path}}
+        connections['default'] = connections.create_connection('default')
+        call_command('migrate', verbosity=0, interactive=False)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            connections['default'].close()
+            connections.settings['default'] = cls._memory_settings
+            connections['default'] = cls._memory_connection
+            shutil.rmtree(cls._tmp, True)
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='stress', email='stress@example.com', password='testpass123')
+        self.meetings = [
+            Meeting.objects.create(user=self.user, name=f"Bot {i}", bot_name=f"Bot{i}")
+            for i in range(self.BOTS)
+        ]
+
+    def test_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_bots_and_readers(self):
+        errors = []
+        stop = threading.Event()
+
+        def bot(meeting):
+            try:
+                with BatchWriter(Screenshot, batch_size=5, flush_interval=0.05,
+                                 on_flush=lambda b: meetings_changed({s.meeting_id for s in b})) as writer:
+                    for i in range(self.SHOTS_PER_BOT):
+                        writer.add(Screenshot(meeting=meeting, image_path=f"media/screenshots/{meeting.id}_{i}.png"))
+                        time.sleep(0.001)
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            client = Client()
+            client.force_login(self.user)
+            try:
+                while not stop.is_set():
+                    for meeting in self.meetings:
+                        response = client.get(reverse('meeting_screenshots', kwargs={'meeting_id': meeting.id}))
+                        if response.status_code != 200:
+                            errors.append(response.status_code)
+                    response = client.get(reverse('dashboard'))
+                    if response.status_code != 200:
+                        errors.append(response.status_code)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        readers = [threading.Thread(target=reader) for _ in range(self.READERS)]
+        bots = [threading.Thread(target=bot, args=(m,)) for m in self.meetings]
+        for t in readers + bots:
+            t.start()
+        for t in bots:
+            t.join()
+        stop.set()
+        for t in readers:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Screenshot.objects.count(), self.BOTS * self.SHOTS_PER_BOT)
+        self.assertEqual(Screenshot.objects.filter(meeting=self.meetings[0]).count(), self.SHOTS_PER_BOT)
+
+    def test_failed_batch_is_dropped_and_the_writer_keeps_going(self):
+        gone = Meeting.objects.create(user=self.user, name="Deleted mid-call", bot_name="Bot")
+        gone_id = gone.pk
+        gone.delete()
+        with mock.patch('builtins.print'), \
+                BatchWriter(Screenshot, batch_size=1, flush_interval=0.05) as writer:
+            writer.add(Screenshot(meeting_id=gone_id, image_path="media/screenshots/orphan.png"))
+            writer.flush()
+            writer.add(Screenshot(meeting=self.meetings[0], image_path="media/screenshots/kept.png"))
+            writer.flush()
+        self.assertEqual(list(Screenshot.objects.values_list('image_path', flat=True)),
+                         ["media/screenshots/kept.png"])
+
+    def test_flush_returns_when_the_writer_is_dead(self):
+        writer = BatchWriter(Screenshot, flush_interval=0.05)
+        writer.close()
+        writer.add(Screenshot(meeting=self.meetings[0], image_path="media/screenshots/late.png"))
+        with mock.patch('builtins.print') as log:
+            writer.flush()
+            writer.close()
+        self.assertIn('not saved', log.call_args_list[0].args[0])
+
+
+def _bot_ok(meeting_id, events, debugger_address=None, audio_sink=None):
+    events.put(('joined', meeting_id, time.time()))
+
+
+def _bot_crash(meeting_id, events, debugger_address=None, audio_sink=None):
+    raise SystemExit(3)
+
+
+def _bot_hang(meeting_id, events, debugger_address=None, audio_sink=None):
+    time.sleep(30)
+
+
+class BotSupervisorTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='sched', email='sched@example.com', password='testpass123')
+
+    def _meeting(self, name, **kwargs):
+        return Meeting.objects.create(
+            user=self.user, name=name, bot_name="Bot",
+            meeting_link="https://meet.google.com/sched", join_time=datetime.now().time(), **kwargs)
+
+    def _supervisor(self, target, **kwargs):
+        kwargs.setdefault('max_browsers', 4)
+        pool = BotSupervisor(max_cpu_percent=10_000, min_free_mb=1, target=target, mp_context='fork', **kwargs)
+        self.addCleanup(pool.shutdown, 1)
+        return pool
+
+    def _wait_for(self, pool, meeting, status):
+        for _ in range(100):
+            pool.poll()
+            if pool.bots[meeting.pk].status == status:
+                return pool.bots[meeting.pk]
+            time.sleep(0.05)
+        self.fail(f"bot never reached {status}: {pool.status()}")
+
+    def test_scheduler_dispatches_without_blocking(self):
+        meeting = self._meeting("Due")
+        pool = self._supervisor(_bot_hang)
+        with mock.patch.object(scheduler, '_SUPERVISOR', pool):
+            started = time.monotonic()
+            scheduler.check_and_run_meetings()
+            self.assertLess(time.monotonic() - started, 5)
+        meeting.refresh_from_db()
+        self.assertTrue(meeting.joined)
+        self.assertTrue(pool.bots[meeting.pk].process.is_alive())
+
+    def test_join_latency_is_reported(self):
+        meeting = self._meeting("Latency")
+        pool = self._supervisor(_bot_ok)
+        self.assertTrue(pool.dispatch(meeting))
+        record = self._wait_for(pool, meeting, 'finished')
+        self.assertIsNotNone(record.joined_at)
+        self.assertLess(abs(record.join_latency), 60)
+
+    def test_admission_limits_concurrent_browsers(self):
+        first, second = self._meeting("First"), self._meeting("Second")
+        pool = self._supervisor(_bot_hang, max_browsers=1)
+        with mock.patch.object(scheduler, '_SUPERVISOR', pool):
+            scheduler.check_and_run_meetings()
+        joined = Meeting.objects.filter(pk__in=[first.pk, second.pk], joined=True).count()
+        self.assertEqual(joined, 1)
+        self.assertEqual(len(pool.running()), 1)
+
+    def test_crashed_bots_are_restarted_then_marked_failed(self):
+        meeting = self._meeting("Crashy")
+        pool = self._supervisor(_bot_crash, max_restarts=2)
+        pool.dispatch(meeting)
+        record = self._wait_for(pool, meeting, 'failed')
+        self.assertEqual(record.restarts, 2)
+        self.assertEqual(record.exitcode, 3)
+        self.assertEqual(len(record.history), 3)
+
+    def test_restart_waits_for_a_busy_host(self):
+        meeting = self._meeting("Busy host")
+        pool = self._supervisor(_bot_crash, max_restarts=1)
+        pool.dispatch(meeting)
+        busy = iter(["host CPU at 99%"])
+        with mock.patch.object(pool, 'admission_error', side_effect=lambda: next(busy, None)), \
+                mock.patch('builtins.print'):
+            record = self._wait_for(pool, meeting, 'restart_pending')
+            self.assertEqual(record.restarts, 0)
+            record = self._wait_for(pool, meeting, 'failed')
+        self.assertEqual(record.restarts, 1)
+        self.assertEqual(len(record.history), 2)
+
+
+class MeetingTimerTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='timer', email='timer@example.com', password='testpass123')
+        self.fired = []
+        self.timer = MeetingTimer(on_due=self._on_due, port=0, idle_interval=0.05, retry_seconds=0.05)
+        self.addCleanup(self.timer.close)
+
+    def _on_due(self, meeting_id):
+        self.fired.append((meeting_id, time.time()))
+        return True
+
+    def _run_until(self, condition, seconds=3):
+        deadline = time.time() + seconds
+        while time.time() < deadline and not condition():
+            self.timer.run_once()
+
+    def test_fires_in_join_order_not_before_due(self):
+        now = datetime.now()
+        due = {1: now + timedelta(seconds=0.3), 2: now + timedelta(seconds=0.1), 3: now + timedelta(seconds=0.2)}
+        for meeting_id, when in due.items():
+            self.timer.schedule(meeting_id, when.time(), now)
+        self._run_until(lambda: len(self.fired) == 3)
+        self.assertEqual([m for m, _ in self.fired], [2, 3, 1])
+        for meeting_id, fired_at in self.fired:
+            self.assertGreaterEqual(fired_at, due[meeting_id].timestamp())
+
+    def test_rescheduling_replaces_the_old_slot(self):
+        now = datetime.now()
+        self.timer.schedule(1, (now + timedelta(seconds=0.05)).time(), now)
+        self.timer.schedule(1, (now + timedelta(seconds=0.3)).time(), now)
+        self._run_until(lambda: self.fired)
+        self.assertEqual(len(self.fired), 1)
+        self.assertGreaterEqual(self.fired[0][1], (now + timedelta(seconds=0.3)).timestamp())
+
+    def test_past_grace_moves_to_tomorrow(self):
+        now = datetime.now()
+        self.timer.schedule(1, (now - timedelta(minutes=10)).time(), now)
+        due, _ = self.timer.pending()[1]
+        self.assertGreater(due, (now + timedelta(hours=23)).timestamp())
+
+    def test_meeting_saves_notify_the_timer(self):
+        join_at = datetime.now() + timedelta(seconds=0.3)
+        with self.settings(MEETING_NOTIFY_PORT=self.timer.port):
+            meeting = Meeting.objects.create(user=self.user, name="Notified", bot_name="Bot",
+                                             join_time=join_at.time())
+            self._run_until(lambda: meeting.pk in self.timer.pending(), seconds=1)
+            self.assertIn(meeting.pk, self.timer.pending())
+
+            self._run_until(lambda: self.fired)
+            self.assertEqual([m for m, _ in self.fired], [meeting.pk])
+
+            # a later edit reschedules without any table scan
+            meeting.join_time = (datetime.now() + timedelta(hours=1)).time()
+            meeting.save()
+            self._run_until(lambda: meeting.pk in self.timer.pending(), seconds=1)
+            self.assertIn(meeting.pk, self.timer.pending())
+
+            meeting.joined = True
+            meeting.save()
+            self._run_until(lambda: meeting.pk not in self.timer.pending(), seconds=1)
+            self.assertNotIn(meeting.pk, self.timer.pending())
+
+    def test_not_admitted_is_retried(self):
+        attempts = []
+        self.timer.on_due = lambda meeting_id: attempts.append(meeting_id) or len(attempts) >= 3
+        now = datetime.now()
+        self.timer.schedule(1, now.time(), now)
+        self._run_until(lambda: len(attempts) >= 3)
+        self.assertEqual(attempts, [1, 1, 1])
+
+    def test_rescan_finds_unannounced_changes(self):
+        self.timer.rescan_interval = 0.1
+        # bulk_create / update skip post_save: no datagram is ever sent
+        meeting = Meeting.objects.bulk_create([Meeting(
+            user=self.user, name="Silent", bot_name="Bot",
+            join_time=(datetime.now() + timedelta(seconds=0.3)).time())])[0]
+        self._run_until(lambda: self.fired)
+        self.assertEqual([m for m, _ in self.fired], [meeting.pk])
+
+        Meeting.objects.filter(pk=meeting.pk).update(join_time=(datetime.now() + timedelta(hours=1)).time())
+        self._run_until(lambda: meeting.pk in self.timer.pending(), seconds=1)
+        self.assertIn(meeting.pk, self.timer.pending())
+
+        Meeting.objects.filter(pk=meeting.pk).update(joined=True)
+        self._run_until(lambda: meeting.pk not in self.timer.pending(), seconds=1)
+        self.assertNotIn(meeting.pk, self.timer.pending())
+        self.assertEqual(len(self.fired), 1)
+
+
+class MeetingLeaseTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='lease', email='lease@example.com', password='testpass123')
+        self.meeting = Meeting.objects.create(
+            user=self.user, name="Leased", bot_name="Bot",
+            meeting_link="https://meet.google.com/lease", join_time=datetime.now().time())
+
+    def test_only_one_owner_wins(self):
+        self.assertTrue(Meeting.objects.claim(self.meeting.pk, 'node-a', 60))
+        self.assertFalse(Meeting.objects.claim(self.meeting.pk, 'node-b', 60))
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.claimed_by, 'node-a')
+        self.assertTrue(self.meeting.joined)
+
+    def test_expired_lease_is_reclaimed(self):
+        Meeting.objects.claim(self.meeting.pk, 'node-a', 60)
+        Meeting.objects.filter(pk=self.meeting.pk).update(lease_expires=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(list(Meeting.objects.lease_expired()), [self.meeting])
+        self.assertTrue(Meeting.objects.claim(self.meeting.pk, 'node-b', 60))
+        # the old owner can no longer extend what it lost
+        self.assertEqual(Meeting.objects.renew_leases([self.meeting.pk], 'node-a', 60), 0)
+
+    def test_release_and_abandon(self):
+        Meeting.objects.claim(self.meeting.pk, 'node-a', 60)
+        self.assertEqual(Meeting.objects.release_finished([self.meeting.pk], 'node-a'), 0)
+        Meeting.objects.abandon('node-a')
+        self.assertTrue(Meeting.objects.claim(self.meeting.pk, 'node-b', 60))
+        Meeting.objects.release_finished([], 'node-b')
+        self.meeting.refresh_from_db()
+        self.assertIsNone(self.meeting.lease_expires)
+        # finished meetings are never claimable again
+        self.assertFalse(Meeting.objects.claim(self.meeting.pk, 'node-c', 60))
+
+    def test_release_ends_only_that_meeting(self):
+        other = Meeting.objects.create(user=self.user, name="Still running", bot_name="Bot",
+                                       join_time=datetime.now().time())
+        Meeting.objects.claim(self.meeting.pk, 'node-a', 60)
+        Meeting.objects.claim(other.pk, 'node-a', 60)
+        self.assertEqual(Meeting.objects.release(self.meeting.pk, 'node-a'), 1)
+        self.meeting.refresh_from_db()
+        other.refresh_from_db()
+        self.assertIsNone(self.meeting.lease_expires)
+        self.assertIsNotNone(other.lease_expires)
+
+    def test_failing_supervisor_tick_does_not_stop_the_timer(self):
+        pool = mock.Mock(poll=mock.Mock(side_effect=OperationalError("database is locked")))
+        with mock.patch.object(scheduler, '_SUPERVISOR', pool), mock.patch('builtins.print') as log:
+            scheduler.supervise()
+        pool.poll.assert_called_once()
+        self.assertIn('database is locked', log.call_args.args[0])
+
+    def test_join_due_meeting_dispatches_on_one_node_only(self):
+        pools = []
+        for node in ('node-a', 'node-b'):
+            pool = mock.Mock(admission_error=mock.Mock(return_value=None),
+                             dispatch=mock.Mock(return_value=True))
+            with mock.patch.object(scheduler, '_SUPERVISOR', pool), \
+                    mock.patch.object(scheduler, 'NODE_ID', node):
+                self.assertTrue(scheduler.join_due_meeting(self.meeting.pk))
+            pools.append(pool)
+        self.assertEqual([p.dispatch.call_count for p in pools], [1, 0])
+
+    def test_failed_dispatch_gives_the_claim_back(self):
+        pool = mock.Mock(admission_error=mock.Mock(return_value=None),
+                         dispatch=mock.Mock(return_value=False))
+        with mock.patch.object(scheduler, '_SUPERVISOR', pool):
+            self.assertFalse(scheduler.join_due_meeting(self.meeting.pk))
+        self.meeting.refresh_from_db()
+        self.assertFalse(self.meeting.joined)
+        self.assertEqual(self.meeting.claimed_by, '')
+
+
+class MeetingClaimRaceTest(TransactionTestCase):
+    NODES = 6
+    MEETINGS = 20
+
+    def test_each_meeting_claimed_exactly_once(self):
+        user = get_user_model().objects.create_user(
+            username='race', email='race@example.com', password='testpass123')
+        ids = [Meeting.objects.create(user=user, name=f"Race {i}", bot_name="Bot").pk
+               for i in range(self.MEETINGS)]
+        won, errors = [], []
+        barrier = threading.Barrier(self.NODES)
+
+        def node(name):
+            try:
+                barrier.wait()
+                for meeting_id in ids:
+                    if Meeting.objects.claim(meeting_id, name, 60):
+                        won.append((meeting_id, name))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=node, args=(f"node-{i}",)) for i in range(self.NODES)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(m for m, _ in won), ids)
+        owners = dict(Meeting.objects.values_list('id', 'claimed_by'))
+        self.assertEqual(owners, dict(won))
+
+
+class _FakeChromeProcess:
+    pid = None
+
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = -15
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+    kill = terminate
+
+
+def _fake_launcher(headless=None):
+    return WarmChrome(port=9222, profile_dir='/nonexistent', process=_FakeChromeProcess())
+
+
+class ChromePoolTest(TestCase):
+    def _pool(self, **kwargs):
+        pool = ChromePool(launcher=_fake_launcher, resetter=lambda chrome: True, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def _wait_idle(self, pool, count):
+        for _ in range(100):
+            if pool.idle_count() == count:
+                return
+            time.sleep(0.02)
+        self.fail(f"pool never reached {count} idle browsers")
+
+    def test_prelaunches_and_replenishes(self):
+        pool = self._pool(size=2)
+        self._wait_idle(pool, 2)
+        chrome = pool.acquire()
+        self.assertTrue(chrome.alive())
+        self._wait_idle(pool, 2)
+
+    def test_dead_browsers_are_never_handed_out(self):
+        pool = self._pool(size=1)
+        self._wait_idle(pool, 1)
+        pool._idle[0].process.terminate()
+        self.assertIsNone(pool.acquire())
+        self._wait_idle(pool, 1)
+
+    def test_release_recycles_until_max_uses(self):
+        launched = []
+
+        def launch_once(headless=None):
+            # only one browser ever, so a refill can only come from recycling
+            if launched:
+                raise RuntimeError("no more browsers")
+            launched.append(_fake_launcher())
+            return launched[0]
+
+        pool = ChromePool(size=1, max_uses=2, launcher=launch_once, resetter=lambda chrome: True)
+        self.addCleanup(pool.close)
+        self._wait_idle(pool, 1)
+        chrome = pool.acquire()
+        pool.release(chrome)
+        self.assertEqual(pool.idle_count(), 1)
+        self.assertIs(pool.acquire(), chrome)
+        pool.release(chrome)  # second use: retired
+        self.assertEqual(pool.idle_count(), 0)
+        self.assertFalse(chrome.alive())
+
+    def test_crashed_bot_browser_is_destroyed(self):
+        pool = self._pool(size=1)
+        self._wait_idle(pool, 1)
+        chrome = pool.acquire()
+        pool.release(chrome, reusable=False)
+        self.assertFalse(chrome.alive())
+
+    def test_supervisor_attaches_bots_to_warm_browsers(self):
+        user = get_user_model().objects.create_user(
+            username='warm', email='warm@example.com', password='testpass123')
+        meeting = Meeting.objects.create(user=user, name="Warm", bot_name="Bot",
+                                         join_time=datetime.now().time())
+        chrome_pool = self._pool(size=1)
+        self._wait_idle(chrome_pool, 1)
+        pool = BotSupervisor(max_cpu_percent=10_000, min_free_mb=1, target=_bot_ok,
+                             mp_context='fork', chrome_pool=chrome_pool)
+        self.addCleanup(pool.shutdown, 1)
+        pool.dispatch(meeting)
+        for _ in range(100):
+            pool.poll()
+            if pool.bots[meeting.pk].status == 'finished':
+                break
+            time.sleep(0.05)
+        record = pool.bots[meeting.pk]
+        self.assertTrue(record.warm)
+        self.assertIsNotNone(record.time_to_join)
+        self.assertIsNone(record.browser)  # handed back to the pool
+        self.assertEqual(pool.join_stats()['warm']['count'], 1)
+
+    def test_pooled_browser_is_detached_not_quit(self):
+        from .bot_scripts import google_meet_bot
+        pooled, cold = mock.Mock(), mock.Mock()
+        google_meet_bot.end_session(pooled, pooled=True)
+        google_meet_bot.end_session(cold, pooled=False)
+        pooled.quit.assert_not_called()
+        pooled.get.assert_called_once_with("about:blank")
+        pooled.service.stop.assert_called_once()
+        cold.quit.assert_called_once()
+
+
+class ChromedriverResolutionTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.driver = self._executable('chromedriver')
+        self.manifest = os.path.join(self.tmp, 'drivers', 'chromedriver.json')
+        overrides = self.settings(CHROMEDRIVER_PATH='', CHROMEDRIVER_VERSION='',
+                                  CHROMEDRIVER_MANIFEST=self.manifest)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        chromedriver.reset()
+        self.addCleanup(chromedriver.reset)
+
+    def _executable(self, name):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w') as f:
+            f.write('#!/bin/sh\n')
+        os.chmod(path, 0o755)
+        return path
+
+    def test_import_does_not_resolve(self):
+        from .bot_scripts import google_meet_bot
+        with mock.patch.object(chromedriver, '_download') as download:
+            importlib.reload(google_meet_bot)
+        download.assert_not_called()
+
+    def test_first_resolution_writes_manifest_then_memoizes(self):
+        with mock.patch.object(chromedriver, '_download', return_value=self.driver) as download:
+            self.assertEqual(chromedriver.resolve_chromedriver(), self.driver)
+            self.assertEqual(chromedriver.resolve_chromedriver(), self.driver)
+        download.assert_called_once()
+        with open(self.manifest) as f:
+            self.assertEqual(json.load(f)['path'], self.driver)
+
+    def test_manifest_hit_skips_download(self):
+        chromedriver.write_manifest(self.driver)
+        with mock.patch.object(chromedriver, '_download') as download:
+            self.assertEqual(chromedriver.resolve_chromedriver(), self.driver)
+        download.assert_not_called()
+
+    def test_stale_or_mismatched_manifest_is_re_resolved(self):
+        chromedriver.write_manifest(os.path.join(self.tmp, 'gone'))
+        self.assertIsNone(chromedriver.read_manifest())
+        chromedriver.write_manifest(self.driver, '126.0')
+        with self.settings(CHROMEDRIVER_VERSION='127.0'):
+            self.assertIsNone(chromedriver.read_manifest())
+
+    def test_pinned_path_wins(self):
+        pinned = self._executable('pinned-driver')
+        with self.settings(CHROMEDRIVER_PATH=pinned), \
+                mock.patch.object(chromedriver, '_download') as download:
+            self.assertEqual(chromedriver.resolve_chromedriver(), pinned)
+        download.assert_not_called()
+        self.assertFalse(os.path.exists(self.manifest))
+
+
+class AudioSinkTest(TestCase):
+    def test_sink_lifecycle(self):
+        calls = []
+
+        def pactl(*args):
+            calls.append(args)
+            return "42\n" if args[0] == 'load-module' else ""
+
+        with mock.patch.object(audio_sink, '_pactl', side_effect=pactl):
+            with audio_sink.NullSink('meeting7') as sink:
+                self.assertEqual(sink.name, f"meetbot_{os.getpid()}_meeting7")
+                self.assertEqual(sink.monitor, f"{sink.name}.monitor")
+                self.assertEqual(sink.env({})['PULSE_SINK'], sink.name)
+        self.assertEqual(calls[0][:2], ('load-module', 'module-null-sink'))
+        self.assertIn(f"sink_name={sink.name}", calls[0])
+        self.assertEqual(calls[1], ('unload-module', '42'))
+
+    def test_concurrent_bots_get_distinct_sinks(self):
+        with mock.patch.object(audio_sink, '_pactl', side_effect=["1\n", "2\n"]):
+            first = audio_sink.NullSink('meeting1').create()
+            second = audio_sink.NullSink('meeting2').create()
+        self.assertNotEqual(first.monitor, second.monitor)
+        self.assertEqual((first.module_id, second.module_id), (1, 2))
+
+    def test_stale_sinks_of_dead_processes_are_removed(self):
+        dead_pid = 2 ** 22 + 1
+        listing = (
+            f"10\tmodule-null-sink\tsink_name=meetbot_{dead_pid}_chrome9222 sink_properties=x\n"
+            f"11\tmodule-null-sink\tsink_name=meetbot_{os.getpid()}_chrome9333\n"
+            "12\tmodule-null-sink\tsink_name=someone_else\n"
+        )
+        unloaded = []
+
+        def pactl(*args):
+            if args[0] == 'list':
+                return listing
+            unloaded.append(args[1])
+            return ""
+
+        with mock.patch.object(audio_sink, 'pactl_available', return_value=True), \
+                mock.patch.object(audio_sink, '_pactl', side_effect=pactl):
+            self.assertEqual(audio_sink.cleanup_stale_sinks(), 1)
+        self.assertEqual(unloaded, ['10'])
+
+    def test_without_pulseaudio_recording_falls_back(self):
+        with mock.patch.object(audio_sink, 'pactl_available', return_value=False):
+            self.assertIsNone(audio_sink.create_sink('meeting1'))
+
+
+class CallEventsTest(TestCase):
+    def test_end_of_call_ends_immediately(self):
+        call = call_events.CallState(alone_seconds=0)
+        self.assertIsNone(call.feed({'type': 'participants', 'count': 3}, now=0))
+        self.assertEqual(call.feed({'type': 'ended'}, now=1), 'end')
+
+    def test_auto_leave_after_being_alone(self):
+        call = call_events.CallState(alone_seconds=10)
+        call.feed({'type': 'participants', 'count': 1}, now=0)
+        self.assertIsNone(call.tick(now=9))
+        self.assertEqual(call.tick(now=10), 'leave')
+
+    def test_someone_joining_resets_the_alone_timer(self):
+        call = call_events.CallState(alone_seconds=10)
+        call.feed({'type': 'participants', 'count': 1}, now=0)
+        call.feed({'type': 'participants', 'count': 2}, now=5)
+        call.feed({'type': 'participants', 'count': 1}, now=8)
+        self.assertIsNone(call.tick(now=15))
+        self.assertEqual(call.tick(now=18), 'leave')
+
+    def test_auto_leave_is_off_by_default(self):
+        with self.settings(BOT_AUTO_LEAVE_ALONE_SECONDS=0):
+            call = call_events.CallState()
+        call.feed({'type': 'participants', 'count': 1}, now=0)
+        self.assertIsNone(call.tick(now=10_000))
+
+    def test_wait_reinstalls_observer_after_navigation(self):
+        driver = mock.Mock()
+        driver.execute_async_script.side_effect = [None, [{'type': 'ended'}]]
+        self.assertEqual(call_events.wait_events(driver, 1), [])
+        driver.execute_script.assert_called_once_with(call_events.OBSERVER_JS)
+        self.assertEqual(call_events.wait_events(driver, 1), [{'type': 'ended'}])
+
+
+class FrameCaptureTest(TestCase):
+    def _slide(self, color, text_row=None):
+        from PIL import Image, ImageDraw
+        image = Image.new('RGB', (1280, 720), color)
+        if text_row is not None:
+            ImageDraw.Draw(image).rectangle([100, text_row, 1180, text_row + 200], fill=(0, 0, 0))
+        buf = io.BytesIO()
+        image.save(buf, 'JPEG', quality=70)
+        return buf.getvalue()
+
+    def test_unchanged_frames_are_skipped(self):
+        sampler = frame_capture.FrameSampler(threshold=0.04)
+        slide_one, slide_two = self._slide('white', 100), self._slide('white', 400)
+        kept = [sampler.consider(f) for f in (slide_one, slide_one, slide_one, slide_two, slide_two)]
+        self.assertEqual(kept, [True, False, False, True, False])
+        self.assertEqual((sampler.sampled, sampler.kept), (5, 2))
+
+    def test_small_changes_do_not_count_as_new_slides(self):
+        from PIL import Image, ImageDraw
+        base = Image.new('RGB', (1280, 720), 'white')
+        moved = base.copy()
+        ImageDraw.Draw(moved).rectangle([600, 300, 610, 310], fill='black')  # a cursor
+        frames = []
+        for image in (base, moved):
+            buf = io.BytesIO()
+            image.save(buf, 'JPEG')
+            frames.append(buf.getvalue())
+        sampler = frame_capture.FrameSampler(threshold=0.04)
+        self.assertEqual([sampler.consider(f) for f in frames], [True, False])
+
+    def test_capture_uses_compressed_cdp_frames(self):
+        jpeg = self._slide('white', 100)
+        driver = mock.Mock()
+        driver.execute_cdp_cmd.return_value = {'data': base64.b64encode(jpeg).decode()}
+        self.assertEqual(frame_capture.capture_frame(driver, 'jpeg', 60), jpeg)
+        driver.execute_cdp_cmd.assert_called_once_with(
+            'Page.captureScreenshot', {'format': 'jpeg', 'quality': 60})
+
+
+TESTDATA = os.path.join(os.path.dirname(__file__), 'testdata')
+
+
+class LiveCaptionsTest(TestCase):
+    def setUp(self):
+        with open(os.path.join(TESTDATA, 'meet_captions.html'), encoding='utf-8') as f:
+            self.html = f.read()
+        self.segments = []
+        self.tracker = captions.CaptionTracker(
+            lambda *args: self.segments.append(args), settle_seconds=2, now=0)
+
+    def test_parses_saved_meet_caption_region(self):
+        self.assertEqual(captions.parse_caption_blocks(self.html), [
+            ('Rahim Uddin', 'আজকের মিটিংয়ে আমরা বাজেট নিয়ে কথা বলব'),
+            ('Karima Begum', 'ঠিক আছে, প্রথমে গত মাসের হিসাব দেখি'),
+        ])
+        self.assertEqual(captions.parse_caption_blocks(None), [])
+
+    def test_growing_caption_is_emitted_once_settled(self):
+        self.tracker.update([('Rahim', 'Today we')], now=1)
+        self.tracker.update([('Rahim', 'Today we talk budget')], now=2)
+        self.assertEqual(self.segments, [])
+        self.tracker.update([('Rahim', 'Today we talk budget')], now=4)
+        self.assertEqual(self.segments, [('Rahim', 'Today we talk budget', 1, 2)])
+        # the same turn keeps growing after a pause: only the new words are written
+        self.tracker.update([('Rahim', 'Today we talk budget and hiring')], now=10)
+        self.tracker.close(now=11)
+        self.assertEqual(self.segments[1], ('Rahim', 'and hiring', 10, 10))
+
+    def test_blocks_that_scroll_away_are_flushed(self):
+        self.tracker.update([('A', 'first line'), ('B', 'reply')], now=1)
+        self.tracker.update([('B', 'reply and more')], now=1.5)
+        self.assertEqual(self.segments, [('A', 'first line', 1, 1)])
+
+    def test_caption_transcript_feeds_the_meeting_page(self):
+        user = get_user_model().objects.create_user(
+            username='captions', email='captions@example.com', password='testpass123')
+        meeting = Meeting.objects.create(user=user, name="Captioned", bot_name="Bot")
+        transcript = Transcript.objects.create(meeting=meeting, text='', source=Transcript.SOURCE_CAPTIONS)
+        for i, (speaker, text) in enumerate(captions.parse_caption_blocks(self.html)):
+            captions.segment(transcript, speaker, text, i, i + 1).save()
+        text = captions.transcript_text(transcript.segments.order_by('start_time'))
+        from .utils.pagination import split_blocks
+        self.assertEqual(split_blocks(text)[1], ('Karima Begum', 'ঠিক আছে, প্রথমে গত মাসের হিসাব দেখি'))
+        self.assertEqual(transcript.segments.first().speaker, 'Rahim Uddin')
+
+
+class _SyncWriter:
+    def __init__(self, model, **kwargs):
+        pass
+
+    def add(self, obj):
+        obj.save()
+
+    def close(self):
+        pass
+
+
+class CaptionModerationTest(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username='moderated', email='moderated@example.com', password='testpass123')
+        self.meeting = Meeting.objects.create(user=user, name="Moderated", bot_name="Bot")
+        self.judged = []
+
+        def fake_detect(text):
+            self.judged.append(text)
+            return 'slur' in text
+
+        patcher = mock.patch('create_meeting_app.utils.moderation.detect_hate_speech', side_effect=fake_detect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_filter_judges_the_words_not_the_speaker(self):
+        from .utils.moderation import filter_hate_speech
+        clean, hateful = filter_hate_speech("Rahim: hello all। Karima: a slur here। plain line")
+        self.assertEqual(clean, "Rahim: hello all। plain line")
+        self.assertEqual(hateful, "Karima: a slur here")
+        self.assertEqual(self.judged, ["hello all", "a slur here", "plain line"])
+
+    def test_caption_log_stores_only_moderated_text(self):
+        from .bot_scripts import google_meet_bot
+        with mock.patch.object(google_meet_bot, 'BatchWriter', _SyncWriter), mock.patch('builtins.print'):
+            log = google_meet_bot.CaptionLog(self.meeting)
+            log.tracker.close = lambda: None
+            log._add('Rahim', 'hello all', 0, 1)
+            log._add('Karima', 'a slur here', 1, 2)
+            log.close()
+        transcript = self.meeting.transcripts.get()
+        self.assertEqual(transcript.text, "Rahim: hello all")
+        self.assertEqual(transcript.hateful_text, "Karima: a slur here")
+        self.assertIn('slur', transcript.raw_text)
+
+    def test_transcribe_meeting_moderates_caption_transcripts(self):
+        transcript = Transcript.objects.create(meeting=self.meeting, source=Transcript.SOURCE_CAPTIONS,
+                                               text="Rahim: hello all। Karima: a slur here")
+        spoken = []
+
+        def fake_tts(text, lang, file_field, instance, filename):
+            spoken.append(text)
+            file_field.name = f"tts/{filename}"
+
+        with mock.patch('create_meeting_app.management.commands.transcribe_meeting.generate_tts_and_save',
+                        side_effect=fake_tts):
+            call_command('transcribe_meeting', str(self.meeting.pk), stdout=io.StringIO())
+            call_command('transcribe_meeting', str(self.meeting.pk), stdout=io.StringIO())
+        transcript.refresh_from_db()
+        self.assertEqual(transcript.hateful_text, "Karima: a slur here")
+        self.assertEqual(spoken, ["Rahim: hello all"])  # once; the second run has nothing to do
+        # what the meeting page's has_hateful checks
+        self.assertTrue(self.meeting.transcripts.exclude(hateful_text__isnull=True).exclude(hateful_text='').exists())
+
+
+def _bot_busy(meeting_id, events, debugger_address=None, audio_sink=None):
+    child = subprocess.Popen(['sleep', '30'])  # stands in for ffmpeg
+    deadline = time.monotonic() + 30
+    try:
+        while time.monotonic() < deadline:
+            pass
+    finally:
+        child.kill()
+
+
+class BotResourceSamplingTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='metrics', email='metrics@example.com', password='testpass123')
+        self.meeting = Meeting.objects.create(user=self.user, name="Sampled", bot_name="Bot")
+
+    def test_tree_includes_descendants(self):
+        child = subprocess.Popen(['sleep', '5'])
+        self.addCleanup(child.kill)
+        self.assertIn(child.pid, process_tree([os.getpid()]))
+
+    def test_sampler_reports_tree_totals(self):
+        sampler = TreeSampler()
+        first = sampler.sample('me', [os.getpid()])
+        self.assertEqual(first['cpu_percent'], 0.0)
+        self.assertGreater(first['rss_mb'], 1)
+        self.assertGreater(first['open_fds'], 0)
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            pass
+        self.assertGreater(sampler.sample('me', [os.getpid()])['cpu_percent'], 20)
+
+    def test_supervisor_samples_running_bots(self):
+        stored = []
+        pool = BotSupervisor(max_cpu_percent=10_000, min_free_mb=1, target=_bot_busy, mp_context='fork',
+                             sample_interval=0.2, on_samples=stored.extend)
+        self.addCleanup(pool.shutdown, 1)
+        pool.dispatch(self.meeting)
+        for _ in range(40):
+            pool.poll()
+            if len(stored) >= 2:
+                break
+            time.sleep(0.1)
+        self.assertGreaterEqual(len(stored), 2)
+        latest = stored[-1]
+        self.assertEqual(latest['meeting_id'], self.meeting.pk)
+        self.assertGreaterEqual(latest['processes'], 2)  # bot + its "ffmpeg"
+        self.assertGreater(latest['cpu_percent'], 20)
+        self.assertEqual(pool.status()[0]['resources'], {k: v for k, v in latest.items() if k != 'meeting_id'})
+
+    def test_metrics_endpoint(self):
+        for cpu, rss in ((50.0, 300.0), (150.0, 900.0)):
+            BotResourceSample.objects.create(meeting=self.meeting, cpu_percent=cpu, rss_mb=rss,
+                                             open_fds=120, processes=9)
+        client = Client()
+        client.force_login(self.user)
+        self.assertEqual(client.get(reverse('bot_metrics')).status_code, 302)  # staff only
+
+        self.user.is_staff = True
+        self.user.save()
+        data = client.get(reverse('bot_metrics')).json()
+        row = data['meetings'][0]
+        self.assertEqual((row['meeting_id'], row['samples']), (self.meeting.pk, 2))
+        self.assertEqual((row['peak_cpu_percent'], row['peak_rss_mb'], row['avg_rss_mb']), (150.0, 900.0, 600.0))
+
+        series = client.get(reverse('bot_metrics'), {'meeting': self.meeting.pk}).json()['series']
+        self.assertEqual([point[1:] for point in series], [[50.0, 300.0, 120, 9], [150.0, 900.0, 120, 9]])
+        self.assertEqual(client.get(reverse('bot_metrics'), {'minutes': 'x'}).status_code, 400)
+
+
+class LazyModelImportTest(TestCase):
+    HEAVY = {'torch', 'transformers', 'sentence_transformers', 'sklearn'}
+    VIEWS_IMPORT_BUDGET_US = 3_000_000
+
+    def _importtime(self, module):
+        code = f"import django; django.setup(); import {module}"
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='meeting_agent.settings')
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env,
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        timings = {}
+        for line in result.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                _, cumulative, name = line[len('import time:'):].split('|')
+                if cumulative.strip().isdigit():
+                    timings[name.strip()] = int(cumulative)
+        return timings
+
+    def test_views_do_not_import_ml_libraries(self):
+        timings = self._importtime('create_meeting_app.views')
+        heavy = sorted(name for name in timings if name.split('.')[0] in self.HEAVY)
+        self.assertEqual(heavy, [])
+        self.assertLess(timings['create_meeting_app.views'], self.VIEWS_IMPORT_BUDGET_US)
+
+    def test_registry_loads_once_on_first_use(self):
+        calls = []
+        model_registry.register('test-model')(lambda: calls.append(1) or object())
+        self.addCleanup(model_registry.unload, 'test-model')
+        self.assertFalse(model_registry.is_loaded('test-model'))
+        threads = [threading.Thread(target=model_registry.get, args=('test-model',)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertIs(model_registry.get('test-model'), model_registry.get('test-model'))
+        self.assertEqual(calls, [1])
+        with self.assertRaises(KeyError):
+            model_registry.get('no-such-model')
+
+
+class ModelServerTest(TestCase):
+    def setUp(self):
+        self.batch_sizes = []
+
+        def fake_embed(texts):
+            self.batch_sizes.append(len(texts))
+            time.sleep(0.02)  # a forward pass takes a while; let requests pile up
+            return [[float(len(t)), 1.0] for t in texts]
+
+        def broken(texts):
+            raise ValueError("model exploded")
+
+        self.image_paths = []
+
+        def fake_clip_image(paths):
+            self.image_paths.extend(paths)
+            return [[1.0, 0.0] for _ in paths]
+
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, True)
+        self.path = os.path.join(tmp, 'models.sock')
+        self.server = model_server.ModelServer(
+            self.path, ops={('embed', 'fake'): fake_embed, ('embed', 'broken'): broken,
+                            ('embed', 'clip-image'): fake_clip_image},
+            max_batch=64, max_wait=0.05)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(model_server._drop_connection)
+
+    def test_concurrent_requests_are_micro_batched(self):
+        results = {}
+
+        def client(i):
+            try:
+                results[i] = model_server.embed('fake', ['x' * i])
+            finally:
+                model_server._drop_connection()
+
+        with self.settings(MODEL_SERVER_SOCKET=self.path):
+            threads = [threading.Thread(target=client, args=(i,)) for i in range(1, 17)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(results), 16)
+        for i, emb in results.items():
+            self.assertEqual(emb.dtype, np.float32)
+            self.assertEqual(emb.tolist(), [[float(i), 1.0]])
+        self.assertEqual(sum(self.batch_sizes), 16)
+        self.assertLess(len(self.batch_sizes), 16)
+
+    def test_errors_are_raised_in_the_client(self):
+        with self.settings(MODEL_SERVER_SOCKET=self.path):
+            with self.assertRaisesMessage(model_server.ModelServerError, 'model exploded'):
+                model_server.call('embed', 'broken', ['a'])
+            with self.assertRaisesMessage(model_server.ModelServerError, 'unknown op'):
+                model_server.call('embed', 'nope', ['a'])
+            # the connection survives an error
+            self.assertEqual(model_server.call('embed', 'fake', ['ab']), [[2.0, 1.0]])
+
+    def test_image_paths_are_sent_absolute(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, True)
+        os.makedirs(os.path.join(media, 'screenshots'))
+        open(os.path.join(media, 'screenshots', 'a.png'), 'wb').close()
+        with self.settings(MODEL_SERVER_SOCKET=self.path, MEDIA_ROOT=media):
+            model_server.embed('clip-image', ['screenshots/a.png', '/abs/b.png'])
+        self.assertEqual(self.image_paths, [os.path.join(media, 'screenshots', 'a.png'), '/abs/b.png'])
+
+    def test_bad_input_fails_only_its_own_request(self):
+        calls = []
+
+        def picky(texts):
+            calls.append(list(texts))
+            if 'bad' in texts:
+                raise ValueError("undecodable input")
+            return [len(t) for t in texts]
+
+        batcher = model_server.MicroBatcher(picky, max_batch=8, max_wait=0.2)
+        good, bad = batcher.submit(['ok', 'fine']), batcher.submit(['bad'])
+        self.assertEqual(good.result(timeout=5), [2, 4])
+        with self.assertRaisesMessage(ValueError, 'undecodable input'):
+            bad.result(timeout=5)
+        self.assertEqual(calls, [['ok', 'fine', 'bad'], ['ok', 'fine'], ['bad']])
+
+    def test_falls_back_to_in_process_without_a_server(self):
+        local = {('embed', 'fake'): lambda texts: [[9.0] for _ in texts]}
+        missing = os.path.join(os.path.dirname(self.path), 'missing.sock')
+        with mock.patch.dict(model_server.LOCAL_OPS, local), mock.patch('builtins.print'):
+            with self.settings(MODEL_SERVER_SOCKET=missing):
+                self.assertEqual(model_server.embed('fake', ['a', 'b']).tolist(), [[9.0], [9.0]])
+            with self.settings(MODEL_SERVER_SOCKET=''):
+                self.assertEqual(model_server.call('embed', 'fake', ['a']), [[9.0]])
+        self.assertEqual(model_server.embed('fake', []).shape, (0, 0))
+
+
+class _FakeOnnxSession:
+    def __init__(self, inputs, fn):
+        self._inputs, self._fn = inputs, fn
+
+    def get_inputs(self):
+        return [SimpleNamespace(name=n) for n in self._inputs]
+
+    def run(self, outputs, feed):
+        assert set(feed) == set(self._inputs), feed
+        return [self._fn(feed)]
+
+
+class _FakeClipProcessor:
+    def __call__(self, text=None, images=None, return_tensors=None, **kwargs):
+        assert return_tensors == 'np'
+        if text is not None:
+            ids = np.array([[len(t), 1] for t in text], dtype=np.int64)
+            return {'input_ids': ids, 'attention_mask': np.ones_like(ids)}
+        return {'pixel_values': np.array([np.asarray(img, dtype=np.float32).mean(axis=(0, 1)) for img in images])}
+
+
+class ClipBackendTest(TestCase):
+    def setUp(self):
+        sessions = {
+            'text': _FakeOnnxSession(['input_ids', 'attention_mask'],
+                                     lambda feed: feed['input_ids'].astype(np.float64)[:, :1].repeat(3, axis=1)),
+            'image': _FakeOnnxSession(['pixel_values'], lambda feed: feed['pixel_values']),
+        }
+        patcher = mock.patch.dict(model_registry._MODELS, {'clip-onnx': (sessions, _FakeClipProcessor(), 'cpu')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, True)
+        self.paths = []
+        from PIL import Image
+        for i, color in enumerate([(255, 0, 0), (0, 0, 255)]):
+            path = os.path.join(tmp, f'{i}.png')
+            Image.new('RGB', (8, 8), color).save(path)
+            self.paths.append(path)
+
+    def test_onnx_backend_runs_towers_in_batches(self):
+        from .utils import match_clip_embeddings as clip
+        emb = clip._compute_image_embeddings(self.paths, batch_size=1, backend='onnx')
+        self.assertEqual(emb.dtype, np.float32)
+        self.assertEqual(emb.tolist(), [[255.0, 0.0, 0.0], [0.0, 0.0, 255.0]])
+        self.assertEqual(clip._compute_text_embeddings(['ab', 'abc'], backend='onnx').tolist(),
+                         [[2.0] * 3, [3.0] * 3])
+        self.assertEqual(clip._compute_text_embeddings([], backend='onnx').shape, (0, 0))
+        with self.settings(CLIP_BACKEND='onnx'):
+            self.assertEqual(clip.similarity_matrix(['a'], self.paths).shape, (1, 2))
+
+    def test_parity_report(self):
+        from .utils.match_clip_embeddings import parity_report
+        reference = np.array([[0.30, 0.20], [0.10, 0.25]])
+        self.assertEqual(parity_report(reference, reference), {'max_abs_diff': 0.0, 'top1_agreement': 1.0})
+        drifted = np.array([[0.19, 0.20], [0.10, 0.26]])
+        report = parity_report(reference, drifted)
+        self.assertAlmostEqual(report['max_abs_diff'], 0.11)
+        self.assertEqual(report['top1_agreement'], 0.5)
+        with self.assertRaises(ValueError):
+            parity_report(reference, drifted[:1])
+
+    def test_matcher_embeds_screenshots_in_visual_batches(self):
+        from .utils.match_clip_embeddings import match_summary_to_screenshots
+        requests_seen = []
+
+        def fake_embed(model, inputs):
+            requests_seen.append((model, len(inputs)))
+            return np.ones((len(inputs), 3), dtype=np.float32)
+
+        with mock.patch.object(model_server, 'embed', side_effect=fake_embed):
+            matches = match_summary_to_screenshots(['a'], self.paths * 3, use_ocr=False, visual_batch_size=4)
+        self.assertEqual(requests_seen, [('clip-text', 1), ('clip-image', 4), ('clip-image', 2)])
+        self.assertEqual(len(matches['a']), 1)
+
+    def test_unknown_backend_is_rejected(self):
+        from .utils.match_clip_embeddings import clip_backend
+        with self.settings(CLIP_BACKEND='tensorrt'):
+            with self.assertRaisesMessage(ValueError, 'Unknown CLIP_BACKEND'):
+                clip_backend()
+        self.assertEqual(clip_backend('int8'), 'int8')
+
+
+class ScreenshotEmbeddingTest(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username='embed', email='embed@example.com', password='testpass123')
+        self.meeting = Meeting.objects.create(user=user, name="Embedded", bot_name="Bot")
+        self.shots = [Screenshot.objects.create(meeting=self.meeting, image_path=f'shot{i}.jpg') for i in range(3)]
+        self.shots[1].clip_embedding = screenshot_embeddings.encode([0.5, -1.0, 2.0, 0.0])
+        self.shots[1].save()
+        self.encoded = []
+
+        def fake_embed(model, paths):
+            self.assertEqual(model, 'clip-image')
+            self.encoded.extend(paths)
+            return np.array([[float(p[4]), 1.0, 0.0, 0.0] for p in paths], dtype=np.float32)
+
+        patcher = mock.patch.object(screenshot_embeddings.model_server, 'embed', side_effect=fake_embed)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _load(self):
+        shots = list(self.meeting.screenshots.order_by('created', 'pk'))
+        return screenshot_embeddings.load_embeddings(shots, [s.image_path for s in shots])
+
+    def test_only_missing_embeddings_are_computed_and_stored_as_float16(self):
+        emb = self._load()
+        self.assertEqual(self.encoded, ['shot0.jpg', 'shot2.jpg'])
+        self.assertEqual(emb.dtype, np.float32)
+        self.assertEqual(emb.tolist(), [[0.0, 1.0, 0.0, 0.0], [0.5, -1.0, 2.0, 0.0], [2.0, 1.0, 0.0, 0.0]])
+        stored = Screenshot.objects.get(pk=self.shots[2].pk).clip_embedding
+        self.assertEqual(len(bytes(stored)), 4 * 2)
+
+        self.encoded.clear()
+        with self.assertNumQueries(1):
+            again = self._load()
+        self.assertEqual(self.encoded, [])
+        np.testing.assert_array_equal(again, emb)
+
+    def test_background_pass_and_pages_skip_the_blob(self):
+        from .utils.pagination import paginate_screenshots
+        with mock.patch('create_meeting_app.management.commands.embed_screenshots._resolve_screenshot_path',
+                        side_effect=lambda s: None if s.image_path == 'shot2.jpg' else s.image_path):
+            out = io.StringIO()
+            call_command('embed_screenshots', meeting=self.meeting.pk, stdout=out)
+        self.assertEqual(self.encoded, ['shot0.jpg'])
+        self.assertIn('Embedded 1 screenshots (1 without a file)', out.getvalue())
+        with CaptureQueriesContext(connection) as ctx:
+            paginate_screenshots(self.meeting)
+        self.assertNotIn('clip_embedding', ctx.captured_queries[-1]['sql'])
+
+
+class ScreenshotOcrTest(TestCase):
+    def setUp(self):
+        from PIL import Image, ImageDraw
+        user = get_user_model().objects.create_user(
+            username='ocr', email='ocr@example.com', password='testpass123')
+        self.meeting = Meeting.objects.create(user=user, name="Slides", bot_name="Bot")
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, True)
+
+        def slide(name, text, background=230, ink=20):
+            image = Image.new('L', (1920, 1080), background)
+            ImageDraw.Draw(image).text((200, 400), text, fill=ink)
+            path = os.path.join(tmp, name)
+            image.convert('RGB').save(path)
+            return path
+
+        self.paths = [slide('a.png', 'Budget Q3'), slide('a2.png', 'Budget Q3'),
+                      slide('b.png', 'Hiring plan', background=30, ink=240)]
+        self.shots = [Screenshot.objects.create(meeting=self.meeting, image_path=p) for p in self.paths]
+
+    def test_prepare_downscales_and_binarizes_to_dark_on_light(self):
+        from .utils.ocr import prepare
+        for path in (self.paths[0], self.paths[2]):
+            image = prepare(path, max_width=640)
+            self.assertEqual(image.size, (640, 360))
+            pixels = np.asarray(image)
+            self.assertEqual(set(np.unique(pixels)), {0, 255})
+            self.assertGreater((pixels == 255).mean(), 0.9)  # the dark slide got inverted
+
+    def test_near_duplicates_reuse_text_and_results_are_persisted(self):
+        ocr_calls, embed_calls = [], []
+
+        def fake_ocr(paths):
+            ocr_calls.append(list(paths))
+            return [os.path.basename(p).upper() for p in paths]
+
+        def fake_embed(model, texts):
+            embed_calls.append(list(texts))
+            return np.array([[float(len(t)), 0.0] for t in texts], dtype=np.float32)
+
+        with mock.patch.object(screenshot_embeddings, 'ocr_images', side_effect=fake_ocr), \
+                mock.patch.object(screenshot_embeddings.model_server, 'embed', side_effect=fake_embed):
+            emb = screenshot_embeddings.load_ocr_embeddings(self.shots, self.paths)
+            self.assertEqual(ocr_calls, [[self.paths[0], self.paths[2]]])
+            self.assertEqual(embed_calls, [['A.PNG', 'B.PNG']])
+            self.assertEqual(emb.tolist(), [[5.0, 0.0], [5.0, 0.0], [5.0, 0.0]])
+            stored = [s.ocr_text for s in Screenshot.objects.filter(meeting=self.meeting).order_by('pk')]
+            self.assertEqual(stored, ['A.PNG', 'A.PNG', 'B.PNG'])
+
+            fresh = list(Screenshot.objects.filter(meeting=self.meeting).order_by('pk'))
+            self.assertEqual(screenshot_embeddings.ocr_missing(fresh, self.paths), 0)
+            self.assertEqual(len(ocr_calls), 1)
+
+        self.assertEqual(screenshot_embeddings.stored_ocr_texts(self.meeting), ['A.PNG', 'B.PNG'])
+
+
+class ScreenshotDedupTest(TestCase):
+    def setUp(self):
+        from PIL import Image, ImageDraw
+        user = get_user_model().objects.create_user(
+            username='dedup', email='dedup@example.com', password='testpass123')
+        self.meeting = Meeting.objects.create(user=user, name="Repeats", bot_name="Bot")
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, True)
+
+        def slide(name, boxes, quality=90, cursor=False):
+            background = np.tile(np.linspace(255, 180, 1280, dtype=np.uint8), (720, 1))
+            image = Image.fromarray(background).convert('RGB')
+            draw = ImageDraw.Draw(image)
+            for box in boxes:
+                draw.rectangle(box, fill='navy')
+            if cursor:
+                draw.polygon([(640, 360), (640, 380), (652, 372)], fill='black')
+            path = os.path.join(tmp, name)
+            image.save(path, quality=quality)
+            return path
+
+        bullets = [(100, 80, 1180, 200), (100, 260, 700, 300), (100, 340, 800, 380), (100, 420, 600, 460)]
+        chart = [(100, 300, 300, 650), (400, 450, 600, 650), (700, 200, 900, 650)]
+        self.paths = [
+            slide('1.jpg', bullets),
+            slide('2.jpg', bullets, quality=40),   # same slide, recompressed
+            slide('3.jpg', chart),
+            slide('4.jpg', bullets, cursor=True),  # same slide, mouse pointer on it
+        ]
+        self.shots = [Screenshot.objects.create(meeting=self.meeting, image_path=p) for p in self.paths]
+
+    def test_hash_distances(self):
+        from .utils.screenshot_dedup import hamming, phash
+        hashes = [phash(p) for p in self.paths]
+        self.assertLessEqual(hamming(hashes[0], hashes[1]), 6)
+        self.assertLessEqual(hamming(hashes[0], hashes[3]), 6)
+        self.assertGreater(hamming(hashes[0], hashes[2]), 12)
+
+    def test_representatives_keep_first_capture_of_each_slide(self):
+        from .utils import screenshot_dedup
+        kept, groups = screenshot_dedup.representatives(self.shots, self.paths)
+        self.assertEqual(kept, [0, 2])
+        self.assertEqual(groups, [[0, 1, 3], [2]])
+        self.assertEqual(screenshot_dedup.reduction_ratio(4, len(kept)), 0.5)
+        stored = Screenshot.objects.filter(meeting=self.meeting, phash__isnull=False).count()
+        self.assertEqual(stored, 4)
+        # hashes come back signed from the database and still group the same way
+        fresh = list(Screenshot.objects.filter(meeting=self.meeting).order_by('pk'))
+        self.assertEqual(screenshot_dedup.representatives(fresh, self.paths, distance=0)[0][0], 0)
+        self.assertEqual(screenshot_dedup.from_db(screenshot_dedup.to_db(2 ** 64 - 1)), 2 ** 64 - 1)
+
+    def test_report_command(self):
+        out = io.StringIO()
+        with mock.patch('create_meeting_app.management.commands.screenshot_duplicates._resolve_screenshot_path',
+                        side_effect=lambda s: s.image_path):
+            call_command('screenshot_duplicates', stdout=out)
+        self.assertIn('Repeats (#%d): 4 → 2 distinct, 50%% reduction' % self.meeting.pk, out.getvalue())
+
+
+class CachedPdfExportTest(TransactionTestCase):
+    def setUp(self):
+        from .utils import export_pdf
+        self.export_pdf = export_pdf
+        user = get_user_model().objects.create_user(
+            username='pdf', email='pdf@example.com', password='testpass123')
+        self.meeting = Meeting.objects.create(user=user, name="Exported", bot_name="Bot")
+        self.transcript = Transcript.objects.create(meeting=self.meeting, text="hi",
+                                                    summary="<h3>Topics Discussed</h3><ul><li>Budget</li></ul>")
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, True)
+        media = self.settings(MEDIA_ROOT=tmp)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.builds = []
+
+        def fake_render(meeting, transcript, out_path):
+            self.builds.append(transcript.summary)
+            time.sleep(0.2)
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            with open(out_path, 'w') as f:
+                f.write(transcript.summary)
+
+        patcher = mock.patch.object(export_pdf, '_render_summary_pdf', side_effect=fake_render)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_downloads_share_one_build(self):
+        paths = []
+
+        def download():
+            try:
+                paths.append(self.export_pdf.export_meeting_summary_pdf(self.meeting.pk))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=download) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(self.builds), 1)
+        self.assertEqual(set(paths), {self.export_pdf.summary_pdf_path(self.meeting.pk)})
+        # no lock is kept around for meetings nobody is building
+        self.assertNotIn(self.meeting.pk, self.export_pdf._build_locks)
+
+    def test_rebuilds_only_when_inputs_change(self):
+        export = self.export_pdf.export_meeting_summary_pdf
+        path = export(self.meeting.pk)
+        export(self.meeting.pk)
+        self.assertEqual(len(self.builds), 1)
+
+        Screenshot.objects.create(meeting=self.meeting, image_path='media/screenshots/x.jpg')
+        export(self.meeting.pk)
+        self.assertEqual(len(self.builds), 2)
+
+        Transcript.objects.create(meeting=self.meeting, text="later", summary="<h3>Topics Discussed</h3>")
+        export(self.meeting.pk)
+        self.assertEqual(self.builds[-1], "<h3>Topics Discussed</h3>")
+
+        # segments feed the points' timestamps, the owner's name the PDF author
+        latest = self.meeting.transcripts.order_by('created').last()
+        TranscriptSegment.objects.create(transcript=latest, text="later",
+                                         start_time=timedelta(seconds=0), end_time=timedelta(seconds=1))
+        export(self.meeting.pk)
+        self.assertEqual(len(self.builds), 4)
+        self.meeting.user.first_name = "Pat"
+        self.meeting.user.save()
+        export(self.meeting.pk)
+        self.assertEqual(len(self.builds), 5)
+        with mock.patch.object(self.export_pdf, 'OCR_AVAILABLE', not self.export_pdf.OCR_AVAILABLE):
+            export(self.meeting.pk)
+        self.assertEqual(len(self.builds), 6)
+
+        os.remove(path)
+        export(self.meeting.pk)
+        export(self.meeting.pk, force=True)
+        self.assertEqual(len(self.builds), 8)
+
+        with self.assertRaisesMessage(ValueError, 'No summary'):
+            export(Meeting.objects.create(user=self.meeting.user, name="Empty", bot_name="Bot").pk)
+
+    def test_fresh_pdf_query_count(self):
+        export = self.export_pdf.export_meeting_summary_pdf
+        TranscriptSegment.objects.create(transcript=self.transcript, text="hi",
+                                         start_time=timedelta(seconds=0), end_time=timedelta(seconds=1))
+        Screenshot.objects.create(meeting=self.meeting, image_path='media/screenshots/x.jpg')
+        export(self.meeting.pk)
+        # meeting with its owner, latest transcript, segments, screenshots
+        with self.assertNumQueries(4):
+            export(self.meeting.pk)
+        self.assertEqual(len(self.builds), 1)
+
+
+class ThumbnailCacheTest(TestCase):
+    def setUp(self):
+        from PIL import Image
+        from .utils import thumbnail_cache
+        self.cache = thumbnail_cache
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        media = self.settings(MEDIA_ROOT=os.path.join(self.tmp, 'media'))
+        media.enable()
+        self.addCleanup(media.disable)
+        # two meetings, same file name, different pictures
+        self.sources = []
+        for meeting, color in (('m1', 'red'), ('m2', 'blue')):
+            os.makedirs(os.path.join(self.tmp, meeting))
+            path = os.path.join(self.tmp, meeting, 'shot.png')
+            Image.new('RGB', (2000, 1000), color).save(path)
+            self.sources.append(path)
+
+    def test_content_addressed_and_generated_once(self):
+        from PIL import Image
+        with mock.patch.object(self.cache, '_generate', wraps=self.cache._generate) as generate:
+            first = self.cache.thumbnails(self.sources, 500)
+            again = self.cache.thumbnails(self.sources, 500)
+        self.assertEqual(generate.call_count, 2)
+        self.assertEqual(first, again)
+        self.assertNotEqual(first[0], first[1])
+        for path in first:
+            self.assertTrue(path.startswith(self.cache.thumb_dir()))
+            with Image.open(path) as im:
+                self.assertEqual(im.size, (500, 250))
+        self.assertNotEqual(self.cache.thumbnails(self.sources[:1], 250), first[:1])
+        missing = os.path.join(self.tmp, 'missing.png')
+        with mock.patch('builtins.print'):
+            self.assertEqual(self.cache.thumbnails([missing], 500), [missing])
+
+    def test_digests_are_bounded_and_follow_file_changes(self):
+        from PIL import Image
+        self.assertIsNotNone(self.cache._file_digest.cache_info().maxsize)
+        path = self.sources[0]
+        before = self.cache._digest(path)
+        self.assertEqual(self.cache._digest(path), before)
+        Image.new('RGB', (2000, 1000), 'green').save(path)
+        os.utime(path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+        self.assertNotEqual(self.cache._digest(path), before)
+
+    def test_evicts_least_recently_used(self):
+        old, recent = self.cache.thumbnails(self.sources, 500)
+        os.utime(old, (time.time() - 3600, time.time() - 3600))
+        self.assertEqual(self.cache.evict(limit=os.path.getsize(recent)), 1)
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(recent))
+        self.assertEqual(self.cache.evict(limit=0, keep={recent}), 0)
+
+
+class _FakePdfWriter:
+    def __init__(self):
+        self.parts = []
+
+    def append(self, path, outline_item=None):
+        with open(path, 'rb') as f:
+            self.parts.append(f'[{outline_item}]'.encode() + f.read())
+
+    def write(self, f):
+        f.write(b''.join(self.parts))
+
+
+class BatchExportTest(TestCase):
+    def setUp(self):
+        from .utils import batch_export
+        self.batch = batch_export
+        User = get_user_model()
+        self.user = User.objects.create_user(username='manager', email='m@example.com', password='testpass123')
+        other = User.objects.create_user(username='other', email='o@example.com', password='testpass123')
+        self.meetings = []
+        for name, owner, summary in (("Standup", self.user, "<h3>Topics Discussed</h3><ul><li>Budget</li><li>Hiring</li></ul>"),
+                                     ("Retro", self.user, "<h3>Topics Discussed</h3><ul><li>Budget</li></ul>"),
+                                     ("Empty", self.user, None),
+                                     ("Theirs", other, "<h3>Action Items</h3><ul><li>Ship</li></ul>")):
+            meeting = Meeting.objects.create(user=owner, name=name, bot_name="Bot")
+            if summary:
+                Transcript.objects.create(meeting=meeting, text="t", summary=summary)
+            self.meetings.append(meeting)
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, True)
+        media = self.settings(MEDIA_ROOT=tmp)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.embedded, self.rendered = [], []
+
+        def fake_embed(model, texts):
+            self.embedded.append((model, list(texts)))
+            return np.ones((len(texts), 2), dtype=np.float32)
+
+        def fake_html(meeting, transcript, text_embeddings=None):
+            self.rendered.append((meeting.name, sorted(text_embeddings)))
+            return f"<h1>{meeting.name}</h1>"
+
+        for patcher in (mock.patch.object(batch_export.model_server, 'embed', side_effect=fake_embed),
+                        mock.patch.object(batch_export, 'summary_html', side_effect=fake_html)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _zip(self, chunks):
+        import zipfile
+        return zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+    def test_batch_shares_matching_and_renders_in_a_pool(self):
+        mine = self.batch.meetings_for_export(self.user, start=timezone.localdate())
+        self.assertEqual([m.name for m in mine], ["Standup", "Retro", "Empty"])
+        archive = self._zip(self.batch.zip_stream(self.batch.export_pdfs(mine, workers=2)))
+        self.assertEqual(self.embedded, [('clip-text', ['Budget', 'Hiring'])])
+        self.assertEqual(sorted(name for name, _ in self.rendered), ["Retro", "Standup"])
+        names = sorted(archive.namelist())
+        self.assertEqual(len(names), 3)
+        self.assertIn('errors.txt', names)
+        self.assertIn('No summary', archive.read('errors.txt').decode())
+        pdf = [n for n in names if n.endswith(f'meeting_{self.meetings[0].pk}.pdf')][0]
+        self.assertTrue(archive.read(pdf).startswith(b'%PDF'))
+
+        # second pack: everything is still fresh
+        self.embedded.clear()
+        self.rendered.clear()
+        results = list(self.batch.export_pdfs(mine))
+        self.assertEqual(self.embedded, [])
+        self.assertEqual(self.rendered, [])
+        self.assertEqual(sum(path is not None for _, path, _ in results), 2)
+
+        with mock.patch.object(self.batch, 'PdfWriter', _FakePdfWriter):
+            path, errors = self.batch.merged_pdf(self.batch.export_pdfs(mine))
+        with open(path, 'rb') as f:
+            self.assertTrue(f.read().startswith(b'[Standup]%PDF'))
+        self.assertEqual([m.name for m, _ in errors], ["Empty"])
+
+    def test_batch_waits_for_a_download_building_the_same_pdf(self):
+        from .utils import export_pdf
+        meeting = self.meetings[0]
+        out_path = export_pdf.summary_pdf_path(meeting.pk)
+        fingerprint = export_pdf.pdf_fingerprint(meeting, meeting.transcripts.get())
+        locked, built = threading.Event(), []
+
+        def download():
+            with export_pdf._build_lock(meeting.pk, out_path):
+                locked.set()
+                time.sleep(0.3)
+                with open(out_path, 'wb') as f:
+                    f.write(b'%PDF-download')
+                export_pdf._write_fingerprint(out_path, fingerprint)
+                built.append(time.time())
+
+        thread = threading.Thread(target=download)
+        thread.start()
+        locked.wait()
+        results = list(self.batch.export_pdfs([meeting]))
+        finished = time.time()
+        thread.join()
+        self.assertEqual(results, [(meeting, out_path, None)])
+        self.assertLessEqual(built[0], finished)
+        self.assertEqual(self.rendered, [])  # reused the download's build
+
+    def test_each_build_lock_is_released_when_its_meeting_is_done(self):
+        from .utils import export_pdf
+        standup, retro = self.meetings[:2]
+        results = self.batch.export_pdfs([standup, retro], workers=2)
+        first, path, error = next(results)
+        self.assertIsNone(error)
+        second = retro if first == standup else standup
+
+        def locker(meeting):
+            acquired = threading.Event()
+
+            def take():
+                with export_pdf._build_lock(meeting.pk, export_pdf.summary_pdf_path(meeting.pk)):
+                    acquired.set()
+            threading.Thread(target=take, daemon=True).start()
+            return acquired
+
+        # the batch is suspended after handing on `first`: only `second` is still locked
+        self.assertTrue(locker(first).wait(5))
+        second_acquired = locker(second)
+        self.assertFalse(second_acquired.wait(0.3))
+        self.assertEqual([m for m, _, _ in results], [second])
+        self.assertTrue(second_acquired.wait(5))
+
+    def test_packs_are_evicted_least_recently_used(self):
+        mine = self.meetings[:2]
+        os.makedirs(self.batch.pack_dir())
+        old = os.path.join(self.batch.pack_dir(), 'pack_old.pdf')
+        with open(old, 'wb') as f:
+            f.write(b'%PDF-old')
+        with mock.patch.object(self.batch, 'PdfWriter', _FakePdfWriter), \
+                self.settings(PDF_PACK_CACHE_MAX_MB=0):
+            path, _ = self.batch.merged_pdf(self.batch.export_pdfs(mine))
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(path))
+
+    def test_endpoint(self):
+        self.client.login(username='manager', password='testpass123')
+        url = reverse('export_summary_pdfs')
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'from': 'yesterday'}).status_code, 400)
+        theirs = self.meetings[3].pk
+        self.assertEqual(self.client.get(url, {'ids': str(theirs)}).status_code, 404)
+
+        with mock.patch.object(self.batch, 'export_workers', return_value=1):
+            response = self.client.get(url, {'ids': f'{self.meetings[0].pk},{theirs}'})
+            self.assertEqual(response['Content-Type'], 'application/zip')
+            archive = self._zip(response.streaming_content)
+        self.assertEqual(archive.namelist(), [self.batch.archive_name(self.meetings[0])])
+
+        with mock.patch.object(self.batch, 'PdfWriter', None):
+            response = self.client.get(url, {'ids': str(self.meetings[0].pk), 'format': 'merged'})
+        self.assertEqual(response.status_code, 400)
+
+
+SAMPLE_SUMMARY_HTML = """
+<h3>📌 Topics Discussed</h3>
+<ul><li>Q3 budget</li><li>Hiring plan</li></ul>
+<h3>✅ Decisions Made</h3>
+<p>Freeze travel spend</p>
+<h3>📝 Action Items</h3>
+<ul><li>Rahim drafts the offer letters</li></ul>
+<h3>⏳ Deadlines / Next Steps</h3>
+<ul><li>Offers out by Friday</li></ul>
+<h3>🧠 Overall Summary</h3>
+<p>Budget is tight; hiring goes ahead.</p>
+"""
+
+
+class SummaryStructureTest(TestCase):
+    def setUp(self):
+        from .utils import summary_structure
+        self.structure = summary_structure
+        self.user = get_user_model().objects.create_user(username='sum', email='s@example.com', password='testpass123')
+        self.meeting = Meeting.objects.create(user=self.user, name="Budget", bot_name="Bot")
+
+    def test_parse_summary_html(self):
+        self.assertEqual(self.structure.parse_summary_html(SAMPLE_SUMMARY_HTML), {
+            'topics': ['Q3 budget', 'Hiring plan'],
+            'decisions': ['Freeze travel spend'],
+            'actions': ['Rahim drafts the offer letters'],
+            'deadlines': ['Offers out by Friday'],
+            'overall': 'Budget is tight; hiring goes ahead.',
+        })
+        empty = self.structure.parse_summary_html(None)
+        self.assertEqual(empty, {'topics': [], 'decisions': [], 'actions': [], 'deadlines': [], 'overall': ''})
+
+    def test_legacy_rows_are_parsed_once(self):
+        t = Transcript.objects.create(meeting=self.meeting, text="t", summary=SAMPLE_SUMMARY_HTML)
+        self.assertIsNone(t.summary_data)
+        with mock.patch.object(self.structure, 'parse_summary_html', wraps=self.structure.parse_summary_html) as parse:
+            first = self.structure.structured_summary(Transcript.objects.get(pk=t.pk))
+            again = self.structure.structured_summary(Transcript.objects.get(pk=t.pk))
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(first, again)
+        self.assertEqual(first['actions'], ['Rahim drafts the offer letters'])
+        stored = Transcript.objects.get(pk=t.pk)
+        self.assertIn('Offers out by Friday', stored.summary_text)
+        self.assertNotIn('<li>', stored.summary_text)
+
+    def test_summarize_view_stores_fields_and_speaks_plain_text(self):
+        t = Transcript.objects.create(meeting=self.meeting, text="t", translated_text="we talked budget")
+        response_json = {"choices": [{"message": {"content": SAMPLE_SUMMARY_HTML}}]}
+        spoken = []
+
+        def fake_tts(text, lang, file_field, instance, filename):
+            spoken.append(text)
+            file_field.name = f"tts/{filename}"
+
+        self.client.login(username='sum', password='testpass123')
+        with mock.patch('create_meeting_app.views.requests.post') as post, \
+                mock.patch('create_meeting_app.views.generate_tts_and_save', side_effect=fake_tts):
+            post.return_value.json.return_value = response_json
+            response = self.client.post(reverse('summarize_transcript', args=[t.pk]))
+        self.assertTrue(response.json()['success'])
+        t.refresh_from_db()
+        self.assertEqual(t.summary_data['topics'], ['Q3 budget', 'Hiring plan'])
+        self.assertEqual(spoken, [t.summary_text])
+        self.assertNotIn('<h3>', spoken[0])
+
+    def test_search_matches_plain_text(self):
+        t = Transcript.objects.create(meeting=self.meeting, text="t")
+        self.structure.store_summary(t, SAMPLE_SUMMARY_HTML)
+        Transcript.objects.create(meeting=self.meeting, text="other")
+        self.assertEqual(list(Transcript.objects.filter(summary_text__icontains='offer letters')), [t])
+        self.assertFalse(Transcript.objects.filter(summary_text__icontains='<li>').exists())
@@ -1,18 +1,14 @@
-import os
 from avro import parse
-import fasttext  # Added missing import
 
-# 1) Point to the fastText lid model
-MODEL_PATH = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '..', '..', 'lid.176.bin')
-)
-lang_model = fasttext.load_model(MODEL_PATH)
+from create_meeting_app import model_server
+
+# fastText lid.176 runs in the shared model server (see model_server.py)
 
 def is_bangla_word(token: str) -> bool:
     """
     Returns True if fastText predicts this token is Bangla.
     """
-    label = lang_model.predict(token.lower(), k=1)[0][0]  # e.g. "__label__bn"
+    label, _ = model_server.classify([token.lower()])[0]  # e.g. "__label__bn"
     return label == "__label__bn"
 
 def banglish_to_bangla(text: str) -> str:
@@ -21,9 +17,11 @@ def banglish_to_bangla(text: str) -> str:
     leaves English tokens unchanged.
     """
     tokens = text.split()
+    # one round trip for the whole text instead of one predict per token
+    labels = model_server.classify([tok.lower() for tok in tokens])
     out = []
-    for tok in tokens:
-        if is_bangla_word(tok):
+    for tok, (label, _) in zip(tokens, labels):
+        if label == "__label__bn":
             try:
                 bn = parse(tok)  # Uses Avro phonetics from avro.py
                 out.append(bn)
@@ -0,0 +1,225 @@
+# create_meeting_app/utils/batch_export.py
+#
+# Summary PDFs for many meetings at once (monthly packs). Matching stays in
+# this process and is shared by the whole batch: the summary points of all
+# meetings go to CLIP in one request, and screenshot embeddings come from
+# the stored columns. The WeasyPrint renders are CPU-bound and run on a
+# process pool. Output files are the same cached PDFs
+# export_meeting_summary_pdf serves, built under the same per-meeting lock,
+# so a meeting whose PDF is still fresh costs nothing.
+
+import hashlib
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+
+import django
+from django.conf import settings
+
+from create_meeting_app import model_server
+from create_meeting_app.models import Meeting
+from create_meeting_app.utils.export_pdf import (
+    _build_lock, _fingerprint_path, _is_fresh, _latest_summary_transcript, _write_fingerprint, pdf_fingerprint,
+    pdf_metadata, summary_html, summary_pdf_path, summary_sentences, write_pdf,
+)
+from create_meeting_app.utils.summary_structure import structured_summary
+from create_meeting_app.utils.thumbnail_cache import evict_lru
+
+try:
+    from pypdf import PdfWriter  # only needed for merged packs
+except ImportError:
+    PdfWriter = None
+
+
+def export_workers():
+    return getattr(settings, "PDF_EXPORT_WORKERS", 0) or os.cpu_count() or 1
+
+
+def pack_dir():
+    return os.path.join(settings.MEDIA_ROOT, "summaries", "packs")
+
+
+def pack_max_bytes():
+    return getattr(settings, "PDF_PACK_CACHE_MAX_MB", 1024) * 1024 * 1024
+
+
+def meetings_for_export(user=None, ids=None, start=None, end=None):
+    """Meetings in a pack: staff see everyone's, other users only their own."""
+    meetings = Meeting.objects.select_related("user")
+    if user is not None and not user.is_staff:
+        meetings = meetings.filter(user=user)
+    if ids:
+        meetings = meetings.filter(pk__in=ids)
+    if start:
+        meetings = meetings.filter(created_at__date__gte=start)
+    if end:
+        meetings = meetings.filter(created_at__date__lte=end)
+    return meetings.order_by("created_at", "pk")
+
+
+def export_pdfs(meetings, workers=None):
+    """
+    Yields (meeting, path, error) for every meeting as its PDF becomes
+    available: still-fresh PDFs straight away, rebuilt ones as their render
+    finishes. `path` is None when `error` says why there is no PDF.
+    """
+    pending = []
+    for meeting in meetings:
+        try:
+            transcript = _latest_summary_transcript(meeting)
+        except ValueError as e:
+            yield meeting, None, str(e)
+            continue
+        out_path = summary_pdf_path(meeting.pk)
+        fingerprint = pdf_fingerprint(meeting, transcript)
+        if _is_fresh(out_path, fingerprint):
+            yield meeting, out_path, None
+        else:
+            pending.append((meeting, transcript, out_path, fingerprint))
+    if not pending:
+        return
+
+    # Hold each meeting's build lock (the one export_meeting_summary_pdf
+    # uses) until its own render is done, so a concurrent download waits for
+    # this build instead of racing it. Taken in id order: two batches can't
+    # deadlock. Each lock is released as soon as its meeting is finished.
+    building, ready = [], []
+    try:
+        for meeting, transcript, out_path, fingerprint in sorted(pending, key=lambda p: p[0].pk):
+            lock = ExitStack()
+            building.append((meeting, transcript, out_path, fingerprint, lock))
+            lock.enter_context(_build_lock(meeting.pk, out_path))
+            if _is_fresh(out_path, fingerprint):
+                building.pop()
+                lock.close()
+                ready.append((meeting, out_path, None))  # built while we waited
+        yield from _render(building, workers)
+        yield from ready  # after the renders, for the same reason as _render's failures
+    finally:
+        for *_, lock in building:
+            lock.close()
+
+
+def _render(pending, workers):
+    if not pending:
+        return
+    # one CLIP request for every summary point in the batch
+    sentences = list(dict.fromkeys(
+        s for _, transcript, _, _, _ in pending for s in summary_sentences(structured_summary(transcript))))
+    vectors = dict(zip(sentences, model_server.embed("clip-text", sentences))) if sentences else {}
+
+    jobs, failed = [], []
+    for meeting, transcript, out_path, fingerprint, lock in pending:
+        try:
+            jobs.append((meeting, out_path, fingerprint, lock, summary_html(meeting, transcript, vectors)))
+        except Exception as e:
+            lock.close()
+            failed.append((meeting, None, f"Error generating PDF: {e}"))
+    if jobs:
+        yield from _write_pdfs(jobs, workers)
+    # handed on last: yielding suspends us, and other meetings' locks are held until then
+    yield from failed
+
+
+def _write_pdfs(jobs, workers):
+    # spawn, not fork: this process may hold model-server sockets and threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers or export_workers(), len(jobs)),
+                             mp_context=context, initializer=django.setup) as pool:
+        futures = {pool.submit(write_pdf, html, out_path, **pdf_metadata(meeting)):
+                   (meeting, out_path, fingerprint, lock)
+                   for meeting, out_path, fingerprint, lock, html in jobs}
+        for future in as_completed(futures):
+            meeting, out_path, fingerprint, lock = futures[future]
+            with lock:  # released before the result is handed on
+                try:
+                    future.result()
+                except Exception as e:
+                    error = f"Error generating PDF: {e}"
+                else:
+                    error = None
+                    _write_fingerprint(out_path, fingerprint)
+            yield meeting, None if error else out_path, error
+
+
+def archive_name(meeting):
+    return f"{meeting.created_at:%Y-%m-%d}_meeting_{meeting.pk}.pdf"
+
+
+class _Chunks:
+    """Write-only, unseekable file object; zipfile streams into it."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def zip_stream(results):
+    """
+    ZIP archive of export_pdfs() results as a byte-chunk generator: each PDF
+    is sent as soon as it is ready. PDFs are already compressed, so entries
+    are stored; meetings without a PDF are listed in errors.txt.
+    """
+    sink = _Chunks()
+    errors = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for meeting, path, error in results:
+            if path is None:
+                errors.append(f"{meeting.pk}\t{meeting.name}\t{error}")
+                continue
+            archive.write(path, archive_name(meeting))
+            yield sink.take()
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors) + "\n")
+    yield sink.take()
+
+
+def merged_pdf(results):
+    """
+    One PDF of every exported meeting in order, cached under
+    MEDIA_ROOT/summaries/packs by the content of its parts; the least
+    recently used packs are evicted beyond PDF_PACK_CACHE_MAX_MB. Returns
+    (path, [(meeting, error), ...]). Needs pypdf.
+    """
+    if PdfWriter is None:
+        raise ValueError("Merged packs need pypdf (pip install pypdf); use the ZIP format instead.")
+    done, errors = [], []
+    for meeting, path, error in results:
+        if path is None:
+            errors.append((meeting, error))
+        else:
+            done.append((meeting, path))
+    if not done:
+        raise ValueError("None of the selected meetings has a summary to export.")
+    done.sort(key=lambda item: (item[0].created_at, item[0].pk))
+
+    key = hashlib.sha256()
+    for meeting, path in done:
+        with open(_fingerprint_path(path), "rb") as f:
+            key.update(f"{meeting.pk}:".encode() + f.read())
+    out_path = os.path.join(pack_dir(), f"pack_{key.hexdigest()[:32]}.pdf")
+    if os.path.exists(out_path):
+        os.utime(out_path)  # LRU: mark as recently used
+    else:
+        os.makedirs(pack_dir(), exist_ok=True)
+        writer = PdfWriter()
+        for meeting, path in done:
+            writer.append(path, outline_item=meeting.name)
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            writer.write(f)
+        os.replace(tmp_path, out_path)
+    evict_lru(pack_dir(), pack_max_bytes(), keep={out_path})
+    return out_path, errors
@@ -0,0 +1,122 @@
+# create_meeting_app/utils/batch_writer.py
+import queue
+import threading
+import time
+
+from django.db import OperationalError, close_old_connections, connections, transaction
+
+_STOP = object()
+
+
+class BatchWriter:
+    """
+    Collects unsaved model instances from any thread and writes them with
+    bulk_create from one background thread, in batches of up to `batch_size`
+    or every `flush_interval` seconds, whichever comes first.
+
+    bulk_create does not send post_save, so pass `on_flush(batch)` for any
+    follow-up work such as bumping page cache versions.
+    """
+
+    def __init__(self, model, batch_size=50, flush_interval=2.0, on_flush=None, retries=5):
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.retries = retries
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"{model.__name__}-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, obj):
+        self._queue.put(obj)
+
+    def flush(self):
+        """Block until everything queued so far has been written (or the writer died)."""
+        done = threading.Event()
+        self._queue.put(done)
+        while not done.wait(0.5):
+            if not self._thread.is_alive():
+                self._report_lost()
+                return
+
+    def close(self):
+        """Write whatever is left and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._report_lost()
+
+    def _report_lost(self):
+        lost = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not _STOP:
+                lost += 1
+        if lost:
+            print(f"⚠️ {self.model.__name__} writer is not running; {lost} queued rows were not saved")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, batch):
+        for attempt in range(self.retries):
+            try:
+                with transaction.atomic():
+                    self.model.objects.bulk_create(batch)
+                break
+            except OperationalError as e:
+                # busy_timeout already waited; back off a little more and retry
+                if attempt == self.retries - 1:
+                    print(f"⚠️ Dropping {len(batch)} {self.model.__name__} rows: {e}")
+                    return
+                time.sleep(0.2 * (attempt + 1))
+            except Exception as e:
+                # e.g. IntegrityError when the parent row was deleted meanwhile
+                print(f"⚠️ Dropping {len(batch)} {self.model.__name__} rows: {e}")
+                return
+        if self.on_flush:
+            try:
+                self.on_flush(batch)
+            except Exception as e:
+                print(f"⚠️ on_flush failed: {e}")
+
+    def _run(self):
+        batch, deadline = [], None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if item is not None and item is not _STOP and not isinstance(item, threading.Event):
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+
+                due = deadline is not None and time.monotonic() >= deadline
+                if batch and (item is None or due or len(batch) >= self.batch_size
+                              or item is _STOP or isinstance(item, threading.Event)):
+                    try:
+                        close_old_connections()
+                        self._write(batch)
+                    except Exception as e:
+                        print(f"⚠️ Dropping {len(batch)} {self.model.__name__} rows: {e}")
+                    batch, deadline = [], None
+
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is _STOP:
+                    return
+        finally:
+            # each thread owns its own DB connections
+            connections.close_all()
@@ -1,38 +1,46 @@
 import os
 import io
+import hashlib
+import threading
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
-from django.template.loader import render_to_string
+from django.template.loader import get_template, render_to_string
 from weasyprint import HTML, CSS
 from create_meeting_app.utils.match_clip_embeddings import match_summary_to_screenshots
+from create_meeting_app.utils.ocr import OCR_AVAILABLE
+from create_meeting_app.utils.screenshot_dedup import reduction_ratio, representatives
+from create_meeting_app.utils.screenshot_embeddings import load_embeddings, load_ocr_embeddings
+from create_meeting_app.utils.summary_structure import structured_summary
+from create_meeting_app.utils.thumbnail_cache import THUMB_DIR_NAME, thumbnails  # noqa: F401
 from create_meeting_app.models import Meeting
 from django.conf import settings
 from django.utils import timezone
-from bs4 import BeautifulSoup
-from PIL import Image
+import numpy as np
+
+try:
+    import fcntl  # cross-process build lock; POSIX only
+except ImportError:
+    fcntl = None
 
 # optional: small thumbnails to reduce PDF size (set to False to keep original images)
 GENERATE_THUMBNAILS = True
 THUMB_MAX_WIDTH = 1000  # pixels
-THUMB_DIR_NAME = "summary_thumbs"
 MATCH_CONFIDENCE_THRESHOLD = 0.35  # tune this (0..1)
 
-def _get_section_items(soup, heading_text):
-    """
-    Find <h3> that contains heading_text, then read the next <ul> or next <p>.
-    Returns list[str].
-    """
-    h = soup.find(lambda tag: tag.name == "h3" and heading_text.lower() in tag.get_text(strip=True).lower())
-    if not h:
-        return []
-    # prefer a following UL
-    ul = h.find_next_sibling(lambda t: t.name in ("ul", "ol"))
-    if ul:
-        return [li.get_text(strip=True) for li in ul.find_all("li")]
-    # fallback to next paragraph
-    p = h.find_next_sibling(lambda t: t.name == "p")
-    if p:
-        return [p.get_text(strip=True)]
-    return []
+# CSS (same as before, but ensure images scale)
+PDF_CSS = '''
+            @page { margin: 2cm; }
+            body { font-family: 'Helvetica', 'Arial', sans-serif; color: #1E3A8A; }
+            h1 { color: #1E40AF; font-size: 24pt; margin-bottom: 10pt; }
+            h2 { color: #1E40AF; font-size: 18pt; border-bottom: 2px solid #BFDBFE; padding-bottom: 5pt; margin-top: 20pt; }
+            p, li { font-size: 12pt; line-height: 1.5; color: #1F2937; }
+            .point { margin-bottom: 15pt; page-break-inside: avoid; }
+            .point img { max-width: 100%; height: auto; border: 1px solid #E5E7EB; border-radius: 4px; margin-top: 10pt; }
+            .no-screenshot { color: #6B7280; font-style: italic; }
+            .metadata { font-size: 10pt; color: #6B7280; }
+            .score { font-size: 10pt; color: #374151; opacity: 0.8; }
+        '''
 
 def _resolve_screenshot_path(s):
     """
@@ -62,169 +70,249 @@ def _resolve_screenshot_path(s):
         return image_path
     return None
 
-def _make_thumbnail(src_path, dest_dir, max_width=THUMB_MAX_WIDTH):
-    os.makedirs(dest_dir, exist_ok=True)
-    name = Path(src_path).stem + Path(src_path).suffix
-    dest = os.path.join(dest_dir, name)
-    try:
-        with Image.open(src_path) as im:
-            if im.width <= max_width:
-                # copy original if small enough
-                im.save(dest, optimize=True)
-            else:
-                ratio = max_width / float(im.width)
-                new_h = int(im.height * ratio)
-                im = im.resize((max_width, new_h), Image.LANCZOS)
-                im.save(dest, optimize=True)
-        return dest
-    except Exception as e:
-        print(f"⚠️ Thumb error for {src_path}: {e}")
-        return src_path  # fallback to original
+# ---------- cached export ----------
+# A built PDF is reused until something it was built from changes: the
+# latest transcript's summary and segments, the meeting's screenshots, its
+# author metadata, the template/CSS, OCR availability or the matching settings. The fingerprint of those lives next to the PDF
+# in meeting_<id>.pdf.fingerprint. Concurrent downloads of the same meeting
+# wait on one build (a thread lock plus a file lock across processes).
+
+PDF_EXPORT_VERSION = 1  # bump when the rendering code changes
+PDF_TEMPLATE = 'pdf_templates/meeting_summary.html'
+
+# an entry lives only while some request holds or waits on its lock
+_build_locks = weakref.WeakValueDictionary()
+_build_locks_guard = threading.Lock()
+
+def summary_pdf_path(meeting_id):
+    return os.path.join(settings.MEDIA_ROOT, 'summaries', f"meeting_{meeting_id}.pdf")
+
+def _latest_summary_transcript(meeting):
+    # get the most recent transcript (changed from first to last)
+    transcript = meeting.transcripts.order_by('created').last()
+    if not transcript or not getattr(transcript, "summary", None):
+        raise ValueError("No summary available to export.")
+    return transcript
 
-def export_meeting_summary_pdf(meeting_id):
+def pdf_fingerprint(meeting, transcript):
+    h = hashlib.sha256()
+    template = get_template(PDF_TEMPLATE).origin.name
+    with open(template, 'rb') as f:
+        h.update(f.read())
+    h.update(PDF_CSS.encode())
+    h.update(repr((PDF_EXPORT_VERSION, GENERATE_THUMBNAILS, THUMB_MAX_WIDTH, MATCH_CONFIDENCE_THRESHOLD,
+                   getattr(settings, 'CLIP_BACKEND', 'torch'),
+                   getattr(settings, 'SCREENSHOT_DUPLICATE_DISTANCE', 6))).encode())
+    h.update(repr((meeting.name, transcript.pk, transcript.summary, OCR_AVAILABLE, pdf_metadata(meeting))).encode())
+    # segment start times become the summary points' timestamps
+    for segment in transcript.segments.order_by('start_time', 'pk').values_list('pk', 'start_time'):
+        h.update(repr(segment).encode())
+    for shot in meeting.screenshots.order_by('created', 'pk').values_list('pk', 'image_path'):
+        h.update(repr(shot).encode())
+    return h.hexdigest()
+
+def _fingerprint_path(out_path):
+    return out_path + '.fingerprint'
+
+def _is_fresh(out_path, fingerprint):
     try:
-        meeting = Meeting.objects.get(pk=meeting_id)
-        # get the most recent transcript (changed from first to last)
-        transcript = meeting.transcripts.order_by('created').last()
-
-        if not transcript or not getattr(transcript, "summary", None):
-            raise ValueError("No summary available to export.")
-
-        # Parse summary HTML using robust helper
-        soup = BeautifulSoup(transcript.summary, 'html.parser')
-        summary_data = {
-            'topics': _get_section_items(soup, "Topics Discussed"),
-            'decisions': _get_section_items(soup, "Decisions Made"),
-            'actions': _get_section_items(soup, "Action Items"),
-            'deadlines': _get_section_items(soup, "Deadlines") or _get_section_items(soup, "Next Steps"),
-            'overall': (soup.find(lambda tag: tag.name == "h3" and "Overall Summary" in tag.get_text())
-                        .find_next_sibling("p").get_text(strip=True)
-                        if soup.find(lambda tag: tag.name == "h3" and "Overall Summary" in tag.get_text())
-                        and soup.find(lambda tag: tag.name == "h3" and "Overall Summary" in tag.get_text()).find_next_sibling("p")
-                        else '')
-        }
-
-        # Get screenshots and prepare (abs) paths and timestamps (seconds since meeting start)
-        screenshots = meeting.screenshots.order_by('created')
-        screenshot_paths = []
-        screenshot_seconds = []
-        for s in screenshots:
-            full_path = _resolve_screenshot_path(s)
-            if not full_path:
-                print(f"Warning: Screenshot record {s} has no accessible file.")
-                continue
-
-            # optional: create thumbnails to reduce PDF size
-            if GENERATE_THUMBNAILS:
-                thumb_dir = os.path.join(settings.MEDIA_ROOT, THUMB_DIR_NAME)
-                try:
-                    full_path_for_pdf = _make_thumbnail(full_path, thumb_dir)
-                except Exception:
-                    full_path_for_pdf = full_path
-            else:
-                full_path_for_pdf = full_path
-
-            screenshot_paths.append(full_path_for_pdf)
-
-            # compute seconds relative to meeting.created_at when possible
+        with open(_fingerprint_path(out_path)) as f:
+            return f.read().strip() == fingerprint and os.path.exists(out_path)
+    except OSError:
+        return False
+
+def _write_fingerprint(out_path, fingerprint):
+    with open(_fingerprint_path(out_path), 'w') as f:
+        f.write(fingerprint)
+
+@contextmanager
+def _build_lock(meeting_id, out_path):
+    with _build_locks_guard:
+        lock = _build_locks.get(meeting_id)
+        if lock is None:
+            lock = _build_locks[meeting_id] = threading.Lock()
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path + '.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
             try:
-                delta = (s.created - meeting.created_at).total_seconds()
-            except Exception:
-                # fallback: seconds since epoch of screenshot (not ideal)
-                try:
-                    delta = s.created.timestamp()
-                except Exception:
-                    delta = None
-            screenshot_seconds.append(delta)
-
-        # Build sentence list to match (topics + actions are probably the most visual)
-        summary_sentences = summary_data['topics'] + summary_data['actions']
-        # If none, try decisions or overall fallback
-        if not summary_sentences:
-            summary_sentences = summary_data['decisions'] or ([summary_data['overall']] if summary_data['overall'] else [])
-
-        # Convert segment timestamps (if available) to seconds
-        # If you have TranscriptSegments with start_time (timedelta), you can build summary_seconds mapping.
-        # For now, we'll attempt to use transcript.segments if available and align by index.
-        summary_seconds = None
-        try:
-            # naive: if transcript has named segments, map sentences to segment start times
-            segs = list(transcript.segments.order_by('start_time'))
-            if segs and len(segs) >= len(summary_sentences):
-                summary_seconds = [s.start_time.total_seconds() for s in segs[:len(summary_sentences)]]
-            else:
-                # fallback: use None so matcher won't use time
-                summary_seconds = None
-        except Exception:
-            summary_seconds = None
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
 
-        # Match screenshots to summary points: matcher returns {sentence: [(path, score), ...]}
-        matches = match_summary_to_screenshots(
-            summary_sentences,
-            screenshot_paths,
-            summary_timestamps=summary_seconds,
-            screenshot_timestamps=screenshot_seconds,
-            top_k=3,
-            use_ocr=True
-        )
+def export_meeting_summary_pdf(meeting_id, force=False):
+    """
+    Path of the meeting's summary PDF. The existing file is served while its
+    fingerprint still matches; otherwise it is rebuilt, once, however many
+    requests are waiting for it.
+    """
+    try:
+        meeting = Meeting.objects.select_related('user').get(pk=meeting_id)
+    except Meeting.DoesNotExist:
+        raise ValueError("Meeting not found.")
+    transcript = _latest_summary_transcript(meeting)
+    out_path = summary_pdf_path(meeting_id)
+    fingerprint = pdf_fingerprint(meeting, transcript)
+    if not force and _is_fresh(out_path, fingerprint):
+        return out_path
+    with _build_lock(meeting_id, out_path):
+        if not force and _is_fresh(out_path, fingerprint):
+            return out_path  # built by the request we were waiting on
+        _render_summary_pdf(meeting, transcript, out_path)
+        _write_fingerprint(out_path, fingerprint)
+    return out_path
 
-        # Prepare pdf_data with best match above threshold
-        pdf_data = []
-        for section, items in [
-            ('Topics Discussed', summary_data['topics']),
-            ('Action Items', summary_data['actions'])
-        ]:
-            for item in items:
-                entry = {'section': section, 'point': item, 'screenshot': None, 'score': 0.0}
-                candidates = matches.get(item) or []
-                # candidates is list of tuples (path, score)
-                if candidates:
-                    # pick highest scoring candidate above threshold
-                    best = max(candidates, key=lambda x: x[1])
-                    if best[1] >= MATCH_CONFIDENCE_THRESHOLD and best[0] and os.path.exists(best[0]):
-                        # weasyprint wants file:// URIs or accessible path; use Path().as_uri()
-                        entry['screenshot'] = Path(best[0]).as_uri()
-                        entry['score'] = float(best[1])
-                pdf_data.append(entry)
-
-        # Render HTML template
-        html = render_to_string('pdf_templates/meeting_summary.html', {
-            'meeting': meeting,
-            'pdf_data': pdf_data,
-            'summary_data': summary_data,
-            'created_date': timezone.localtime(meeting.created_at).strftime('%B %d, %Y %I:%M %p')
-        })
-
-        # CSS (same as before, but ensure images scale)
-        css = CSS(string='''
-            @page { margin: 2cm; }
-            body { font-family: 'Helvetica', 'Arial', sans-serif; color: #1E3A8A; }
-            h1 { color: #1E40AF; font-size: 24pt; margin-bottom: 10pt; }
-            h2 { color: #1E40AF; font-size: 18pt; border-bottom: 2px solid #BFDBFE; padding-bottom: 5pt; margin-top: 20pt; }
-            p, li { font-size: 12pt; line-height: 1.5; color: #1F2937; }
-            .point { margin-bottom: 15pt; page-break-inside: avoid; }
-            .point img { max-width: 100%; height: auto; border: 1px solid #E5E7EB; border-radius: 4px; margin-top: 10pt; }
-            .no-screenshot { color: #6B7280; font-style: italic; }
-            .metadata { font-size: 10pt; color: #6B7280; }
-            .score { font-size: 10pt; color: #374151; opacity: 0.8; }
-        ''')
+def _render_summary_pdf(meeting, transcript, out_path):
+    try:
+        write_pdf(summary_html(meeting, transcript), out_path, **pdf_metadata(meeting))
+        return out_path
+    except Exception as e:
+        raise ValueError(f"Error generating PDF: {str(e)}")
+
+def summary_sentences(summary_data):
+    # Build sentence list to match (topics + actions are probably the most visual)
+    sentences = summary_data['topics'] + summary_data['actions']
+    # If none, try decisions or overall fallback
+    if not sentences:
+        sentences = summary_data['decisions'] or ([summary_data['overall']] if summary_data['overall'] else [])
+    return sentences
 
-        # Write PDF with metadata
-        out_dir = os.path.join(settings.MEDIA_ROOT, 'summaries')
-        os.makedirs(out_dir, exist_ok=True)
-        out_path = os.path.join(out_dir, f"meeting_{meeting_id}.pdf")
+def pdf_metadata(meeting):
+    return {
+        'document_title': f"Meeting Summary: {meeting.name}",
+        'author': meeting.user.get_full_name() or meeting.user.username,
+    }
 
+def write_pdf(html, out_path, document_title=None, author=None):
+    """
+    WeasyPrint render of `html` to `out_path` (to a temp file first: downloads
+    in flight keep reading the previous version until the new one is complete).
+    Top-level and ORM-free so batch exports can run it in a process pool.
+    """
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
         HTML(string=html).write_pdf(
-            out_path,
-            stylesheets=[css],
-            document_title=f"Meeting Summary: {meeting.name}",
-            author=meeting.user.get_full_name() or meeting.user.username,
+            tmp_path,
+            stylesheets=[CSS(string=PDF_CSS)],
+            document_title=document_title,
+            author=author,
             creator="Meeting App"
         )
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return out_path
 
-        return out_path
+def summary_html(meeting, transcript, text_embeddings=None):
+    """
+    Matched, rendered HTML for the meeting's summary PDF. `text_embeddings`
+    ({sentence: CLIP text vector}) lets a batch export embed the summary
+    points of many meetings in one call.
+    """
+    summary_data = structured_summary(transcript)
 
-    except Meeting.DoesNotExist:
-        raise ValueError("Meeting not found.")
-    except Exception as e:
-        raise ValueError(f"Error generating PDF: {str(e)}")
+    # Get screenshots and prepare (abs) paths and timestamps (seconds since meeting start)
+    screenshots = []
+    files = []
+    for s in meeting.screenshots.order_by('created'):
+        full_path = _resolve_screenshot_path(s)
+        if not full_path:
+            print(f"Warning: Screenshot record {s} has no accessible file.")
+            continue
+        screenshots.append(s)
+        files.append(full_path)
+
+    # one screenshot per near-identical slide (perceptual hash groups)
+    kept, _groups = representatives(screenshots, files)
+    if screenshots:
+        print(f"🖼 {len(screenshots)} screenshots → {len(kept)} distinct "
+              f"({reduction_ratio(len(screenshots), len(kept)):.0%} fewer to match)")
+
+    screenshot_paths = []
+    screenshot_seconds = []
+    matched_shots = []   # screenshots with a file, and that file (for stored embeddings)
+    original_paths = []
+    kept_files = [files[i] for i in kept]
+    # optional: thumbnails to reduce PDF size (cached by content, see utils/thumbnail_cache.py)
+    pdf_files = thumbnails(kept_files, THUMB_MAX_WIDTH) if GENERATE_THUMBNAILS else kept_files
+    for i, full_path, full_path_for_pdf in zip(kept, kept_files, pdf_files):
+        s = screenshots[i]
+        screenshot_paths.append(full_path_for_pdf)
+        matched_shots.append(s)
+        original_paths.append(full_path)
+
+        # compute seconds relative to meeting.created_at when possible
+        try:
+            delta = (s.created - meeting.created_at).total_seconds()
+        except Exception:
+            # fallback: seconds since epoch of screenshot (not ideal)
+            try:
+                delta = s.created.timestamp()
+            except Exception:
+                delta = None
+        screenshot_seconds.append(delta)
+
+    sentences = summary_sentences(summary_data)
+
+    # Convert segment timestamps (if available) to seconds
+    # If you have TranscriptSegments with start_time (timedelta), you can build summary_seconds mapping.
+    # For now, we'll attempt to use transcript.segments if available and align by index.
+    summary_seconds = None
+    try:
+        # naive: if transcript has named segments, map sentences to segment start times
+        segs = list(transcript.segments.order_by('start_time'))
+        if segs and len(segs) >= len(sentences):
+            summary_seconds = [s.start_time.total_seconds() for s in segs[:len(sentences)]]
+        else:
+            # fallback: use None so matcher won't use time
+            summary_seconds = None
+    except Exception:
+        summary_seconds = None
+
+    # Match screenshots to summary points: matcher returns {sentence: [(path, score), ...]}
+    matches = match_summary_to_screenshots(
+        sentences,
+        screenshot_paths,
+        summary_timestamps=summary_seconds,
+        screenshot_timestamps=screenshot_seconds,
+        top_k=3,
+        use_ocr=True,
+        image_embeddings=load_embeddings(matched_shots, original_paths),
+        ocr_embeddings=load_ocr_embeddings(matched_shots, original_paths) if OCR_AVAILABLE else None,
+        text_embeddings=(np.stack([text_embeddings[s] for s in sentences])
+                         if text_embeddings is not None and sentences else None),
+    )
+
+    # Prepare pdf_data with best match above threshold
+    pdf_data = []
+    for section, items in [
+        ('Topics Discussed', summary_data['topics']),
+        ('Action Items', summary_data['actions'])
+    ]:
+        for item in items:
+            entry = {'section': section, 'point': item, 'screenshot': None, 'score': 0.0}
+            candidates = matches.get(item) or []
+            # candidates is list of tuples (path, score)
+            if candidates:
+                # pick highest scoring candidate above threshold
+                best = max(candidates, key=lambda x: x[1])
+                if best[1] >= MATCH_CONFIDENCE_THRESHOLD and best[0] and os.path.exists(best[0]):
+                    # weasyprint wants file:// URIs or accessible path; use Path().as_uri()
+                    entry['screenshot'] = Path(best[0]).as_uri()
+                    entry['score'] = float(best[1])
+            pdf_data.append(entry)
+
+    # Render HTML template
+    html = render_to_string('pdf_templates/meeting_summary.html', {
+        'meeting': meeting,
+        'pdf_data': pdf_data,
+        'summary_data': summary_data,
+        'created_date': timezone.localtime(meeting.created_at).strftime('%B %d, %Y %I:%M %p')
+    })
+
+    return html
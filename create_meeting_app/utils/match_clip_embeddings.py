@@ -1,64 +1,73 @@
 # create_meeting_app/utils/match_clip_embeddings.py
+#
+# torch and the CLIP weights are only loaded when a match is actually
+# computed (see utils/model_registry.py); importing this module is cheap.
+# match_summary_to_screenshots asks the shared model server for embeddings
+# and does the scoring in numpy; the _compute_* functions are what the
+# server (or the in-process fallback) runs, on the CLIP_BACKEND setting's
+# backend: fp32 torch, int8-quantized torch or ONNX Runtime.
 import numpy as np
-import torch
-import torch.nn.functional as F
-from transformers import CLIPProcessor, CLIPModel
+from django.conf import settings
 from PIL import Image
 from typing import List, Optional, Dict, Tuple
 
-# optional OCR
-try:
-    import pytesseract
-    OCR_AVAILABLE = True
-except Exception:
-    OCR_AVAILABLE = False
+from create_meeting_app.utils import model_registry
+from create_meeting_app.utils.model_registry import CLIP_MODEL  # noqa: F401  (kept for old imports)
 
-device = "cuda" if torch.cuda.is_available() else "cpu"
-
-# initialize model & processor once (keep name compatibility)
-CLIP_MODEL = "openai/clip-vit-base-patch32"
-_model = CLIPModel.from_pretrained(CLIP_MODEL).to(device)
-_processor = CLIPProcessor.from_pretrained(CLIP_MODEL)
+from create_meeting_app.utils.ocr import OCR_AVAILABLE, ocr_images  # noqa: F401  (optional OCR)
 
 def _batchify(lst, batch_size=16):
     for i in range(0, len(lst), batch_size):
         yield lst[i:i+batch_size]
 
-def _compute_text_embeddings(sentences: List[str], batch_size=32) -> torch.Tensor:
+# CLIP_BACKEND -> model registry entry (see settings.py)
+CLIP_BACKENDS = {"torch": "clip", "int8": "clip-int8", "onnx": "clip-onnx"}
+
+def clip_backend(backend: Optional[str] = None) -> str:
+    backend = backend or getattr(settings, "CLIP_BACKEND", "torch")
+    if backend not in CLIP_BACKENDS:
+        raise ValueError(f"Unknown CLIP_BACKEND {backend!r}; expected one of {', '.join(CLIP_BACKENDS)}")
+    return backend
+
+def _run_tower(tower: str, inputs, backend: str) -> np.ndarray:
+    """Run the text or image tower on processor output (numpy arrays)."""
+    model, _processor, device = model_registry.get(CLIP_BACKENDS[backend])
+    if backend == "onnx":
+        session = model[tower]
+        names = {i.name for i in session.get_inputs()}
+        return session.run(None, {k: v for k, v in inputs.items() if k in names})[0].astype(np.float32)
+    import torch
+    tensors = {k: torch.from_numpy(v).to(device) for k, v in inputs.items()}
+    features = model.get_text_features if tower == "text" else model.get_image_features
+    with torch.no_grad():
+        return features(**tensors).float().cpu().numpy()
+
+def _compute_text_embeddings(sentences: List[str], batch_size=32, backend: Optional[str] = None) -> np.ndarray:
+    backend = clip_backend(backend)
     if not sentences:
-        return torch.empty((0, _model.visual_projection.weight.shape[1]), device=device)
-    embeds = []
-    for batch in _batchify(sentences, batch_size):
-        inputs = _processor(text=batch, return_tensors="pt", padding=True, truncation=True).to(device)
-        with torch.no_grad():
-            emb = _model.get_text_features(**inputs).float()
-        embeds.append(emb)
-    return torch.cat(embeds, dim=0)
-
-def _compute_image_embeddings(image_paths: List[str], batch_size=8) -> torch.Tensor:
+        return np.empty((0, 0), dtype=np.float32)
+    _processor = model_registry.get(CLIP_BACKENDS[backend])[1]
+    return np.concatenate([
+        _run_tower("text", _processor(text=batch, return_tensors="np", padding=True, truncation=True), backend)
+        for batch in _batchify(sentences, batch_size)
+    ])
+
+def _compute_image_embeddings(image_paths: List[str], batch_size=8, backend: Optional[str] = None) -> np.ndarray:
+    backend = clip_backend(backend)
     if not image_paths:
-        return torch.empty((0, _model.visual_projection.weight.shape[1]), device=device)
+        return np.empty((0, 0), dtype=np.float32)
+    _processor = model_registry.get(CLIP_BACKENDS[backend])[1]
     embeds = []
     for batch in _batchify(image_paths, batch_size):
         imgs = [Image.open(p).convert("RGB") for p in batch]
-        inputs = _processor(images=imgs, return_tensors="pt", padding=True).to(device)
-        with torch.no_grad():
-            emb = _model.get_image_features(**inputs).float()
-        embeds.append(emb)
-    return torch.cat(embeds, dim=0)
+        embeds.append(_run_tower("image", _processor(images=imgs, return_tensors="np"), backend))
+    return np.concatenate(embeds)
+
+def _normalize(emb: np.ndarray) -> np.ndarray:
+    return emb / np.maximum(np.linalg.norm(emb, axis=-1, keepdims=True), 1e-12)
 
 def _extract_ocr_texts(paths: List[str]) -> List[str]:
-    if not OCR_AVAILABLE:
-        return [""] * len(paths)
-    texts = []
-    for p in paths:
-        try:
-            img = Image.open(p).convert("RGB")
-            txt = pytesseract.image_to_string(img).strip()
-            texts.append(txt)
-        except Exception:
-            texts.append("")
-    return texts
+    return ocr_images(paths)
 
 def _temporal_score_matrix(sent_ts: Optional[List[float]], shot_ts: Optional[List[float]], sigma_seconds: float = 7.0):
     if sent_ts is None or shot_ts is None:
@@ -68,6 +77,26 @@ def _temporal_score_matrix(sent_ts: Optional[List[float]], shot_ts: Optional[Lis
     diff = np.abs(s - sh)
     return np.exp(-(diff**2) / (2 * sigma_seconds**2))  # shape (n_sent, n_shot)
 
+def similarity_matrix(sentences: List[str], image_paths: List[str], backend: Optional[str] = None) -> np.ndarray:
+    """Cosine similarity (n_sent, n_img) between CLIP text and image embeddings."""
+    return _normalize(_compute_text_embeddings(sentences, backend=backend)) @ \
+        _normalize(_compute_image_embeddings(image_paths, backend=backend)).T
+
+def parity_report(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """
+    How far a backend's similarity matrix drifts from the fp32 one:
+    largest absolute score difference, and how often each sentence still
+    picks the same best screenshot.
+    """
+    if reference.shape != candidate.shape:
+        raise ValueError(f"shape mismatch: {reference.shape} vs {candidate.shape}")
+    if reference.size == 0:
+        return {"max_abs_diff": 0.0, "top1_agreement": 1.0}
+    return {
+        "max_abs_diff": float(np.abs(reference - candidate).max()),
+        "top1_agreement": float((reference.argmax(axis=1) == candidate.argmax(axis=1)).mean()),
+    }
+
 def match_summary_to_screenshots(
     summary_sentences: List[str],
     screenshot_paths: List[str],
@@ -78,12 +107,19 @@ def match_summary_to_screenshots(
     weight_visual: float = 0.6,
     weight_ocr_text: float = 0.25,
     weight_time: float = 0.15,
-    visual_batch_size: int = 8
+    visual_batch_size: int = 8,
+    image_embeddings: Optional[np.ndarray] = None,
+    ocr_embeddings: Optional[np.ndarray] = None,
+    text_embeddings: Optional[np.ndarray] = None,
 ) -> Dict[str, List[Tuple[str, float]]]:
     """
     Backwards-compatible matcher. Returns {sentence: [(path, score), ...]}.
     If timestamps aren't provided, time contribution is ignored.
+    Pass stored `image_embeddings` / `ocr_embeddings` (one row per path, see
+    utils/screenshot_embeddings.py) to skip encoding / OCR'ing the screenshots,
+    and `text_embeddings` (one row per sentence) if they were batched elsewhere.
     """
+    from create_meeting_app import model_server
 
     matches: Dict[str, List[Tuple[str, float]]] = {}
 
@@ -100,25 +136,34 @@ def match_summary_to_screenshots(
     weight_time /= wsum
 
     # compute embeddings
-    text_emb = _compute_text_embeddings(summary_sentences, batch_size=32)  # (n_sent, d)
-    image_emb = _compute_image_embeddings(screenshot_paths, batch_size=visual_batch_size)  # (n_img, d)
+    if text_embeddings is None:
+        text_embeddings = model_server.embed("clip-text", summary_sentences)
+    text_emb = np.asarray(text_embeddings, dtype=np.float32)  # (n_sent, d)
+    if image_embeddings is None:
+        # at most visual_batch_size decoded images per image-tower request
+        image_embeddings = np.concatenate([
+            model_server.embed("clip-image", batch)
+            for batch in _batchify(screenshot_paths, visual_batch_size)
+        ])
+    image_emb = np.asarray(image_embeddings, dtype=np.float32)  # (n_img, d)
 
     if text_emb.shape[0] == 0 or image_emb.shape[0] == 0:
         return matches
 
-    text_emb = F.normalize(text_emb, dim=-1)
-    image_emb = F.normalize(image_emb, dim=-1)
+    text_emb = _normalize(text_emb)
+    image_emb = _normalize(image_emb)
 
-    visual_sim = (text_emb @ image_emb.T).cpu().numpy()  # cosine in [-1,1]
+    visual_sim = text_emb @ image_emb.T  # cosine in [-1,1]
     visual_sim = (visual_sim + 1.0) / 2.0  # scale to [0,1]
 
     # OCR sim (optional)
     if use_ocr:
-        ocr_texts = _extract_ocr_texts(screenshot_paths)
-        ocr_emb = _compute_text_embeddings(ocr_texts, batch_size=32)
+        if ocr_embeddings is None:
+            ocr_embeddings = model_server.embed("clip-text", _extract_ocr_texts(screenshot_paths))
+        ocr_emb = np.asarray(ocr_embeddings, dtype=np.float32)
         if ocr_emb.shape[0] == image_emb.shape[0]:
-            ocr_emb = F.normalize(ocr_emb, dim=-1)
-            ocr_sim = (text_emb @ ocr_emb.T).cpu().numpy()
+            ocr_emb = _normalize(ocr_emb)
+            ocr_sim = text_emb @ ocr_emb.T
             ocr_sim = (ocr_sim + 1.0) / 2.0
         else:
             ocr_sim = np.zeros_like(visual_sim)
@@ -1,7 +1,10 @@
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+
+from create_meeting_app import model_server
 from create_meeting_app.models import Screenshot
 
-model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+def _normalize(emb):
+    return emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
 
 def match_screenshots(transcript, summary_lines):
     if not summary_lines:
@@ -12,13 +15,13 @@ def match_screenshots(transcript, summary_lines):
         raise ValueError("Transcript has no segments. Cannot match screenshots.")
 
     seg_text = [s.text for s in segs]
-    seg_embs = model.encode(seg_text, convert_to_tensor=True)
-    sum_embs = model.encode(summary_lines, convert_to_tensor=True)
+    seg_embs = _normalize(model_server.embed("minilm-multilingual", seg_text))
+    sum_embs = _normalize(model_server.embed("minilm-multilingual", summary_lines))
 
     matches = []
     for idx, emb in enumerate(sum_embs):
-        sims = util.cos_sim(emb, seg_embs)[0]
-        best = sims.argmax().item()
+        sims = seg_embs @ emb
+        best = int(sims.argmax())
         t0 = segs[best].start_time
         shots = transcript.meeting.screenshots.all()
         if not shots:
@@ -1,14 +1,14 @@
 #mixed_transliterator.py
 import os
-import fasttext
 import re
 from bnunicodenormalizer.normalizer import Normalizer
 from indic_transliteration import sanscript
 from indic_transliteration.sanscript import transliterate
 from spellchecker import SpellChecker
 
-# Load FastText model for language identification
-MODEL = fasttext.load_model("lid.176.bin")
+from create_meeting_app import model_server
+
+# FastText language identification is served by the shared model server
 bn_normalizer = Normalizer()
 spell = SpellChecker()
 
@@ -54,7 +54,7 @@ def is_probably_english(word):
     clean = re.sub(r'[^\w\s]', '', word)
     if not clean:
         return False
-    prediction, confidence = MODEL.predict(clean)[0][0], MODEL.predict(clean)[1][0]
+    prediction, confidence = model_server.classify([clean])[0]
     return prediction == '__label__en' and confidence > 0.7  # Reduced threshold
 
 def clean_transliteration(latin):
@@ -0,0 +1,145 @@
+# create_meeting_app/utils/model_registry.py
+#
+# Heavy ML models (CLIP, sentence-transformers, punctuation, fastText) load on
+# first use instead of at import time, so web workers and management
+# commands that never touch them don't pay for torch. Loaders import their
+# libraries inside the function; keep it that way.
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+_LOADERS = {}
+_MODELS = {}
+_LOCK = threading.Lock()
+
+
+def register(name):
+    """Decorator: register `loader()` as the factory for model `name`."""
+    def decorator(loader):
+        _LOADERS[name] = loader
+        return loader
+    return decorator
+
+
+def get(name):
+    """Return model `name`, loading it on the first call (thread-safe)."""
+    try:
+        return _MODELS[name]
+    except KeyError:
+        pass
+    with _LOCK:
+        if name not in _MODELS:
+            if name not in _LOADERS:
+                raise KeyError(f"Unknown model: {name}")
+            started = time.monotonic()
+            _MODELS[name] = _LOADERS[name]()
+            print(f"🧠 Loaded {name} in {time.monotonic() - started:.1f}s")
+        return _MODELS[name]
+
+
+def is_loaded(name):
+    return name in _MODELS
+
+
+def unload(name):
+    with _LOCK:
+        _MODELS.pop(name, None)
+
+
+# ---------- models used by the app ----------
+
+CLIP_MODEL = "openai/clip-vit-base-patch32"
+
+
+@register("clip")
+def _load_clip():
+    """(model, processor, device) for CLIP image/text embeddings."""
+    import torch
+    from transformers import CLIPModel, CLIPProcessor
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = CLIPModel.from_pretrained(CLIP_MODEL).to(device)
+    return model, CLIPProcessor.from_pretrained(CLIP_MODEL), device
+
+
+@register("clip-int8")
+def _load_clip_int8():
+    """CLIP with its Linear layers dynamically quantized to int8 (CPU only)."""
+    import torch
+    from transformers import CLIPModel, CLIPProcessor
+    model = CLIPModel.from_pretrained(CLIP_MODEL).eval()
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model, CLIPProcessor.from_pretrained(CLIP_MODEL), "cpu"
+
+
+def _export_clip_onnx(directory):
+    """Export CLIP's text and image towers to <directory>/{text,image}.onnx."""
+    import torch
+    from transformers import CLIPModel
+
+    model = CLIPModel.from_pretrained(CLIP_MODEL).eval()
+
+    class TextTower(torch.nn.Module):
+        def forward(self, input_ids, attention_mask):
+            return model.get_text_features(input_ids=input_ids, attention_mask=attention_mask)
+
+    class ImageTower(torch.nn.Module):
+        def forward(self, pixel_values):
+            return model.get_image_features(pixel_values=pixel_values)
+
+    size = model.config.vision_config.image_size
+    tokens = torch.ones(1, 8, dtype=torch.long)
+    towers = {  # name: (module, example inputs, {input name: dynamic axes})
+        "text": (TextTower(), (tokens, tokens),
+                 {"input_ids": {0: "batch", 1: "tokens"}, "attention_mask": {0: "batch", 1: "tokens"}}),
+        "image": (ImageTower(), (torch.zeros(1, 3, size, size),), {"pixel_values": {0: "batch"}}),
+    }
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, (tower, example, axes) in towers.items():
+        tmp = directory / f"{name}.onnx.tmp"
+        torch.onnx.export(tower, example, str(tmp), input_names=list(axes), output_names=["embeds"],
+                          dynamic_axes={**axes, "embeds": {0: "batch"}}, opset_version=17)
+        os.replace(tmp, directory / f"{name}.onnx")
+
+
+@register("clip-onnx")
+def _load_clip_onnx():
+    """({"text": session, "image": session}, processor, "cpu") on ONNX Runtime."""
+    import onnxruntime as ort
+    from transformers import CLIPProcessor
+    directory = Path(getattr(settings, "CLIP_ONNX_DIR", "clip-onnx"))
+    if not all((directory / f"{name}.onnx").exists() for name in ("text", "image")):
+        print(f"📦 Exporting CLIP to ONNX in {directory}...")
+        _export_clip_onnx(directory)
+    sessions = {name: ort.InferenceSession(str(directory / f"{name}.onnx"),
+                                           providers=["CPUExecutionProvider"])
+                for name in ("text", "image")}
+    return sessions, CLIPProcessor.from_pretrained(CLIP_MODEL), "cpu"
+
+
+@register("minilm")
+def _load_minilm():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+
+@register("minilm-multilingual")
+def _load_minilm_multilingual():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+
+
+@register("punctuation")
+def _load_punctuation():
+    from deepmultilingualpunctuation import PunctuationModel
+    return PunctuationModel()
+
+
+@register("lid")
+def _load_language_id():
+    """fastText lid.176 language identification."""
+    import fasttext
+    return fasttext.load_model(str(getattr(settings, "LID_MODEL_PATH", "lid.176.bin")))
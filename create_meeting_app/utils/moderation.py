@@ -0,0 +1,82 @@
+# create_meeting_app/utils/moderation.py
+#
+# Sentence-level hate-speech filter shared by both transcript sources: ASR
+# (transcribe_meeting) and live captions (CaptionLog). Flagged sentences go
+# to Transcript.hateful_text, the rest to Transcript.text.
+
+import requests
+from django.conf import settings
+
+from create_meeting_app.utils.pagination import BLOCK_SEPARATOR
+
+# NEW: Import for Bangla sentence splitting
+try:
+    from bnlp import NLTKTokenizer
+    bnlp_available = True
+except ImportError:
+    bnlp_available = False
+
+
+def detect_hate_speech(text):
+    prompt = f"""
+You are an expert at detecting hate speech in Bangla text.
+
+Hate speech is language that expresses discrimination, hostility, or violence against individuals or groups based on attributes like race, religion, ethnicity, nationality, gender, sexual orientation, political affiliation, origin, body shaming, or disability. Key indicators include dehumanizing language, calls for violence, discriminatory slurs, stereotyping, promoting supremacy, or personal offenses. Consider cultural context, dialects, and code-mixing in Bangla.
+
+Classify the following Bangla text as hate speech.
+Respond only with 'hate' or 'safe'.
+
+Text: {text}
+""".strip()
+
+    try:
+        resp = requests.post(
+            "https://api.groq.com/openai/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {settings.GROQ_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": "llama3-8b-8192",
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0,
+                "max_tokens": 10,
+            },
+            timeout=30,
+        )
+        resp.raise_for_status()
+        classification = resp.json()["choices"][0]["message"]["content"].strip().lower()
+        return 'hate' in classification
+    except Exception as e:
+        print(f"⚠️ Error in hate detection: {e}")
+        return False  # Assume safe if error
+
+
+def split_sentences(text):
+    if bnlp_available:
+        return NLTKTokenizer().sentence_tokenization(text)
+    # Fallback: Split on Bangla full stop
+    return [s.strip() for s in text.split('।') if s.strip()]
+
+
+def filter_hate_speech(text):
+    """
+    (clean_text, hateful_text) of `text`. "Speaker: words" sentences are
+    judged on the words only; both parts keep the "। " block format.
+    """
+    clean_sentences = []
+    hateful_sentences = []
+    for sentence in split_sentences(text or ''):
+        words = sentence.split(': ', 1)[1] if ': ' in sentence else sentence
+        if detect_hate_speech(words):
+            hateful_sentences.append(sentence)
+        else:
+            clean_sentences.append(sentence)
+    return BLOCK_SEPARATOR.join(clean_sentences), BLOCK_SEPARATOR.join(hateful_sentences)
+
+
+def moderate_transcript(transcript):
+    """Split transcript.text into its clean and hateful parts and save both."""
+    transcript.text, transcript.hateful_text = filter_hate_speech(transcript.text)
+    transcript.save(update_fields=['text', 'hateful_text'])
+    return transcript
@@ -0,0 +1,87 @@
+# create_meeting_app/utils/page_cache.py
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+# Every cached fragment key embeds a version token. Writes never delete
+# cached entries; they replace the token (see create_meeting_app/signals.py)
+# so the next request simply misses and the stale entries age out.
+PAGE_CACHE_TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 60)
+
+# Tokens are kept in their own cache alias when configured, so culling the
+# fragment cache can never drop them.
+VERSION_CACHE = 'page_versions'
+
+MEETING = 'meeting'
+USER = 'user'
+
+
+def _version_key(scope, pk):
+    return f"version:{scope}:{pk}"
+
+
+def _versions():
+    return caches[VERSION_CACHE] if VERSION_CACHE in settings.CACHES else cache
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def get_version(scope, pk):
+    """
+    Current version token for (scope, pk). Tokens are random, so a token
+    that was evicted and recreated can never collide with fragments cached
+    under an older one.
+    """
+    versions = _versions()
+    key = _version_key(scope, pk)
+    version = versions.get(key)
+    if version is None:
+        versions.add(key, _new_version(), timeout=None)
+        version = versions.get(key)
+    return version
+
+
+def bump_version(scope, pk):
+    """
+    Replace the token for (scope, pk) with a fresh one. A plain set rather
+    than incr: FileBasedCache.incr is a get+set across processes, so two
+    concurrent bumps could collapse into one.
+    """
+    version = _new_version()
+    _versions().set(_version_key(scope, pk), version, timeout=None)
+    return version
+
+
+def meeting_version(meeting_id):
+    return get_version(MEETING, meeting_id)
+
+
+def user_version(user_id):
+    return get_version(USER, user_id)
+
+
+def bump_meeting(meeting_id):
+    return bump_version(MEETING, meeting_id)
+
+
+def bump_user(user_id):
+    return bump_version(USER, user_id)
+
+
+def fragment_key(name, *parts):
+    return "fragment:" + ":".join([name] + [str(p) for p in parts])
+
+
+def get_or_build(key, builder, timeout=PAGE_CACHE_TIMEOUT):
+    """
+    Return the cached value for `key`, calling `builder()` and storing its
+    result on a miss. Exceptions from `builder` propagate and nothing is cached.
+    """
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout)
+    return value
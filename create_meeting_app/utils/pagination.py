@@ -0,0 +1,171 @@
+# create_meeting_app/utils/pagination.py
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateformat import format as date_format
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# sentence separator used when transcripts are stored (see transcribe_meeting)
+BLOCK_SEPARATOR = '। '
+
+
+def encode_cursor(values):
+    """
+    Turn a list of JSON-serialisable values into an opaque, URL-safe cursor.
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Inverse of encode_cursor. Returns None for an empty cursor and raises
+    ValueError for anything that was not produced by encode_cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor.")
+    return values
+
+
+def parse_limit(raw, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    try:
+        limit = int(raw) if raw not in (None, "") else default
+    except (TypeError, ValueError):
+        raise ValueError("Invalid limit.")
+    return max(1, min(limit, maximum))
+
+
+def _parse_cursor_datetime(value):
+    dt = parse_datetime(value) if isinstance(value, str) else None
+    if dt is None:
+        raise ValueError("Invalid cursor.")
+    return dt
+
+
+def keyset_after(queryset, field, cursor_values, descending=False):
+    """
+    Filter `queryset` to rows strictly after (field, id) == cursor_values in
+    the (field, id) ordering. The caller is responsible for ordering by the
+    same pair so the page boundary is stable.
+    """
+    if cursor_values is None:
+        return queryset
+    if len(cursor_values) != 2:
+        raise ValueError("Invalid cursor.")
+    value, pk = _parse_cursor_datetime(cursor_values[0]), cursor_values[1]
+    if not isinstance(pk, int):
+        raise ValueError("Invalid cursor.")
+    op = "lt" if descending else "gt"
+    return queryset.filter(
+        Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"id__{op}": pk})
+    )
+
+
+def split_blocks(text):
+    """
+    Split stored transcript text into [(speaker, text), ...] the same way the
+    meeting page always has: one block per Bangla full stop, with an optional
+    "Speaker: " prefix.
+    """
+    blocks = []
+    for block in (text or "").split(BLOCK_SEPARATOR):
+        if not block.strip():
+            continue
+        if ': ' in block:
+            speaker, body = block.split(': ', 1)
+        else:
+            speaker, body = None, block
+        blocks.append((speaker, body))
+    return blocks
+
+
+def paginate_transcript_blocks(meeting, field="text", cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Page through the sentence blocks of every transcript of `meeting`.
+
+    `field` is "text" (clean lines) or "hateful_text" (removed lines). The
+    cursor is (transcript created, transcript id, block offset), so each page
+    only loads the transcripts it actually needs.
+    Returns (items, next_cursor).
+    """
+    values = decode_cursor(cursor)
+    offset = 0
+    transcripts = meeting.transcripts.exclude(**{f"{field}__isnull": True}).exclude(**{field: ""})
+    if values is not None:
+        if (len(values) != 3 or not isinstance(values[1], int)
+                or not isinstance(values[2], int) or values[2] < 0):
+            raise ValueError("Invalid cursor.")
+        offset = values[2]
+        created, pk = _parse_cursor_datetime(values[0]), values[1]
+        # resume inside the cursor's transcript, then continue with later ones
+        transcripts = transcripts.filter(
+            Q(created__gt=created) | Q(created=created, id__gte=pk)
+        )
+
+    # meeting_id must stay loaded: the related manager sets .meeting on each row
+    transcripts = transcripts.order_by('created', 'id').only('id', 'meeting_id', 'created', field)
+
+    items = []
+    for transcript in transcripts.iterator():
+        blocks = split_blocks(getattr(transcript, field))
+        start = offset
+        offset = 0
+        for index in range(start, len(blocks)):
+            if len(items) == limit:
+                next_cursor = encode_cursor([transcript.created.isoformat(), transcript.id, index])
+                return items, next_cursor
+            speaker, body = blocks[index]
+            items.append({
+                'speaker': speaker,
+                'text': body,
+                'created': transcript.created.isoformat(),
+            })
+    return items, None
+
+
+def serialize_screenshot(shot):
+    return {
+        'id': shot.id,
+        'url': '/' + shot.image_path.lstrip('/'),
+        'created': shot.created.isoformat(),
+        'created_display': date_format(timezone.localtime(shot.created), "M d, Y H:i"),
+    }
+
+
+def keyset_page(queryset, field, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=False):
+    """
+    One keyset page of `queryset` ordered by (field, id).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    rows = keyset_after(queryset, field, decode_cursor(cursor), descending=descending)
+    ordering = (f"-{field}", "-id") if descending else (field, "id")
+    # fetch one extra row to know whether another page exists
+    page = list(rows.order_by(*ordering)[:limit + 1])
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        last = page[-1]
+        next_cursor = encode_cursor([getattr(last, field).isoformat(), last.id])
+    return page, next_cursor
+
+
+def paginate_screenshots(meeting, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Keyset page of `meeting`'s screenshots in capture order.
+    Returns (items, next_cursor).
+    """
+    page, next_cursor = keyset_page(meeting.screenshots.defer('clip_embedding', 'ocr_text', 'ocr_embedding'), 'created', cursor, limit)
+    return [serialize_screenshot(s) for s in page], next_cursor
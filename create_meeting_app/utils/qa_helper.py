@@ -3,16 +3,7 @@ import math
 import requests
 import numpy as np
 from django.conf import settings
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-
-# lazy-loaded embedder
-_EMBEDDER = None
-def get_embedder():
-    global _EMBEDDER
-    if _EMBEDDER is None:
-        _EMBEDDER = SentenceTransformer("all-MiniLM-L6-v2")
-    return _EMBEDDER
+from create_meeting_app import model_server
 
 def chunk_text(text, chunk_words=220, overlap_words=40):
     """
@@ -37,16 +28,16 @@ def retrieve_top_chunks(full_text, question, top_k=5):
     if not full_text or not question:
         return [], []
 
-    embedder = get_embedder()
     chunks = chunk_text(full_text)
     if not chunks:
         return [], []
 
-    # embed chunks and question
-    chunk_embeddings = embedder.encode(chunks, show_progress_bar=False)
-    q_emb = embedder.encode([question], show_progress_bar=False)[0]
+    # embed chunks and question in one request (MiniLM lives in the model server)
+    embeddings = model_server.embed("minilm", chunks + [question])
+    embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    chunk_embeddings, q_emb = embeddings[:-1], embeddings[-1]
 
-    sims = cosine_similarity([q_emb], chunk_embeddings)[0]
+    sims = chunk_embeddings @ q_emb
     idxs = list(np.argsort(sims)[::-1][:top_k])
     top_chunks = [chunks[i] for i in idxs]
     top_scores = [float(sims[i]) for i in idxs]
@@ -0,0 +1,109 @@
+# create_meeting_app/utils/screenshot_dedup.py
+#
+# Long meetings collect many captures of the same slide. Each screenshot
+# gets a 64-bit perceptual hash (DCT pHash, stored on the row once), and a
+# meeting's screenshots are grouped by Hamming distance so matching and the
+# PDF only look at one representative per group: the first capture of it.
+
+import numpy as np
+from django.conf import settings
+from PIL import Image
+
+from create_meeting_app.models import Screenshot
+
+HASH_SIZE = 8        # 8x8 low frequencies -> 64 bits
+IMAGE_SIZE = 32
+
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    m = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+    m[0] /= np.sqrt(2)
+    return m * np.sqrt(2 / n)
+
+
+_DCT = _dct_matrix(IMAGE_SIZE)
+
+
+def phash(path):
+    """64-bit perceptual hash of the image at `path`, as an unsigned int."""
+    with Image.open(path) as image:
+        pixels = np.asarray(image.convert("L").resize((IMAGE_SIZE, IMAGE_SIZE), Image.LANCZOS), dtype=np.float64)
+    low = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    bits = (low > np.median(low.ravel()[1:])).ravel()  # median without the DC term
+    return int("".join("1" if b else "0" for b in bits), 2)
+
+
+def to_db(value):
+    """Unsigned 64-bit hash -> signed, for BigIntegerField."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def from_db(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+def max_distance():
+    return getattr(settings, "SCREENSHOT_DUPLICATE_DISTANCE", 6)
+
+
+class PHashIndex:
+    """
+    Greedy grouping: a hash joins the first group whose representative is
+    within `max_distance` bits, otherwise it starts a new group.
+    """
+
+    def __init__(self, max_distance):
+        self.max_distance = max_distance
+        self.representatives = []   # (hash, key)
+        self.groups = []            # [key, ...] per representative
+
+    def add(self, key, value):
+        """Index `key`; returns the representative key of its group."""
+        for group, (rep_hash, rep_key) in enumerate(self.representatives):
+            if hamming(rep_hash, value) <= self.max_distance:
+                self.groups[group].append(key)
+                return rep_key
+        self.representatives.append((value, key))
+        self.groups.append([key])
+        return key
+
+
+def hash_missing(screenshots, paths):
+    """Store the pHash of screenshots that don't have one. Returns how many were hashed."""
+    hashed = []
+    for shot, path in zip(screenshots, paths):
+        if shot.phash is None:
+            try:
+                shot.phash = to_db(phash(path))
+            except OSError:
+                continue
+            hashed.append(shot)
+    Screenshot.objects.bulk_update(hashed, ["phash"])
+    return len(hashed)
+
+
+def representatives(screenshots, paths, distance=None):
+    """
+    Indexes of one screenshot per near-duplicate group, in the given
+    (capture) order, and the groups themselves as lists of indexes.
+    Screenshots that couldn't be hashed are always kept.
+    """
+    screenshots = list(screenshots)
+    hash_missing(screenshots, paths)
+    index = PHashIndex(max_distance() if distance is None else distance)
+    kept = []
+    for i, shot in enumerate(screenshots):
+        if shot.phash is None or index.add(i, from_db(shot.phash)) == i:
+            kept.append(i)
+    groups = index.groups + [[i] for i, s in enumerate(screenshots) if s.phash is None]
+    return kept, groups
+
+
+def reduction_ratio(total, kept):
+    """Share of screenshots dropped as duplicates, 0.0 .. 1.0."""
+    return 1 - kept / total if total else 0.0
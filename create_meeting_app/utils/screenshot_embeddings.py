@@ -0,0 +1,116 @@
+# create_meeting_app/utils/screenshot_embeddings.py
+#
+# Screenshots never change after capture, so each one goes through CLIP's
+# image tower, and OCR, once. The results are stored on the row (embeddings
+# as float16 bytes, 1 KB for ViT-B/32) and every PDF export or Q&A after
+# that just reads them back. `manage.py embed_screenshots [--ocr]` fills
+# them in the background; anything it hasn't reached yet is computed on
+# first use.
+
+import numpy as np
+from django.conf import settings
+
+from create_meeting_app import model_server
+from create_meeting_app.bot_scripts.frame_capture import change_ratio, signature
+from create_meeting_app.models import Screenshot
+from create_meeting_app.utils.ocr import ocr_images
+
+STORED_DTYPE = np.float16
+BATCH_SIZE = 32
+
+
+def encode(vector):
+    return np.asarray(vector, dtype=STORED_DTYPE).tobytes()
+
+
+def decode(blob):
+    return np.frombuffer(bytes(blob), dtype=STORED_DTYPE).astype(np.float32)
+
+
+def embed_missing(screenshots, paths, batch_size=BATCH_SIZE):
+    """
+    Compute and store embeddings for the screenshots that don't have one.
+    paths[i] is the image file of screenshots[i]. Saves after every batch,
+    so an interrupted pass keeps its progress. Returns how many were computed.
+    """
+    missing = [(s, p) for s, p in zip(screenshots, paths) if s.clip_embedding is None]
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        vectors = model_server.embed("clip-image", [p for _, p in batch])
+        for (shot, _), vector in zip(batch, vectors):
+            shot.clip_embedding = encode(vector)
+        Screenshot.objects.bulk_update([s for s, _ in batch], ["clip_embedding"])
+    return len(missing)
+
+
+def load_embeddings(screenshots, paths):
+    """(n, d) float32 embeddings in the order of `screenshots`, computing only missing ones."""
+    screenshots = list(screenshots)
+    if not screenshots:
+        return np.empty((0, 0), dtype=np.float32)
+    embed_missing(screenshots, paths)
+    return np.stack([decode(s.clip_embedding) for s in screenshots])
+
+
+def _file_signature(path):
+    try:
+        with open(path, "rb") as f:
+            return signature(f.read())
+    except OSError:
+        return None
+
+
+def ocr_missing(screenshots, paths, threshold=None):
+    """
+    OCR the screenshots that have no ocr_text yet and store the text with its
+    CLIP text embedding. Frames are walked in the given (capture) order and
+    one that is a near-duplicate (change below `threshold`) of the last
+    OCR'd frame reuses its text instead of being OCR'd again. Returns how
+    many frames actually went through tesseract.
+    """
+    threshold = threshold if threshold is not None else getattr(settings, "OCR_DUPLICATE_THRESHOLD", 0.02)
+    screenshots = list(screenshots)
+    missing = [i for i, s in enumerate(screenshots) if s.ocr_text is None]
+    if not missing:
+        return 0
+
+    source = {}    # index -> index of the frame whose text it uses
+    last = None    # (signature, index) of the last distinct frame
+    for i, path in enumerate(paths):
+        current = _file_signature(path)
+        if current is not None and last is not None and change_ratio(last[0], current) < threshold:
+            source[i] = last[1]
+            continue
+        source[i] = i
+        if current is not None:
+            last = (current, i)
+
+    to_ocr = sorted({source[i] for i in missing if screenshots[source[i]].ocr_text is None})
+    texts = dict(zip(to_ocr, ocr_images([paths[j] for j in to_ocr])))
+    for i in missing:
+        j = source[i]
+        screenshots[i].ocr_text = texts[j] if j in texts else screenshots[j].ocr_text
+
+    # near-duplicates share their text, so each distinct text is embedded once
+    distinct = list(dict.fromkeys(screenshots[i].ocr_text for i in missing))
+    vectors = dict(zip(distinct, model_server.embed("clip-text", distinct)))
+    for i in missing:
+        screenshots[i].ocr_embedding = encode(vectors[screenshots[i].ocr_text])
+    Screenshot.objects.bulk_update([screenshots[i] for i in missing], ["ocr_text", "ocr_embedding"])
+    return len(to_ocr)
+
+
+def load_ocr_embeddings(screenshots, paths):
+    """(n, d) float32 OCR-text embeddings in the order of `screenshots`, OCR'ing only missing ones."""
+    screenshots = list(screenshots)
+    if not screenshots:
+        return np.empty((0, 0), dtype=np.float32)
+    ocr_missing(screenshots, paths)
+    return np.stack([decode(s.ocr_embedding) for s in screenshots])
+
+
+def stored_ocr_texts(meeting):
+    """Distinct non-empty OCR texts already stored for `meeting`, in capture order (never runs OCR)."""
+    texts = (meeting.screenshots.exclude(ocr_text__isnull=True).exclude(ocr_text="")
+             .order_by("created").values_list("ocr_text", flat=True))
+    return list(dict.fromkeys(texts))
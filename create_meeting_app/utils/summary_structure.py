@@ -0,0 +1,76 @@
+# create_meeting_app/utils/summary_structure.py
+#
+# The LLM summary is HTML (h3 headings followed by a list or a paragraph).
+# It is parsed once, when it is generated, into Transcript.summary_data
+# ({topics, decisions, actions, deadlines: [str], overall: str}) plus a
+# plain-text copy in summary_text for TTS and search. PDF exports and the
+# rest read those fields instead of running BeautifulSoup again.
+
+from bs4 import BeautifulSoup
+
+SECTIONS = (
+    ("topics", ("Topics Discussed",)),
+    ("decisions", ("Decisions Made",)),
+    ("actions", ("Action Items",)),
+    ("deadlines", ("Deadlines", "Next Steps")),
+)
+
+
+def _heading(soup, heading_text):
+    return soup.find(lambda tag: tag.name == "h3" and heading_text.lower() in tag.get_text(strip=True).lower())
+
+
+def _section_items(soup, heading_text):
+    """Items of the <ul>/<ol> under the heading, else its <p> as a single item."""
+    h = _heading(soup, heading_text)
+    if not h:
+        return []
+    paragraph = None
+    for tag in h.find_next_siblings():
+        if tag.name == "h3":
+            break  # the next section
+        if tag.name in ("ul", "ol"):
+            return [li.get_text(strip=True) for li in tag.find_all("li")]
+        if tag.name == "p" and paragraph is None:
+            paragraph = tag
+    return [paragraph.get_text(strip=True)] if paragraph else []
+
+
+def parse_summary_html(html):
+    """Structured fields of a summary's HTML."""
+    soup = BeautifulSoup(html or "", "html.parser")
+    data = {}
+    for key, headings in SECTIONS:
+        data[key] = []
+        for heading in headings:
+            data[key] = _section_items(soup, heading)
+            if data[key]:
+                break
+    h = _heading(soup, "Overall Summary")
+    p = h.find_next_sibling("p") if h else None
+    data["overall"] = p.get_text(strip=True) if p else ""
+    return data
+
+
+def plain_text(html):
+    return BeautifulSoup(html or "", "html.parser").get_text(separator="\n")
+
+
+def store_summary(transcript, html, save=True):
+    """Set the summary HTML together with its structured and plain-text forms."""
+    transcript.summary = html
+    transcript.summary_data = parse_summary_html(html) if html else None
+    transcript.summary_text = plain_text(html) if html else None
+    if save:
+        transcript.save(update_fields=["summary", "summary_data", "summary_text"])
+    return transcript.summary_data
+
+
+def structured_summary(transcript):
+    """
+    Stored summary_data of `transcript`; a summary saved without it (written
+    before the field existed, or directly) is parsed and stored once here.
+    """
+    if transcript.summary_data is None and transcript.summary:
+        store_summary(transcript, transcript.summary, save=transcript.pk is not None)
+    return transcript.summary_data or parse_summary_html("")
@@ -0,0 +1,112 @@
+# create_meeting_app/utils/thumbnail_cache.py
+#
+# Content-addressed store for the downscaled screenshots embedded in
+# summary PDFs. A thumbnail's file name is the SHA-256 of the source bytes
+# plus the target width, so two meetings can never overwrite each other's
+# thumbnails and an existing file is always up to date. Missing thumbnails
+# are generated in a thread pool; a hit refreshes the file's mtime, and
+# the least recently used files are evicted once the store outgrows
+# THUMB_CACHE_MAX_MB.
+
+import functools
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image
+
+THUMB_DIR_NAME = "summary_thumbs"
+
+
+def thumb_dir():
+    return os.path.join(settings.MEDIA_ROOT, THUMB_DIR_NAME)
+
+
+def max_bytes():
+    return getattr(settings, "THUMB_CACHE_MAX_MB", 512) * 1024 * 1024
+
+
+def _digest(path):
+    stat = os.stat(path)
+    return _file_digest(path, stat.st_size, stat.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=4096)
+def _file_digest(path, size, mtime_ns):
+    """SHA-256 of the file; size and mtime_ns make a changed file a new entry."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def thumb_path(src_path, max_width):
+    return os.path.join(thumb_dir(), f"{_digest(src_path)}_w{max_width}{Path(src_path).suffix.lower()}")
+
+
+def _generate(src_path, dest, max_width):
+    tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with Image.open(src_path) as im:
+        if im.width > max_width:
+            im = im.resize((max_width, int(im.height * max_width / float(im.width))), Image.LANCZOS)
+        im.save(tmp, format=Image.registered_extensions().get(Path(dest).suffix.lower(), "PNG"), optimize=True)
+    os.replace(tmp, dest)
+
+
+def _thumbnail(src_path, max_width):
+    try:
+        dest = thumb_path(src_path, max_width)
+        if os.path.exists(dest):
+            os.utime(dest)  # LRU: mark as recently used
+        else:
+            _generate(src_path, dest, max_width)
+        return dest
+    except Exception as e:
+        print(f"⚠️ Thumb error for {src_path}: {e}")
+        return src_path  # fallback to original
+
+
+def thumbnails(src_paths, max_width, workers=4):
+    """Thumbnail path for each source (the source itself if it can't be read), in order."""
+    src_paths = list(src_paths)
+    os.makedirs(thumb_dir(), exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(src_paths)))) as pool:
+        result = list(pool.map(lambda p: _thumbnail(p, max_width), src_paths))
+    evict(keep=set(result))
+    return result
+
+
+def evict(keep=(), limit=None):
+    """Delete least recently used thumbnails until the store fits in `limit` bytes."""
+    return evict_lru(thumb_dir(), max_bytes() if limit is None else limit, keep)
+
+
+def evict_lru(directory, limit, keep=()):
+    """
+    Delete the least recently used (oldest mtime) files in `directory`, other
+    than those in `keep`, until the rest fit in `limit` bytes.
+    """
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        if path in keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -12,7 +12,11 @@ from django.http import JsonResponse, HttpResponseBadRequest, Http404
 from django.contrib.auth.decorators import login_required
 from google.cloud import translate_v2 as translate
 from create_meeting_app.utils.tts import generate_tts_and_save
-from bs4 import BeautifulSoup
+from create_meeting_app.utils import page_cache
+from create_meeting_app.utils.pagination import (
+    DEFAULT_PAGE_SIZE, parse_limit, keyset_page, paginate_transcript_blocks, paginate_screenshots,
+)
+from create_meeting_app.utils.summary_structure import store_summary
 from .models import Transcript
 
 
@@ -20,11 +24,38 @@ import json
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
 from django.utils.html import escape
+from django.utils import timezone
+from django.db.models import Avg, Count, Max
+from django.contrib.admin.views.decorators import staff_member_required
+from datetime import date, timedelta
+from django.http import StreamingHttpResponse
+from .models import BotResourceSample
 
 
+DASHBOARD_PAGE_SIZE = 24
+
 def dashboard(request):
-    meetings = Meeting.objects.filter(user=request.user).order_by('-created_at')
-    return render(request, 'dashboard.html', {'meetings': meetings})
+    cursor = request.GET.get('cursor') or ''
+    version = page_cache.user_version(request.user.id)
+
+    def build():
+        # newest first, keyset on (created_at, id); the counts come from
+        # correlated subqueries so the whole page is a single query
+        meetings = Meeting.objects.filter(user=request.user).with_counts()
+        page, next_cursor = keyset_page(meetings, 'created_at', cursor, DASHBOARD_PAGE_SIZE, descending=True)
+        return {'meetings': page, 'next_cursor': next_cursor}
+
+    try:
+        context = page_cache.get_or_build(
+            page_cache.fragment_key('dashboard', request.user.id, version, cursor), build)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid cursor.")
+    return render(request, 'dashboard.html', dict(
+        context,
+        cursor=cursor,
+        cache_version=version,
+        cache_timeout=page_cache.PAGE_CACHE_TIMEOUT,
+    ))
 
 def create_meeting(request):
     if request.method == 'POST':
@@ -53,48 +84,76 @@ def join_meeting(request):
     return redirect('dashboard')
 
 def meeting_page(request, meeting_id):
-    meeting = get_object_or_404(Meeting, pk=meeting_id)
-
-    segments = []
-    for transcript in meeting.transcripts.order_by('created'):
-        if transcript.text:
-            blocks = transcript.text.split('। ')
-            for block in blocks:
-                if block.strip():
-                    if ': ' in block:
-                        speaker, text = block.split(': ', 1)
-                    else:
-                        speaker, text = None, block
-                    segments.append({
-                        'speaker': speaker,
-                        'text': text,
-                        'created': transcript.created,
-                    })
-
-    hateful_segments = []
-    for transcript in meeting.transcripts.order_by('created'):
-        if transcript.hateful_text:
-            blocks = transcript.hateful_text.split('। ')  # Split by sentence
-            for block in blocks:
-                if block.strip():
-                    if ': ' in block:
-                        speaker, text = block.split(': ', 1)
-                    else:
-                        speaker, text = None, block
-                    hateful_segments.append({
-                        'speaker': speaker,
-                        'text': text,
-                        'created': transcript.created,
-                    })
-
-    screenshots = meeting.screenshots.order_by('created')
-
-    return render(request, 'meeting_detail.html', {
-        'meeting': meeting,
-        'segments': segments,
-        'hateful_segments': hateful_segments,
-        'screenshots': screenshots,
-    })
+    version = page_cache.meeting_version(meeting_id)
+
+    def build():
+        meeting = get_object_or_404(Meeting, pk=meeting_id)
+        # Segments and screenshots are fetched page by page from the JSON
+        # endpoints below, so the initial HTML stays the same size however
+        # long the meeting ran.
+        return {
+            'meeting': meeting,
+            'first_trans': meeting.transcripts.first(),
+            'has_hateful': meeting.transcripts.exclude(hateful_text__isnull=True).exclude(hateful_text='').exists(),
+            'screenshot_count': meeting.screenshots.count(),
+        }
+
+    # repeat views are served from cache until a save signal bumps the version
+    context = page_cache.get_or_build(page_cache.fragment_key('meeting_page', meeting_id, version), build)
+    return render(request, 'meeting_detail.html', dict(
+        context,
+        page_size=DEFAULT_PAGE_SIZE,
+        cache_version=version,
+        cache_timeout=page_cache.PAGE_CACHE_TIMEOUT,
+    ))
+
+def _cached_page(request, name, meeting_id, build):
+    """
+    Serve one JSON page from the versioned cache. The key includes the user,
+    so the ownership check inside `build` only runs on a miss.
+    """
+    version = page_cache.meeting_version(meeting_id)
+    key = page_cache.fragment_key(name, meeting_id, version, request.user.id, request.GET.urlencode())
+    return JsonResponse(page_cache.get_or_build(key, build))
+
+@login_required
+def meeting_segments(request, meeting_id):
+    """
+    GET ?kind=clean|hateful&cursor=...&limit=...
+    Returns JSON: { "success": True, "results": [...], "next_cursor": "..."|null }
+    """
+    kind = request.GET.get('kind', 'clean')
+    if kind not in ('clean', 'hateful'):
+        return JsonResponse({"success": False, "error": "Unknown kind"}, status=400)
+    field = 'hateful_text' if kind == 'hateful' else 'text'
+
+    def build():
+        meeting = get_object_or_404(Meeting, pk=meeting_id, user=request.user)
+        limit = parse_limit(request.GET.get('limit'))
+        results, next_cursor = paginate_transcript_blocks(meeting, field, request.GET.get('cursor'), limit)
+        return {"success": True, "results": results, "next_cursor": next_cursor}
+
+    try:
+        return _cached_page(request, 'segments', meeting_id, build)
+    except ValueError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+
+@login_required
+def meeting_screenshots(request, meeting_id):
+    """
+    GET ?cursor=...&limit=...
+    Returns JSON: { "success": True, "results": [...], "next_cursor": "..."|null }
+    """
+    def build():
+        meeting = get_object_or_404(Meeting, pk=meeting_id, user=request.user)
+        limit = parse_limit(request.GET.get('limit'))
+        results, next_cursor = paginate_screenshots(meeting, request.GET.get('cursor'), limit)
+        return {"success": True, "results": results, "next_cursor": next_cursor}
+
+    try:
+        return _cached_page(request, 'screenshots', meeting_id, build)
+    except ValueError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
 
 @require_POST
 def delete_meeting(request, meeting_id):
@@ -192,12 +251,10 @@ Transcript:
         summary = resp.json()["choices"][0]["message"]["content"].strip()
         print("Summary generated successfully")  # NEW
 
-        t.summary = summary
-        t.save(update_fields=["summary"])
+        store_summary(t, summary)
 
-        plain_summary = BeautifulSoup(t.summary, "html.parser").get_text(separator="\n")
         generate_tts_and_save(
-            plain_summary,
+            t.summary_text,
             lang='bn',  # Changed to Bangla for consistency
             file_field=t.summary_audio,
             instance=t,
@@ -238,7 +295,44 @@ def download_summary_pdf(request, meeting_id):
         raise Http404("PDF file not found.")
     except Exception as e:
         return HttpResponseBadRequest(f"Unexpected error: {e}")
-    
+
+
+@login_required
+def export_summary_pdfs(request):
+    """
+    GET ?ids=1,2,3 and/or ?from=YYYY-MM-DD&to=YYYY-MM-DD, &format=zip|merged
+    Summary PDFs of many meetings as a streamed ZIP or one merged PDF.
+    Staff can export anyone's meetings, other users only their own.
+    """
+    from .utils.batch_export import export_pdfs, meetings_for_export, merged_pdf, zip_stream
+
+    try:
+        ids = [int(i) for i in request.GET['ids'].split(',')] if request.GET.get('ids') else None
+        start = date.fromisoformat(request.GET['from']) if request.GET.get('from') else None
+        end = date.fromisoformat(request.GET['to']) if request.GET.get('to') else None
+    except ValueError:
+        return HttpResponseBadRequest("Invalid ids or dates")
+    fmt = request.GET.get('format', 'zip')
+    if fmt not in ('zip', 'merged'):
+        return HttpResponseBadRequest("format must be zip or merged")
+    if not (ids or start or end):
+        return HttpResponseBadRequest("Choose meetings with ids or a from/to date range")
+
+    meetings = meetings_for_export(request.user, ids, start, end)
+    if not meetings.exists():
+        raise Http404("No meetings match.")
+    results = export_pdfs(meetings)
+
+    if fmt == 'zip':
+        response = StreamingHttpResponse(zip_stream(results), content_type='application/zip')
+        response['Content-Disposition'] = 'attachment; filename="meeting_summaries.zip"'
+        return response
+    try:
+        path, _errors = merged_pdf(results)
+    except ValueError as e:
+        return HttpResponseBadRequest(f"Cannot generate PDF: {e}")
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename="meeting_summaries.pdf")
+
 
 # inside views.py: paste this view
 @login_required
@@ -268,6 +362,12 @@ def ask_meeting_question(request, meeting_id):
         if not full_text:
             return JsonResponse({"success": False, "error": "No transcript available for this meeting."}, status=400)
 
+        # Slide text already OCR'd for the PDF export (never OCR'd here)
+        from .utils.screenshot_embeddings import stored_ocr_texts
+        slide_texts = stored_ocr_texts(meeting)
+        if slide_texts:
+            full_text += "\n\nText shown on screen:\n" + "\n\n".join(slide_texts)
+
         # Use helper to retrieve top chunks
         from .utils.qa_helper import retrieve_top_chunks, call_groq_chat
 
@@ -310,4 +410,41 @@ ASSISTANT ANSWER:
         return JsonResponse({"success": True, "answer": answer, "mode": mode})
 
     except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({"success": False, "error": str(e)}, status=500)
+
+@staff_member_required
+def bot_metrics(request):
+    """
+    GET ?minutes=60                -> per-meeting peaks/averages of bot resource samples
+    GET ?meeting=<id>&minutes=60   -> that meeting's series as [taken_at, cpu%, rss MB, fds, processes]
+    """
+    try:
+        minutes = int(request.GET.get('minutes', 60))
+        meeting_id = int(request.GET['meeting']) if request.GET.get('meeting') else None
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Invalid parameters"}, status=400)
+    samples = BotResourceSample.objects.filter(taken_at__gte=timezone.now() - timedelta(minutes=minutes))
+
+    if meeting_id is not None:
+        rows = samples.filter(meeting_id=meeting_id).order_by('taken_at').values_list(
+            'taken_at', 'cpu_percent', 'rss_mb', 'open_fds', 'processes')
+        return JsonResponse({
+            "success": True,
+            "meeting_id": meeting_id,
+            "columns": ["taken_at", "cpu_percent", "rss_mb", "open_fds", "processes"],
+            "series": [[t.isoformat(), cpu, rss, fds, procs] for t, cpu, rss, fds, procs in rows],
+        })
+
+    summary = samples.values('meeting_id', 'meeting__name').annotate(
+        samples=Count('id'),
+        last_sample=Max('taken_at'),
+        avg_cpu_percent=Avg('cpu_percent'),
+        peak_cpu_percent=Max('cpu_percent'),
+        avg_rss_mb=Avg('rss_mb'),
+        peak_rss_mb=Max('rss_mb'),
+        peak_open_fds=Max('open_fds'),
+    ).order_by('-peak_rss_mb')
+    return JsonResponse({"success": True, "meetings": [
+        dict(row, name=row.pop('meeting__name'), last_sample=row['last_sample'].isoformat())
+        for row in summary
+    ]})
@@ -81,13 +81,130 @@ TEMPLATES = [
 WSGI_APPLICATION = 'meeting_agent.wsgi.application'
 
 # DATABASE (SQLite for dev)
+# Bot watcher threads, the scheduler and web requests all write to the same
+# file. WAL lets readers run alongside a writer, the busy timeout makes writers
+# wait for the lock instead of failing with "database is locked", and IMMEDIATE
+# transactions take the write lock up front so they can't deadlock on upgrade.
+SQLITE_BUSY_TIMEOUT = config('SQLITE_BUSY_TIMEOUT', default=20, cast=int)  # seconds
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # keep connections open between requests instead of reconnecting
+        'CONN_MAX_AGE': config('CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000};'
+            ),
+        },
     }
 }
 
+# CACHE (versioned page fragments, see create_meeting_app/utils/page_cache.py)
+# Version bumps come from bots, the scheduler and management commands, so the
+# cache must be shared by every process: file by default. locmem is per process
+# and only suitable for a single-process dev server (CACHE_BACKEND=locmem).
+CACHE_BACKEND = config('CACHE_BACKEND', default='file')
+PAGE_CACHE_MAX_ENTRIES = config('PAGE_CACHE_MAX_ENTRIES', default=10000, cast=int)
+if CACHE_BACKEND != 'locmem':
+    CACHE_DIR = config('CACHE_DIR', default=str(BASE_DIR / 'cache'))
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR,
+            'OPTIONS': {'MAX_ENTRIES': PAGE_CACHE_MAX_ENTRIES},
+        },
+        # version tokens live apart from the fragments, so culling never drops them
+        'page_versions': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(CACHE_DIR, 'versions'),
+            'OPTIONS': {'MAX_ENTRIES': 1_000_000},
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'meeting-agent',
+            'OPTIONS': {'MAX_ENTRIES': PAGE_CACHE_MAX_ENTRIES},
+        },
+        'page_versions': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'meeting-agent-versions',
+            'OPTIONS': {'MAX_ENTRIES': 1_000_000},
+        },
+    }
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=60 * 60, cast=int)
+
+# MODEL SERVER (see create_meeting_app/model_server.py); '' = load models in-process
+MODEL_SERVER_SOCKET      = config('MODEL_SERVER_SOCKET', default=str(BASE_DIR / 'model_server.sock'))
+MODEL_SERVER_MAX_BATCH   = config('MODEL_SERVER_MAX_BATCH', default=64, cast=int)
+MODEL_SERVER_MAX_WAIT_MS = config('MODEL_SERVER_MAX_WAIT_MS', default=10, cast=int)
+LID_MODEL_PATH           = config('LID_MODEL_PATH', default=str(BASE_DIR / 'lid.176.bin'))
+
+# CLIP backend for screenshot matching: torch (fp32) | int8 (dynamic-quantized
+# torch, CPU) | onnx (ONNX Runtime, exported once into CLIP_ONNX_DIR).
+# Check a backend against fp32 with `manage.py benchmark_clip`.
+CLIP_BACKEND             = config('CLIP_BACKEND', default='torch')
+CLIP_ONNX_DIR            = config('CLIP_ONNX_DIR', default=str(BASE_DIR / 'models' / 'clip-onnx'))
+
+# screenshot OCR (see create_meeting_app/utils/ocr.py): pool size (0 = one per
+# CPU), and how similar a frame must be to the last OCR'd one to reuse its text
+OCR_WORKERS              = config('OCR_WORKERS', default=0, cast=int)
+OCR_DUPLICATE_THRESHOLD  = config('OCR_DUPLICATE_THRESHOLD', default=0.02, cast=float)
+
+# screenshots whose perceptual hashes differ by at most this many of 64 bits
+# count as one slide for matching and the PDF (see utils/screenshot_dedup.py)
+SCREENSHOT_DUPLICATE_DISTANCE = config('SCREENSHOT_DUPLICATE_DISTANCE', default=6, cast=int)
+
+# summary PDF thumbnails are evicted least-recently-used beyond this size
+THUMB_CACHE_MAX_MB       = config('THUMB_CACHE_MAX_MB', default=512, cast=int)
+# and merged summary packs (MEDIA_ROOT/summaries/packs) beyond this one
+PDF_PACK_CACHE_MAX_MB    = config('PDF_PACK_CACHE_MAX_MB', default=1024, cast=int)
+
+# WeasyPrint processes for batch PDF exports (0 = one per CPU)
+PDF_EXPORT_WORKERS       = config('PDF_EXPORT_WORKERS', default=0, cast=int)
+
+# BOT SUPERVISOR (admission control, see create_meeting_app/bot_supervisor.py)
+BOT_MAX_BROWSERS    = config('BOT_MAX_BROWSERS', default=4, cast=int)
+BOT_MAX_CPU_PERCENT = config('BOT_MAX_CPU_PERCENT', default=85, cast=int)
+BOT_MIN_FREE_MB     = config('BOT_MIN_FREE_MB', default=1024, cast=int)
+BOT_MAX_RESTARTS    = config('BOT_MAX_RESTARTS', default=2, cast=int)
+# seconds between CPU/RSS/fd samples of each running bot (see bot_metrics.py)
+BOT_SAMPLE_INTERVAL = config('BOT_SAMPLE_INTERVAL', default=10, cast=float)
+# pre-launched browsers bots attach to (0 disables the pool)
+BOT_CHROME_POOL_SIZE = config('BOT_CHROME_POOL_SIZE', default=2, cast=int)
+BOT_CHROME_MAX_USES  = config('BOT_CHROME_MAX_USES', default=5, cast=int)
+BOT_HEADLESS         = config('BOT_HEADLESS', default=False, cast=bool)
+CHROME_BINARY        = config('CHROME_BINARY', default='')
+# leave a call after being the only participant this long (0 = stay until it ends)
+BOT_AUTO_LEAVE_ALONE_SECONDS = config('BOT_AUTO_LEAVE_ALONE_SECONDS', default=0, cast=int)
+# screenshots: sampled every BOT_FRAME_INTERVAL s, kept only when the screen changed
+BOT_FRAME_INTERVAL         = config('BOT_FRAME_INTERVAL', default=3, cast=float)
+BOT_FRAME_FORMAT           = config('BOT_FRAME_FORMAT', default='jpeg')   # jpeg | webp
+BOT_FRAME_QUALITY          = config('BOT_FRAME_QUALITY', default=70, cast=int)
+BOT_FRAME_CHANGE_THRESHOLD = config('BOT_FRAME_CHANGE_THRESHOLD', default=0.04, cast=float)
+# stream Meet live captions into TranscriptSegment rows (ASR stays the fallback)
+BOT_CAPTIONS = config('BOT_CAPTIONS', default=False, cast=bool)
+# chromedriver: a pinned local path wins; otherwise resolved once and cached
+# in the manifest (see create_meeting_app/bot_scripts/chromedriver.py)
+CHROMEDRIVER_PATH     = config('CHROMEDRIVER_PATH', default='')
+CHROMEDRIVER_VERSION  = config('CHROMEDRIVER_VERSION', default='')
+CHROMEDRIVER_MANIFEST = config('CHROMEDRIVER_MANIFEST', default=str(BASE_DIR / 'drivers' / 'chromedriver.json'))
+
+# MEETING TIMER (see create_meeting_app/meeting_timer.py)
+MEETING_NOTIFY_PORT        = config('MEETING_NOTIFY_PORT', default=48765, cast=int)
+MEETING_JOIN_GRACE_SECONDS = config('MEETING_JOIN_GRACE_SECONDS', default=300, cast=int)
+MEETING_RESCAN_SECONDS     = config('MEETING_RESCAN_SECONDS', default=300, cast=int)  # safety net for missed notifications
+# multi-node claiming: leases are renewed every third of this while a bot runs
+MEETING_LEASE_SECONDS      = config('MEETING_LEASE_SECONDS', default=60, cast=int)
+SCHEDULER_NODE_ID          = config('SCHEDULER_NODE_ID', default='')
+
 # AUTHENTICATION BACKENDS
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',             # default